@@ -0,0 +1,329 @@
+# Axial
+#
+# Axial power shapes q'(z) on a channel of length L, with z = 0 at the
+# midplane (z on [-L/2, L/2]). Each shape evaluates on arrays of z and
+# has a closed-form (or pre-tabulated) cumulative integral from the
+# bottom of the channel, and its inverse, so that locations such as the
+# onset of boiling are found by table inversion instead of root finding.
+
+import numpy as np
+
+# Nodes of the table used to start inverting a cumulative integral
+_INVERSE_NODES = 1025
+
+
+class AxialShape(object):
+	"""Base class for axial shapes
+
+	Subclasses define _shape(z), the unnormalized shape, and
+	_integral(z), its integral from -L/2 to z.
+
+	Parameters:
+	-----------
+	length:     float, m; heated length L
+	peak:       float; normalize the shape to this peak value
+	average:    float; normalize the shape to this average value
+	scale:      float; multiply the unnormalized shape by this
+	Give at most one of peak, average, and scale [Default: scale = 1].
+	"""
+	name = None
+
+	def __init__(self, length, peak = None, average = None, scale = None):
+		self.length = length
+		given = [v for v in (peak, average, scale) if v is not None]
+		if len(given) > 1:
+			raise TypeError("Specify at most one of peak, average, or scale.")
+		self._peak = peak
+		self._average = average
+		self._scale = scale
+		self._table = None
+
+	def __str__(self):
+		return self.name
+
+	@property
+	def bottom(self):
+		return -self.length/2.0
+
+	@property
+	def top(self):
+		return self.length/2.0
+
+	@property
+	def scale(self):
+		"""Factor between the unnormalized and the normalized shape"""
+		if self._peak is not None:
+			return self._peak/self._shape(self._peak_location())
+		elif self._average is not None:
+			return self._average*self.length/self._integral(self.top)
+		elif self._scale is not None:
+			return self._scale
+		return 1.0
+
+	def _peak_location(self):
+		"""Location of the maximum of the shape; subclasses may override"""
+		z = np.linspace(self.bottom, self.top, _INVERSE_NODES)
+		return z[np.argmax(self._shape(z))]
+
+	@property
+	def peak_location(self):
+		return self._peak_location()
+
+	@property
+	def peak(self):
+		return self.scale*self._shape(self._peak_location())
+
+	@property
+	def total(self):
+		"""Integral of q' over the whole length"""
+		return self.scale*self._integral(self.top)
+
+	@property
+	def average(self):
+		return self.total/self.length
+
+	def __call__(self, z):
+		"""Value of the shape, q'(z)
+
+		Parameter:
+		----------
+		z:          float or array, m; axial position on [-L/2, L/2]
+
+		Returns:
+		--------
+		float or array; q'(z)
+		"""
+		z = np.asarray(z, dtype=float)
+		return (self.scale*self._shape(z))[()]
+
+	def cumulative(self, z):
+		"""Integral of q' from the bottom of the channel to z
+
+		Parameter:
+		----------
+		z:          float or array, m; axial position on [-L/2, L/2]
+
+		Returns:
+		--------
+		float or array; integral of q'(z) on [-L/2, z]
+		"""
+		z = np.asarray(z, dtype=float)
+		return (self.scale*self._integral(z))[()]
+
+	def locate(self, value):
+		"""Inverse of the cumulative integral: where it reaches `value`
+
+		The cumulative integral is tabulated once, interpolated for a
+		first guess, and polished by Newton steps with the exact shape.
+		Values outside [0, total] give NaN.
+
+		Parameter:
+		----------
+		value:      float or array; integral of q' from the bottom
+
+		Returns:
+		--------
+		float or array, m; axial position z
+		"""
+		value = np.asarray(value, dtype=float)/self.scale
+		if self._table is None:
+			z = np.linspace(self.bottom, self.top, _INVERSE_NODES)
+			self._table = (self._integral(z), z)
+		cumul, nodes = self._table
+		z = np.interp(value, cumul, nodes)
+		for __ in range(3):
+			slope = self._shape(z)
+			with np.errstate(divide="ignore", invalid="ignore"):
+				step = np.where(slope > 0, (self._integral(z) - value)/slope, 0)
+			z = np.clip(z - step, self.bottom, self.top)
+		outside = (value < 0) | (value > cumul[-1]*(1 + 1E-12))
+		return np.where(outside, np.nan, z)[()]
+
+	def locate_fraction(self, fraction):
+		"""Where the cumulative integral reaches a fraction of the total
+
+		Parameter:
+		----------
+		fraction:   float or array; on [0, 1]
+
+		Returns:
+		--------
+		float or array, m; axial position z
+		"""
+		return self.locate(np.asarray(fraction, dtype=float)*self.total)
+
+
+class Uniform(AxialShape):
+	"""Flat shape"""
+	name = "Uniform"
+
+	def _shape(self, z):
+		return np.ones_like(z)
+
+	def _integral(self, z):
+		return np.asarray(z, dtype=float) - self.bottom
+
+	def _peak_location(self):
+		return 0.0
+
+
+class Cosine(AxialShape):
+	"""Cosine shape, cos(pi*z/Le), optionally chopped by an extrapolated
+	length Le longer than the heated length
+
+	Additional Parameter:
+	---------------------
+	extrapolated: float, m; extrapolated length Le >= L
+	              [Default: None -- Le = L]
+	"""
+	name = "Cosine"
+
+	def __init__(self, length, extrapolated = None, **kwargs):
+		if extrapolated is None:
+			extrapolated = length
+		elif extrapolated < length:
+			raise ValueError("The extrapolated length must be at least the heated length.")
+		self.extrapolated = extrapolated
+		super(Cosine, self).__init__(length, **kwargs)
+
+	def _shape(self, z):
+		return np.cos(np.pi*z/self.extrapolated)
+
+	def _integral(self, z):
+		le = self.extrapolated
+		return le/np.pi*(np.sin(np.pi*z/le) + np.sin(np.pi*self.length/(2*le)))
+
+	def _peak_location(self):
+		return 0.0
+
+	def locate(self, value):
+		le = self.extrapolated
+		value = np.asarray(value, dtype=float)/self.scale
+		arg = value*np.pi/le - np.sin(np.pi*self.length/(2*le))
+		with np.errstate(invalid="ignore"):
+			z = le/np.pi*np.arcsin(arg)
+		# A chopped cosine keeps arcsin defined past the top: mask as
+		# AxialShape.locate does
+		outside = (value < 0) | (value > self._integral(self.top)*(1 + 1E-12))
+		return np.where(outside, np.nan, z)[()]
+
+
+class ChoppedCosine(Cosine):
+	"""Cosine shape chopped at the ends of the heated length
+
+	Parameters:
+	-----------
+	length:     float, m; heated length L
+	extrapolated: float, m; extrapolated length Le > L
+	"""
+	name = "Chopped cosine"
+
+	def __init__(self, length, extrapolated, **kwargs):
+		super(ChoppedCosine, self).__init__(length, extrapolated, **kwargs)
+
+
+class ExpCosine(AxialShape):
+	"""Exponentially skewed cosine, exp(-a*(z/L + 1/2))*cos(pi*z/Le)
+
+	A positive `a` skews the power toward the bottom of the channel,
+	and a negative one toward the top.
+
+	Additional Parameters:
+	----------------------
+	a:          float; skewing exponent
+	extrapolated: float, m; extrapolated length Le >= L
+	              [Default: None -- Le = L]
+	"""
+	name = "Exp-cosine"
+
+	def __init__(self, length, a, extrapolated = None, **kwargs):
+		if extrapolated is None:
+			extrapolated = length
+		self.a = a
+		self.extrapolated = extrapolated
+		super(ExpCosine, self).__init__(length, **kwargs)
+
+	def _shape(self, z):
+		return np.exp(-self.a*(z/self.length + 0.5))*np.cos(np.pi*z/self.extrapolated)
+
+	def _antiderivative(self, z):
+		b = -self.a/self.length
+		c = np.pi/self.extrapolated
+		return (np.exp(b*z - self.a/2)*(b*np.cos(c*z) + c*np.sin(c*z))/(b**2 + c**2))
+
+	def _integral(self, z):
+		z = np.asarray(z, dtype=float)
+		return self._antiderivative(z) - self._antiderivative(self.bottom)
+
+	def _peak_location(self):
+		# d/dz = 0  ->  tan(pi*z/Le) = -a*Le/(pi*L)
+		le = self.extrapolated
+		return -le/np.pi*np.arctan(self.a*le/(np.pi*self.length))
+
+
+class BottomSkewed(ExpCosine):
+	"""Cosine skewed toward the bottom of the channel
+
+	Parameters:
+	-----------
+	length:     float, m; heated length L
+	skew:       float; positive skewing exponent
+	"""
+	name = "Bottom-skewed"
+
+	def __init__(self, length, skew, **kwargs):
+		super(BottomSkewed, self).__init__(length, abs(skew), **kwargs)
+
+
+class TopSkewed(ExpCosine):
+	"""Cosine skewed toward the top of the channel
+
+	Parameters:
+	-----------
+	length:     float, m; heated length L
+	skew:       float; positive skewing exponent
+	"""
+	name = "Top-skewed"
+
+	def __init__(self, length, skew, **kwargs):
+		super(TopSkewed, self).__init__(length, -abs(skew), **kwargs)
+
+
+class Tabulated(AxialShape):
+	"""User-supplied shape, linear between the given points
+
+	Parameters:
+	-----------
+	z:          array, m; increasing positions spanning [-L/2, L/2]
+	values:     array; shape at those positions
+	"""
+	name = "Tabulated"
+
+	def __init__(self, z, values, **kwargs):
+		self.z = np.asarray(z, dtype=float)
+		self.values = np.asarray(values, dtype=float)
+		if self.z.shape != self.values.shape or np.any(np.diff(self.z) <= 0):
+			raise ValueError("z must be increasing and match the values.")
+		steps = (self.values[1:] + self.values[:-1])/2*np.diff(self.z)
+		self._nodes = np.concatenate(([0.0], np.cumsum(steps)))
+		super(Tabulated, self).__init__(self.z[-1] - self.z[0], **kwargs)
+
+	@property
+	def bottom(self):
+		return self.z[0]
+
+	@property
+	def top(self):
+		return self.z[-1]
+
+	def _shape(self, z):
+		return np.interp(z, self.z, self.values)
+
+	def _integral(self, z):
+		z = np.clip(np.asarray(z, dtype=float), self.z[0], self.z[-1])
+		i = np.clip(np.searchsorted(self.z, z, side="right") - 1, 0, len(self.z) - 2)
+		dz = z - self.z[i]
+		return self._nodes[i] + dz*(self.values[i] + self._shape(z))/2
+
+	def _peak_location(self):
+		return self.z[np.argmax(self.values)]
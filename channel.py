@@ -0,0 +1,173 @@
+# Channel
+#
+# Single-pass axial marching solution of a heated coolant channel.
+# Every axial profile (enthalpy, quality, void, density, temperatures,
+# and the components of the pressure drop) comes from one cumulative
+# integration over the axial grid, instead of nested quadratures.
+
+import numpy as np
+import models
+import two_phase
+
+
+def cumulative_trapezoid(y, z):
+	"""Cumulative integral of y(z) by the trapezoidal rule
+
+	Parameters:
+	-----------
+	y:          array; integrand on the grid (last axis)
+	z:          array; increasing grid points
+
+	Returns:
+	--------
+	array with the shape of y; integral from z[0] to each z, starting at 0
+	"""
+	y = np.asarray(y, dtype=float)
+	steps = (y[..., 1:] + y[..., :-1])/2*np.diff(z)
+	result = np.zeros(y.shape)
+	np.cumsum(steps, axis=-1, out=result[..., 1:])
+	return result
+
+
+class Channel(object):
+	"""Heated channel marched from the inlet (z[0]) to the outlet (z[-1])
+
+	Below saturation, the coolant has the properties of the saturated
+	liquid; above it, the flow quality is the equilibrium quality and the
+	void fraction comes from the void model. Pressure drops are positive
+	and accumulate from the inlet.
+
+	Parameters:
+	-----------
+	z:          array, m; increasing axial grid, inlet to outlet
+	q1:         callable, W/m; linear heat rate q'(z), evaluated on arrays
+	g:          float, kg/s/m^2; mass flux
+	area:       float, m^2; flow area
+	dh:         float, m; hydraulic diameter
+	hin:        float, kJ/kg; inlet enthalpy
+	liquid:     saturated liquid state with T, h, rho, mu, cp, k
+	            (e.g., from saturation.phases(); fields may be overridden
+	            with ._replace() for given textbook values)
+	vapor:      saturated vapor state with h and rho
+	perimeter:  float, m; heated perimeter
+	            [Default: None -- pi*dh]
+	tin:        float, K; inlet temperature
+	            [Default: None -- from hin and the liquid cp]
+	fff:        float; single-phase (liquid-only) friction factor
+	            [Default: None -- McAdams at the liquid-only Reynolds number]
+	htc:        float, W/m^2-K; heat transfer coefficient for the wall
+	            temperature. [Default: None -- Dittus-Boelter, liquid]
+	void_model: two_phase.VoidModel
+	            [Default: None -- two_phase.HEM()]
+	multiplier: callable; two-phase friction multiplier phi_lo^2(x)
+	            [Default: None -- two_phase.phi_hem]
+	"""
+	def __init__(self, z, q1, g, area, dh, hin, liquid, vapor,
+	             perimeter = None, tin = None, fff = None, htc = None,
+	             void_model = None, multiplier = None):
+		self.z = np.asarray(z, dtype=float)
+		self.g = g
+		self.area = area
+		self.dh = dh
+		self.hin = hin
+		self.liquid = liquid
+		self.vapor = vapor
+		if perimeter is None:
+			perimeter = np.pi*dh
+		self.perimeter = perimeter
+		if void_model is None:
+			void_model = two_phase.HEM()
+		self.void_model = void_model
+		if multiplier is None:
+			multiplier = lambda x: two_phase.phi_hem(x, liquid.rho, vapor.rho)
+		self.multiplier = multiplier
+		re = g*dh/liquid.mu
+		if fff is None:
+			fff = models.mcadams(re)
+		self.fff = fff
+		if htc is None:
+			pr = liquid.mu*liquid.cp*1000/liquid.k
+			htc = models.dittus_boelter(re, pr)*liquid.k/dh
+		self.htc = htc
+		if tin is None:
+			tin = liquid.T - (liquid.h - hin)/liquid.cp
+		self.tin = tin
+		self._march(q1)
+
+	@property
+	def mdot(self):
+		return self.g*self.area
+
+	@property
+	def hfg(self):
+		return self.vapor.h - self.liquid.h
+
+	@property
+	def dp(self):
+		"""Total pressure drop from the inlet (Pa)"""
+		return self.dp_grav + self.dp_fric + self.dp_acc
+
+	def _march(self, q1):
+		z = self.z
+		liquid = self.liquid
+		vapor = self.vapor
+		self.q1 = np.broadcast_to(np.asarray(q1(z), dtype=float), z.shape)
+		self.q2 = self.q1/self.perimeter
+		# Energy: h(z) = hin + integral(q') / mdot;  W -> kW
+		self.h = self.hin + cumulative_trapezoid(self.q1, z)/self.mdot/1000
+		self.xe = (self.h - liquid.h)/self.hfg
+		self.x = np.clip(self.xe, 0, 1)
+		self.alpha = np.asarray(self.void_model.alpha(self.x, liquid.rho,
+		                                              vapor.rho, self.g))
+		self.rho = np.asarray(two_phase.mixture_density(liquid.rho, vapor.rho, self.alpha))
+		# Temperatures: subcooled liquid heats up to saturation
+		self.tbulk = np.minimum(self.tin + (self.h - self.hin)/liquid.cp, liquid.T)
+		self.twall = self.tbulk + self.q2/self.htc
+		# Pressure drop components
+		grav = two_phase.G_ACCEL*self.rho
+		self.dp_grav = cumulative_trapezoid(grav, z)
+		fric = self.fff*self.g**2/(2*self.dh*liquid.rho)*self.multiplier(self.x)
+		self.dp_fric = cumulative_trapezoid(fric, z)
+		rho_m = self._momentum_density()
+		self.dp_acc = self.g**2*(1/rho_m - 1/rho_m[0])
+
+	def _momentum_density(self):
+		"""Effective density for the momentum flux, rho+"""
+		x = self.x
+		a = self.alpha
+		with np.errstate(divide="ignore", invalid="ignore"):
+			inverse = x**2/(a*self.vapor.rho) + (1 - x)**2/((1 - a)*self.liquid.rho)
+		inverse = np.where(x == 0, 1/self.liquid.rho,
+		                   np.where(x == 1, 1/self.vapor.rho, inverse))
+		return 1/inverse
+
+	def at(self, name, z):
+		"""Interpolate one of the axial profiles
+
+		Parameters:
+		-----------
+		name:       str; attribute, e.g. "h", "xe", "alpha", "dp_fric"
+		z:          float or array, m; axial position(s)
+
+		Returns:
+		--------
+		float or array; the profile at z
+		"""
+		return np.interp(z, self.z, getattr(self, name))[()]
+
+	def z_saturation(self):
+		"""Axial position where the equilibrium quality reaches zero
+
+		Returns:
+		--------
+		float, m; (NaN if the channel never reaches saturation)
+		"""
+		above = np.flatnonzero(self.xe >= 0)
+		if not len(above):
+			return np.nan
+		i = above[0]
+		if i == 0:
+			return self.z[0]
+		z0, z1 = self.z[i - 1], self.z[i]
+		x0, x1 = self.xe[i - 1], self.xe[i]
+		return z0 - x0*(z1 - z0)/(x1 - x0)
@@ -0,0 +1,218 @@
+# Core
+#
+# Core-wide thermal-hydraulic solution. The average pin of every assembly
+# is marched from the inlet at the same time, with all fields held as
+# (assembly, axial node) arrays: linear heat rate, coolant, clad, and fuel
+# centerline temperatures. Large cores are split over a process pool.
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import models
+from channel import cumulative_trapezoid
+
+# Number of (assembly, node) cells above which the solve uses a process pool
+PARALLEL_THRESHOLD = 2000000
+
+HotSpot = namedtuple("HotSpot", ["assembly", "node", "z", "value"])
+
+
+def _temperatures(q1, z, mdot, tin, cp, htc, dco, rci_rco, dfo, kclad, hgap, kfuel):
+	"""Temperature fields for rows of linear heat rate q1 (W/m)
+
+	Module-level so that it can be sent to worker processes.
+	"""
+	tcool = tin + cumulative_trapezoid(q1, z)/(mdot*cp*1000)
+	tco = tcool + q1/(np.pi*dco*htc)
+	tci = tco + q1*np.log(1/rci_rco)/(2*np.pi*kclad)
+	if hgap:
+		tfo = tci + q1/(np.pi*dfo*hgap)
+	else:
+		tfo = tci
+	tcl = tfo + q1/(4*np.pi*kfuel)
+	return np.stack((tcool, tco, tcl))
+
+
+class CoreSolution(object):
+	"""Fields of a core solution, shaped (assemblies..., nodes), with
+	NaN temperatures at the non-fuel positions of the radial map
+
+	Attributes:
+	-----------
+	z:          array, m; axial nodes, inlet to outlet
+	q1:         array, W/m; linear heat rate of the average pin
+	tcool:      array, K; bulk coolant temperature
+	tclad:      array, K; clad outer surface temperature
+	tfuel:      array, K; fuel centerline temperature
+	"""
+	def __init__(self, z, q1, tcool, tclad, tfuel):
+		self.z = z
+		self.q1 = q1
+		self.tcool = tcool
+		self.tclad = tclad
+		self.tfuel = tfuel
+
+	def hot_spot(self, name):
+		"""Location and value of the maximum of a field, over the fuel
+		assemblies
+
+		Parameter:
+		----------
+		name:       str; "q1", "tcool", "tclad", or "tfuel"
+
+		Returns:
+		--------
+		HotSpot(assembly, node, z, value); assembly is an index tuple
+		into the radial map
+		"""
+		field = getattr(self, name)
+		index = np.unravel_index(np.nanargmax(field), field.shape)
+		return HotSpot(index[:-1], index[-1], self.z[index[-1]], field[index])
+
+	@property
+	def outlet(self):
+		"""Coolant outlet temperature of each assembly (K)"""
+		return self.tcool[..., -1]
+
+
+class Core(object):
+	"""Core of identical assemblies with a radial and an axial power shape
+
+	Each assembly is represented by its average pin in a unit cell of
+	single-phase coolant. The core flow is split evenly among the pins
+	(or by the relative assembly flows), and the fuel-to-coolant heat
+	path is the usual series of resistances: convection, clad
+	conduction, gap conductance, and fuel conduction.
+
+	Parameters:
+	-----------
+	reactor:    reactors.ReactorType; pin geometry (cm), lattice shape, and
+	            height (cm)
+	power:      float, W; core thermal power deposited in the fuel
+	mdot:       float, kg/s; total core flow rate
+	coolant:    single-phase coolant state with T, cp, mu, k
+	            (e.g., if97.PT(P, tin)); its T is the inlet temperature
+	radial:     array; relative power of each assembly, in any layout
+	            (e.g., a square core map). Positions of 0 are not fuel and
+	            are skipped; the rest are normalized to an average of 1.
+	shape:      axial.AxialShape; axial power shape over the height
+	nodes:      int; number of axial nodes
+	            [Default: 100]
+	pins:       int; fuel pins per assembly
+	            [Default: None -- from reactor.npins, as in
+	            ReactorType.total_pins: npins**2 for a square assembly]
+	flow:       array; relative flow of each assembly (broadcast against
+	            radial), normalized over the fuel positions
+	            [Default: None -- uniform]
+	kfuel:      float, W/m-K; fuel thermal conductivity
+	            [Default: 3.0]
+	kclad:      float, W/m-K; clad thermal conductivity
+	            [Default: 17.0]
+	hgap:       float, W/m^2-K; gap conductance
+	            [Default: None -- closed gap, no gap resistance]
+	htc:        float, W/m^2-K; clad-to-coolant heat transfer coefficient
+	            [Default: None -- Dittus-Boelter in the unit cell]
+	"""
+	def __init__(self, reactor, power, mdot, coolant, radial, shape,
+	             nodes = 100, pins = None, flow = None, kfuel = 3.0,
+	             kclad = 17.0, hgap = None, htc = None):
+		self.reactor = reactor
+		self.power = power
+		self.mdot = mdot
+		self.coolant = coolant
+		radial = np.asarray(radial, dtype=float)
+		self.fuel = radial > 0
+		if not self.fuel.any():
+			raise ValueError("The radial map has no fuel assemblies.")
+		self.radial = np.where(self.fuel, radial/radial[self.fuel].mean(), 0.0)
+		self.shape = shape
+		self.nodes = nodes
+		if pins is None:
+			if reactor.shape == "square":
+				pins = reactor.npins**2
+			else:
+				pins = reactor.npins
+		self.pins = pins
+		if flow is None:
+			flow = np.ones(self.radial.shape)
+		flow = np.broadcast_to(np.asarray(flow, dtype=float), self.radial.shape)
+		self.flow = np.where(self.fuel, flow/flow[self.fuel].mean(), 0.0)
+		self.kfuel = kfuel
+		self.kclad = kclad
+		self.hgap = hgap
+		# Geometry, cm -> m
+		self.height = reactor.height/100
+		self.dco = reactor.dco/100
+		self.df = reactor.df/100
+		self.dci = self.df if reactor.dci is None else reactor.dci/100
+		# Unit cell of the reactor's lattice shape, like the pin count
+		self.area = reactor.flow_area/100**2
+		self.dh = reactor.dh/100
+		if htc is None:
+			g = self.mdot/(self.total_pins*self.area)
+			re = g*self.dh/coolant.mu
+			pr = coolant.mu*coolant.cp*1000/coolant.k
+			htc = models.dittus_boelter(re, pr)*coolant.k/self.dh
+		self.htc = htc
+
+	@property
+	def assemblies(self):
+		"""Number of fuel assemblies"""
+		return int(np.count_nonzero(self.fuel))
+
+	@property
+	def total_pins(self):
+		return self.pins*self.assemblies
+
+	@property
+	def z(self):
+		"""Axial nodes (m), with z = 0 at the midplane"""
+		return np.linspace(self.shape.bottom, self.shape.top, self.nodes)
+
+	def linear_heat_rate(self):
+		"""Linear heat rate of the average pin of each assembly (W/m)
+
+		Returns:
+		--------
+		array; shaped radial.shape + (nodes,)
+		"""
+		q1avg = self.power/(self.total_pins*self.height)
+		axial_shape = self.shape(self.z)/self.shape.average
+		return q1avg*self.radial[..., np.newaxis]*axial_shape
+
+	def solve(self, workers = None):
+		"""March every assembly from the inlet
+
+		Parameter:
+		----------
+		workers:    int; number of processes. With None, a pool of one process
+		            per CPU is used only when the core has more than
+		            PARALLEL_THRESHOLD cells; 1 solves in this process.
+		            [Default: None]
+
+		Returns:
+		--------
+		CoreSolution
+		"""
+		z = self.z
+		q1 = self.linear_heat_rate()
+		fuel = self.fuel.ravel()
+		rows = q1.reshape(-1, self.nodes)[fuel]
+		mdot = (self.mdot/self.total_pins*self.flow).reshape(-1, 1)[fuel]
+		args = (self.coolant.T, self.coolant.cp, self.htc, self.dco,
+		        self.dci/self.dco, self.df, self.kclad, self.hgap, self.kfuel)
+		if workers is None:
+			workers = (os.cpu_count() or 1) if rows.size > PARALLEL_THRESHOLD else 1
+		if workers == 1:
+			fields = _temperatures(rows, z, mdot, *args)
+		else:
+			chunks = np.array_split(np.arange(len(rows)), workers)
+			with ProcessPoolExecutor(workers) as pool:
+				futures = [pool.submit(_temperatures, rows[i], z, mdot[i], *args)
+				           for i in chunks if len(i)]
+				fields = np.concatenate([f.result() for f in futures], axis=1)
+		full = np.full((len(fields), fuel.size, self.nodes), np.nan)
+		full[:, fuel] = fields
+		tcool, tclad, tfuel = (f.reshape(q1.shape) for f in full)
+		return CoreSolution(z, q1, tcool, tclad, tfuel)
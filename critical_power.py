@@ -0,0 +1,183 @@
+# Critical Power
+#
+# Critical power ratio (CPR) of BWR channels. The cumulative power along
+# each channel is integrated once; the CPR, the factor on the channel power
+# at which the equilibrium quality first meets the critical quality, is
+# then bracketed and bisected for every channel at the same time.
+
+import numpy as np
+from channel import cumulative_trapezoid
+
+KGSM2_TO_MLBHFT2 = 737.3E-6     # kg/s/m^2 -> Mlbm/h/ft^2
+
+
+class HenchGillis(object):
+	"""The Hench-Gillis correlation for critical quality
+
+	Parameters may be arrays with one entry per channel, shaped to
+	broadcast against the boiling lengths (e.g., g[:, np.newaxis]).
+
+	Parameters:
+	-----------
+	g:          float or array, kg/s/m^2; mass flux
+	d:          float, m; rod diameter
+	nrods:      int; number of heated rods in the channel
+	af:         float, m^2; flow area of the channel
+	j:          float; local peaking factor J
+	            [Default: 1.032]
+	fp:         float; peaking correction
+	            [Default: -1.66E-3]
+	"""
+	def __init__(self, g, d, nrods, af, j = 1.032, fp = -1.66E-3):
+		g = np.asarray(g, dtype=float)*KGSM2_TO_MLBHFT2
+		self.a = 0.5*g**-0.43
+		self.b = 165 + 115*g**2.3
+		self.d = d
+		self.nrods = nrods
+		self.af = af
+		self.j = j
+		self.fp = fp
+
+	def __call__(self, lboil):
+		"""Critical quality
+
+		Parameter:
+		----------
+		lboil:      float or array, m; boiling length
+
+		Returns:
+		--------
+		float or array; critical quality
+		"""
+		zed = np.pi*self.d*self.nrods*np.asarray(lboil, dtype=float)/self.af
+		return (self.a*zed/(self.b + zed)*(2 - self.j) + self.fp)[()]
+
+
+def _quality_slope(z, q1, mdot, hfg):
+	"""d(xe)/d(power ratio) on the grid: integral(q')/(mdot*hfg)"""
+	mdot = np.asarray(mdot, dtype=float)[..., np.newaxis]
+	hfg = np.asarray(hfg, dtype=float)[..., np.newaxis]
+	return cumulative_trapezoid(q1, z)/1000/(mdot*hfg)
+
+
+def _boundary(z, s, xein, ratio):
+	"""Where xe = xein + ratio*s crosses zero, for each channel
+	(inf if it never does). s must be nondecreasing along the channel."""
+	target = -xein/ratio
+	count = np.sum(s < target[..., np.newaxis], axis=-1)
+	i = np.clip(count, 1, len(z) - 1)
+	s0 = np.take_along_axis(s, (i - 1)[..., np.newaxis], axis=-1)[..., 0]
+	s1 = np.take_along_axis(s, i[..., np.newaxis], axis=-1)[..., 0]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		frac = np.clip((target - s0)/(s1 - s0), 0, 1)
+	zb = z[i - 1] + frac*(z[i] - z[i - 1])
+	zb = np.where(count == 0, z[0], zb)
+	return np.where(count == len(z), np.inf, zb)
+
+
+def equilibrium_quality(z, q1, mdot, hin, hf, hfg, ratio = 1.0):
+	"""Equilibrium quality along the channel(s)
+
+	Parameters:
+	-----------
+	See boiling_boundary()
+
+	Returns:
+	--------
+	array; xe on the grid, with the shape of q1
+	"""
+	s = _quality_slope(np.asarray(z, dtype=float), q1, mdot, hfg)
+	xein = np.asarray((np.asarray(hin) - hf)/hfg)[..., np.newaxis]
+	return xein + np.asarray(ratio)[..., np.newaxis]*s
+
+
+def boiling_boundary(z, q1, mdot, hin, hf, hfg, ratio = 1.0):
+	"""Axial position where the equilibrium quality reaches zero
+
+	Parameters:
+	-----------
+	z:          array, m; increasing axial grid, inlet to outlet
+	q1:         array, W/m; linear heat rate on the grid, with one row
+	            per channel (..., len(z))
+	mdot:       float or array, kg/s; mass flow rate of each channel
+	hin:        float or array, kJ/kg; inlet enthalpy
+	hf:         float or array, kJ/kg; saturated liquid enthalpy
+	hfg:        float or array, kJ/kg; latent heat
+	ratio:      float or array; multiplier on the channel power
+	            [Default: 1.0]
+
+	Returns:
+	--------
+	float or array, m; boiling boundary (inf where there is no boiling)
+	"""
+	z = np.asarray(z, dtype=float)
+	s = _quality_slope(z, q1, mdot, hfg)
+	xein = np.broadcast_to((np.asarray(hin) - hf)/hfg, s.shape[:-1])
+	ratio = np.broadcast_to(np.asarray(ratio, dtype=float), s.shape[:-1])
+	return _boundary(z, s, xein, ratio)[()]
+
+
+def critical_power_ratio(z, q1, mdot, hin, hf, hfg, correlation,
+                         lmin = 0.05, tol = 1E-6, maxiter = 200):
+	"""Critical power ratio of one or many channels
+
+	The CPR is the factor on the channel power at which the equilibrium
+	quality xe(z) first touches the critical quality xc(L_boil(z)) given
+	by the correlation, with the boiling boundary moving with the power.
+	The MCPR of a core is the minimum over its channels.
+
+	Parameters:
+	-----------
+	z:          array, m; increasing axial grid, inlet to outlet
+	q1:         array, W/m; nonnegative linear heat rate on the grid, with
+	            one row per channel (..., len(z))
+	mdot:       float or array, kg/s; mass flow rate of each channel
+	hin:        float or array, kJ/kg; inlet enthalpy
+	hf:         float or array, kJ/kg; saturated liquid enthalpy
+	hfg:        float or array, kJ/kg; latent heat
+	correlation:callable; critical quality as a function of boiling
+	            length (m), vectorized (e.g., HenchGillis)
+	lmin:       float, m; shortest boiling length considered. Just past the
+	            boiling boundary, the additive correction of correlations such
+	            as Hench-Gillis makes xc < xe for any power.
+	            [Default: 0.05]
+	tol:        float; absolute tolerance on the CPR
+	            [Default: 1E-6]
+	maxiter:    int; maximum number of bracketing and bisection steps
+	            [Default: 200]
+
+	Returns:
+	--------
+	float or array; CPR of each channel
+	"""
+	z = np.asarray(z, dtype=float)
+	s = _quality_slope(z, q1, mdot, hfg)
+	shape = s.shape[:-1]
+	xein = np.broadcast_to((np.asarray(hin) - hf)/hfg, shape)
+
+	def margin(ratio):
+		"""max over z of xe - xc; positive means past critical"""
+		zb = _boundary(z, s, xein, ratio)
+		lboil = z - zb[..., np.newaxis]
+		xe = xein[..., np.newaxis] + ratio[..., np.newaxis]*s
+		xc = correlation(np.maximum(lboil, 0))
+		return np.max(np.where(lboil > lmin, xe - xc, -np.inf), axis=-1)
+
+	lo = np.zeros(shape)
+	hi = np.ones(shape)
+	for __ in range(maxiter):
+		below = margin(hi) < 0
+		if not below.any():
+			break
+		lo = np.where(below, hi, lo)
+		hi = np.where(below, 2*hi, hi)
+	else:
+		raise ValueError("Could not bracket the critical power ratio.")
+	for __ in range(maxiter):
+		if np.max(hi - lo) < tol:
+			break
+		mid = (lo + hi)/2
+		past = margin(mid) >= 0
+		hi = np.where(past, mid, hi)
+		lo = np.where(past, lo, mid)
+	return ((lo + hi)/2)[()]
@@ -0,0 +1,273 @@
+# Design
+#
+# Lattice redesign explorer. At fixed core power, height, and number of
+# assemblies, every combination of pins per assembly, pin pitch, and clad
+# diameter is evaluated as a vectorized grid. The grid is generated lazily
+# in chunks, so that million-point sweeps run in bounded memory, and the
+# Pareto-efficient designs are kept as the chunks go by.
+
+from collections import namedtuple
+import numpy as np
+import models
+import lattice
+
+# Number of grid points evaluated at a time
+CHUNK_SIZE = 65536
+# Diameter in the Groeneveld CHF correction, sqrt(0.008/Dh)
+_CHF_DIAMETER = 0.008   # m
+
+# Designs fields that are NaN without mdot and coolant
+_HYDRAULIC_FIELDS = ("g", "dp", "margin")
+
+Designs = namedtuple("Designs", ["index", "npins", "ppitch", "dco", "q1", "q2",
+                                 "area", "dh", "g", "dp", "margin"])
+
+
+def _covers(better, points):
+	"""covers[i, j]: better[j] is at most points[i] in every cost"""
+	covers = better[:, 0] <= points[:, 0, np.newaxis]
+	for j in range(1, points.shape[1]):
+		covers &= better[:, j] <= points[:, j, np.newaxis]
+	return covers
+
+
+def pareto_mask(costs, block = 1024):
+	"""Which points are Pareto-efficient (no other point is at least as good
+	in every cost and better in one); all costs are minimized
+
+	Points are visited by increasing sum of normalized costs, so a point
+	can only be dominated by one visited before it. Each block of points is
+	checked against slices of the efficient points found so far, dropping
+	the dominated ones as it goes, and the survivors against each other.
+
+	Parameters:
+	-----------
+	costs:      array (points, objectives)
+	block:      int; points (and efficient points) compared at a time
+	            [Default: 1024]
+
+	Returns:
+	--------
+	Boolean array (points,); of identical points, only the first is kept
+	"""
+	costs = np.asarray(costs, dtype=float)
+	mask = np.zeros(len(costs), dtype=bool)
+	if not len(costs):
+		return mask
+	span = np.ptp(costs, axis=0)
+	scores = np.sum((costs - costs.min(axis=0))/np.where(span > 0, span, 1), axis=1)
+	order = np.argsort(scores, kind="stable")
+	front = costs[:0]
+	for start in range(0, len(order), block):
+		index = order[start:start + block]
+		points = costs[index]
+		# Drop points that some efficient point is at least as good as everywhere
+		for first in range(0, len(front), block):
+			better = front[first:first + block]
+			dominated = np.any(_covers(better, points), axis=1)
+			index, points = index[~dominated], points[~dominated]
+			if not len(index):
+				break
+		dominated = np.any(np.tril(_covers(points, points), -1), axis=1)
+		mask[index[~dominated]] = True
+		front = np.concatenate((front, points[~dominated]))
+	return mask
+
+
+class Explorer(object):
+	"""Design space of lattices around a reference reactor
+
+	The lattice shape is the reference's: square, or hexagonal. As in
+	ReactorType, npins counts the pins across a square assembly, or all
+	the pins of a hexagonal one. Geometry is given in cm, like
+	ReactorType; results are in SI units.
+	The hydraulics use the unit cell: the core flow is split evenly over
+	the coolant flow area, and the bundle pressure drop is the friction
+	drop over the height. The DNB margin proxy is the Groeneveld diameter
+	factor sqrt(0.008/Dh) times sqrt(G), over the peak heat flux, relative
+	to the reference reactor: above 1 is better than the reference.
+
+	Parameters:
+	-----------
+	reactor:    reactors.ReactorType; reference design, with ppitch, npins,
+	            dco, height, and shape ("square" or "hexagon"). Its apitch,
+	            if set, bounds the width of the pin array: npins*ppitch
+	            across a square assembly, or the flat-to-flat width of the
+	            hexagonal rings.
+	power:      float, W; core thermal power
+	npins:      int or array; pins across a square assembly, or pins per
+	            hexagonal assembly
+	ppitch:     float or array, cm; pin pitch
+	dco:        float or array, cm; clad outer diameter
+	nassm:      int; number of assemblies
+	            [Default: None -- reactor.nassm]
+	mdot:       float, kg/s; core flow rate
+	            [Default: None -- no hydraulics; dp and margin are NaN]
+	coolant:    coolant state with rho and mu (e.g., if97.PT(P, T))
+	            [Default: None]
+	peaking:    float; total peaking factor, for the peak heat flux
+	            [Default: 1.0]
+	friction:   callable; friction factor as a function of Reynolds number
+	            [Default: models.mcadams]
+	chunk:      int; grid points per chunk
+	            [Default: CHUNK_SIZE]
+	"""
+	def __init__(self, reactor, power, npins, ppitch, dco, nassm = None,
+	             mdot = None, coolant = None, peaking = 1.0,
+	             friction = models.mcadams, chunk = CHUNK_SIZE):
+		if reactor.shape not in ("square", "hexagon"):
+			errstr = "Cannot explore {} lattices; ".format(reactor.shape)
+			errstr += "the reference must be square or hexagonal."
+			raise ValueError(errstr)
+		self.reactor = reactor
+		self.power = power
+		self.npins = np.atleast_1d(np.asarray(npins, dtype=int))
+		self.ppitch = np.atleast_1d(np.asarray(ppitch, dtype=float))
+		self.dco = np.atleast_1d(np.asarray(dco, dtype=float))
+		if nassm is None:
+			nassm = reactor.nassm
+		if not nassm:
+			raise ValueError("The number of assemblies must be set.")
+		self.nassm = nassm
+		if (mdot is None) != (coolant is None):
+			raise TypeError("Give both mdot and coolant, or neither.")
+		self.mdot = mdot
+		self.coolant = coolant
+		self.peaking = peaking
+		self.friction = friction
+		self.chunk = chunk
+		self._reference = None
+
+	@property
+	def shape(self):
+		return (len(self.npins), len(self.ppitch), len(self.dco))
+
+	@property
+	def size(self):
+		return int(np.prod(self.shape))
+
+	def _margin(self, q2, dh, g):
+		return np.sqrt(_CHF_DIAMETER/dh)*np.sqrt(g)/(self.peaking*q2)
+
+	@property
+	def reference(self):
+		"""Designs for the reference reactor itself"""
+		if self._reference is None:
+			rx = self.reactor
+			self._reference = self.at(rx.npins, rx.ppitch, rx.dco, relative = False)
+		return self._reference
+
+	def at(self, npins, ppitch, dco, relative = True):
+		"""Evaluate designs at the given (broadcast) parameters
+
+		Parameters:
+		-----------
+		npins:      int or array; pins across an assembly
+		ppitch:     float or array, cm; pin pitch
+		dco:        float or array, cm; clad outer diameter
+		relative:   Boolean; whether to divide the margin by the reference's
+		            [Default: True]
+
+		Returns:
+		--------
+		Designs, with index -1. Infeasible designs (pins that touch, or an
+		assembly wider than apitch) have NaN results.
+		"""
+		npins, ppitch, dco = np.broadcast_arrays(np.asarray(npins, dtype=float),
+		                                         np.asarray(ppitch, dtype=float),
+		                                         np.asarray(dco, dtype=float))
+		return self._evaluate(np.full(npins.shape, -1), npins, ppitch, dco, relative)
+
+	def _evaluate(self, index, npins, ppitch, dco, relative = True):
+		height = self.reactor.height/100
+		pitch = ppitch/100
+		d = dco/100
+		shape = self.reactor.shape
+		feasible = d < pitch
+		# Same rule as ReactorType.total_pins
+		if shape == "square":
+			per_assembly = npins**2
+			width = npins*ppitch
+		else:
+			per_assembly = npins
+			# Rings around the center pin: npins = 3*rings*(rings + 1) + 1
+			rings = (np.sqrt(np.maximum(12*npins - 3, 0)) - 3)/6
+			width = (np.sqrt(3)*rings + 1)*ppitch
+		if self.reactor.apitch:
+			feasible &= width <= self.reactor.apitch
+		pins = per_assembly*self.nassm
+		q1 = self.power/(pins*height)
+		q2 = q1/(np.pi*d)
+		cell = lattice.cell_area(pitch, shape) - np.pi/4*d**2
+		area = pins*cell
+		with np.errstate(invalid="ignore", divide="ignore"):
+			dh = 4*cell/(np.pi*d)
+			if self.mdot is None:
+				g = dp = margin = np.full(q1.shape, np.nan)
+			else:
+				g = self.mdot/area
+				re = g*dh/self.coolant.mu
+				dp = self.friction(re)*height/dh*g**2/(2*self.coolant.rho)
+				margin = self._margin(q2, dh, g)
+				if relative:
+					ref = self.reference
+					margin = margin/self._margin(ref.q2, ref.dh, ref.g)
+		results = [np.where(feasible, v, np.nan) for v in (q1, q2, area, dh, g, dp, margin)]
+		return Designs(index, npins.astype(int), ppitch, dco, *results)
+
+	def chunks(self):
+		"""Evaluate the grid lazily
+
+		Yields:
+		-------
+		Designs for up to `chunk` grid points at a time; index is the
+		flat index into the (npins, ppitch, dco) grid
+		"""
+		for start in range(0, self.size, self.chunk):
+			index = np.arange(start, min(start + self.chunk, self.size))
+			i, j, k = np.unravel_index(index, self.shape)
+			yield self._evaluate(index, self.npins[i].astype(float),
+			                     self.ppitch[j], self.dco[k])
+
+	def evaluate(self):
+		"""Evaluate the whole grid at once (for small grids)
+
+		Returns:
+		--------
+		Designs, with arrays shaped like the (npins, ppitch, dco) grid
+		"""
+		parts = list(self.chunks())
+		return Designs(*(np.concatenate(f).reshape(self.shape) for f in zip(*parts)))
+
+	def pareto(self, minimize = ("q1", "dp"), maximize = ("margin",)):
+		"""Pareto-efficient feasible designs over the whole grid
+
+		Parameters:
+		-----------
+		minimize:   tuple of str; Designs fields to minimize
+		            [Default: ("q1", "dp")]
+		maximize:   tuple of str; Designs fields to maximize
+		            [Default: ("margin",)]
+
+		Returns:
+		--------
+		Designs of the efficient set, in grid order
+		"""
+		for f in minimize + maximize:
+			if f not in Designs._fields:
+				raise ValueError("Unknown objective: {}".format(f))
+			if f in _HYDRAULIC_FIELDS and self.mdot is None:
+				errstr = "Objective {} needs the hydraulics; ".format(f)
+				errstr += "give the Explorer mdot and coolant."
+				raise ValueError(errstr)
+		front = None
+		for designs in self.chunks():
+			if front is not None:
+				designs = Designs(*(np.concatenate(f) for f in zip(front, designs)))
+			costs = np.column_stack([getattr(designs, f) for f in minimize] +
+			                        [-getattr(designs, f) for f in maximize])
+			feasible = np.all(np.isfinite(costs), axis=1)
+			keep = np.flatnonzero(feasible)[pareto_mask(costs[feasible])]
+			front = Designs(*(f[keep] for f in designs))
+		order = np.argsort(front.index)
+		return Designs(*(f[order] for f in front))
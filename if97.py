@@ -0,0 +1,679 @@
+# IF97
+#
+# Vectorized IAPWS Industrial Formulation 1997 for the thermodynamic
+# properties of water and steam: regions 1, 2, and 4, with the backward
+# equations T(P, h), and the IAPWS viscosity and thermal conductivity.
+# Whole arrays of states are evaluated at once, instead of one IAPWS97
+# object per state. States in regions 3 and 5 are not covered (NaN).
+
+from collections import namedtuple
+import numpy as np
+
+R = 0.461526        # kJ/kg-K; specific gas constant of water
+TC = 647.096        # K; critical temperature
+PC = 22.064         # MPa; critical pressure
+RHOC = 322.0        # kg/m^3; critical density
+T_MIN = 273.15      # K; lower limit of regions 1 and 2
+T13 = 623.15        # K; boundary between regions 1 and 3
+T_MAX = 1073.15     # K; upper limit of region 2
+P_MAX = 100.0       # MPa; upper limit of regions 1 and 2
+
+State = namedtuple("State", ("T", "P", "x", "region", "v", "rho", "h", "u",
+                             "s", "cp", "cv", "w", "mu", "k", "Prandt", "sigma"))
+
+# Region 1: Gibbs free energy (IF97 Eq. 7, Table 2)
+_R1_I = np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3,
+                  3, 4, 4, 4, 5, 8, 8, 21, 23, 29, 30, 31, 32])
+_R1_J = np.array([-2, -1, 0, 1, 2, 3, 4, 5, -9, -7, -1, 0, 1, 3, -3, 0, 1, 3, 17,
+                  -4, 0, 6, -5, -2, 10, -8, -11, -6, -29, -31, -38, -39, -40, -41])
+_R1_N = np.array([
+	0.14632971213167, -0.84548187169114, -0.37563603672040e1, 0.33855169168385e1,
+	-0.95791963387872, 0.15772038513228, -0.16616417199501e-1, 0.81214629983568e-3,
+	0.28319080123804e-3, -0.60706301565874e-3, -0.18990068218419e-1,
+	-0.32529748770505e-1, -0.21841717175414e-1, -0.52838357969930e-4,
+	-0.47184321073267e-3, -0.30001780793026e-3, 0.47661393906987e-4,
+	-0.44141845330846e-5, -0.72694996297594e-15, -0.31679644845054e-4,
+	-0.28270797985312e-5, -0.85205128120103e-9, -0.22425281908000e-5,
+	-0.65171222895601e-6, -0.14341729937924e-12, -0.40516996860117e-6,
+	-0.12734301741641e-8, -0.17424871230634e-9, -0.68762131295531e-18,
+	0.14478307828521e-19, 0.26335781662795e-22, -0.11947622640071e-22,
+	0.18228094581404e-23, -0.93537087292458e-25])
+
+# Region 1: backward equation T(P, h) (IF97 Eq. 11, Table 6)
+_B1_I = np.array([0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 2, 2, 3, 3, 4, 5, 6])
+_B1_J = np.array([0, 1, 2, 6, 22, 32, 0, 1, 2, 3, 4, 10, 32, 10, 32, 10, 32, 32,
+                  32, 32])
+_B1_N = np.array([
+	-0.23872489924521e3, 0.40421188637945e3, 0.11349746881718e3,
+	-0.58457616048039e1, -0.15285482413140e-3, -0.10866707695377e-5,
+	-0.13391744872602e2, 0.43211039183559e2, -0.54010067170506e2,
+	0.30535892203916e2, -0.65964749423638e1, 0.93965400878363e-2,
+	0.11573647505340e-6, -0.25858641282073e-4, -0.40644363084799e-8,
+	0.66456186191635e-7, 0.80670734103027e-10, -0.93477771213947e-12,
+	0.58265442020601e-14, -0.15020185953503e-16])
+
+# Region 2: ideal-gas part of the Gibbs free energy (IF97 Eq. 16, Table 10)
+_R2_J0 = np.array([0, 1, -5, -4, -3, -2, -1, 2, 3])
+_R2_N0 = np.array([
+	-0.96927686500217e1, 0.10086655968018e2, -0.56087911283020e-2,
+	0.71452738081455e-1, -0.40710498223928, 0.14240819171444e1,
+	-0.43839511319450e1, -0.28408632460772, 0.21268463753307e-1])
+
+# Region 2: residual part of the Gibbs free energy (IF97 Eq. 17, Table 11)
+_R2_I = np.array([1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5, 6, 6, 6,
+                  7, 7, 7, 8, 8, 9, 10, 10, 10, 16, 16, 18, 20, 20, 20, 21, 22,
+                  23, 24, 24, 24])
+_R2_J = np.array([0, 1, 2, 3, 6, 1, 2, 4, 7, 36, 0, 1, 3, 6, 35, 1, 2, 3, 7, 3,
+                  16, 35, 0, 11, 25, 8, 36, 13, 4, 10, 14, 29, 50, 57, 20, 35,
+                  48, 21, 53, 39, 26, 40, 58])
+_R2_N = np.array([
+	-0.17731742473213e-2, -0.17834862292358e-1, -0.45996013696365e-1,
+	-0.57581259083432e-1, -0.50325278727930e-1, -0.33032641670203e-4,
+	-0.18948987516315e-3, -0.39392777243355e-2, -0.43797295650573e-1,
+	-0.26674547914087e-4, 0.20481737692309e-7, 0.43870667284435e-6,
+	-0.32277677238570e-4, -0.15033924542148e-2, -0.40668253562649e-1,
+	-0.78847309559367e-9, 0.12790717852285e-7, 0.48225372718507e-6,
+	0.22922076337661e-5, -0.16714766451061e-10, -0.21171472321355e-2,
+	-0.23895741934104e2, -0.59059564324270e-17, -0.12621808899101e-5,
+	-0.38946842435739e-1, 0.11256211360459e-10, -0.82311340897998e1,
+	0.19809712802088e-7, 0.10406965210174e-18, -0.10234747095929e-12,
+	-0.10018179379511e-8, -0.80882908646985e-10, 0.10693031879409,
+	-0.33662250574171, 0.89185845355421e-24, 0.30629316876232e-12,
+	-0.42002467698208e-5, -0.59056029685639e-25, 0.37826947613457e-5,
+	-0.12768608934681e-14, 0.73087610595061e-28, 0.55414715350778e-16,
+	-0.94369707241210e-6])
+
+# Region 2: backward equations T(P, h) (IF97 Eqs. 22-24, Tables 20-22)
+_B2A_I = np.array([0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2,
+                   2, 2, 3, 3, 4, 4, 4, 5, 5, 5, 6, 6, 7])
+_B2A_J = np.array([0, 1, 2, 3, 7, 20, 0, 1, 2, 3, 7, 9, 11, 18, 44, 0, 2, 7, 36,
+                   38, 40, 42, 44, 24, 44, 12, 32, 44, 32, 36, 42, 34, 44, 28])
+_B2A_N = np.array([
+	0.10898952318288e4, 0.84951654495535e3, -0.10781748091826e3,
+	0.33153654801263e2, -0.74232016790248e1, 0.11765048724356e2,
+	0.18445749355790e1, -0.41792700549624e1, 0.62478196935812e1,
+	-0.17344563108114e2, -0.20058176862096e3, 0.27196065473796e3,
+	-0.45511318285818e3, 0.30919688604755e4, 0.25226640357872e6,
+	-0.61707422868339e-2, -0.31078046629583, 0.11670873077107e2,
+	0.12812798404046e9, -0.98554909623276e9, 0.28224546973002e10,
+	-0.35948971410703e10, 0.17227349913197e10, -0.13551334240775e5,
+	0.12848734664650e8, 0.13865724283226e1, 0.23598832556514e6,
+	-0.13105236545054e8, 0.73999835474766e4, -0.55196697030060e6,
+	0.37154085996233e7, 0.19127729239660e5, -0.41535164835634e6,
+	-0.62459855192507e2])
+_B2B_I = np.array([0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 3,
+                   3, 3, 3, 4, 4, 4, 4, 4, 4, 5, 5, 5, 6, 7, 7, 9, 9])
+_B2B_J = np.array([0, 1, 2, 12, 18, 24, 28, 40, 0, 2, 6, 12, 18, 24, 28, 40, 2,
+                   8, 18, 40, 1, 2, 12, 24, 2, 12, 18, 24, 28, 40, 18, 24, 40,
+                   28, 2, 28, 1, 40])
+_B2B_N = np.array([
+	0.14895041079516e4, 0.74307798314034e3, -0.97708318797837e2,
+	0.24742464705674e1, -0.63281320016026, 0.11385952129658e1,
+	-0.47811863648625, 0.85208123431544e-2, 0.93747147377932,
+	0.33593118604916e1, 0.33809355601454e1, 0.16844539671904,
+	0.73875745236695, -0.47128737436186, 0.15020273139707,
+	-0.21764114219750e-2, -0.21810755324761e-1, -0.10829784403677,
+	-0.46333324635812e-1, 0.71280351959551e-4, 0.11032831789999e-3,
+	0.18955248387902e-3, 0.30891541160537e-2, 0.13555504554949e-2,
+	0.28640237477456e-6, -0.10779857357512e-4, -0.76462712454814e-4,
+	0.14052392818316e-4, -0.31083814331434e-4, -0.10302738212103e-5,
+	0.28217281635040e-6, 0.12704902271945e-5, 0.73803353468292e-7,
+	-0.11030139238909e-7, -0.81456365207833e-13, -0.25180545682962e-10,
+	-0.17565233969407e-17, 0.86934156344163e-14])
+_B2C_I = np.array([-7, -7, -6, -6, -5, -5, -2, -2, -1, -1, 0, 0, 1, 1, 2, 6, 6,
+                   6, 6, 6, 6, 6, 6])
+_B2C_J = np.array([0, 4, 0, 2, 0, 2, 0, 1, 0, 2, 0, 1, 4, 8, 4, 0, 1, 4, 10, 12,
+                   16, 20, 22])
+_B2C_N = np.array([
+	-0.32368398555242e13, 0.73263350902181e13, 0.35825089945447e12,
+	-0.58340131851590e12, -0.10783068217470e11, 0.20825544563171e11,
+	0.61074783564516e6, 0.85977722535580e6, -0.25745723604170e5,
+	0.31081088422714e5, 0.12082315865936e4, 0.48219755109255e3,
+	0.37966001272486e1, -0.10842984880077e2, -0.45364172676660e-1,
+	0.14559115658698e-12, 0.11261597407230e-11, -0.17804982240686e-10,
+	0.12324579690832e-6, -0.11606921130984e-5, 0.27846367088554e-4,
+	-0.59270038474176e-3, 0.12918582991878e-2])
+
+# Region 4: saturation line (IF97 Eqs. 30-31, Table 34)
+_R4_N = (None, 0.11670521452767e4, -0.72421316703206e6, -0.17073846940092e2,
+         0.12020824702470e5, -0.32325550322333e7, 0.14915108613530e2,
+         -0.48232657361591e4, 0.40511340542057e6, -0.23855557567849,
+         0.65017534844798e3)
+
+# Viscosity, IAPWS 2008 (Eqs. 11-12)
+_MU0_H = np.array([1.67752, 2.20462, 0.6366564, -0.241605])
+_MU1_I = np.array([0, 1, 2, 3, 0, 1, 2, 3, 5, 0, 1, 2, 3, 4, 0, 1, 0, 3, 4, 3, 5])
+_MU1_J = np.array([0, 0, 0, 0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 4, 4, 5, 6, 6])
+_MU1_H = np.array([
+	0.520094, 0.850895e-1, -0.108374e1, -0.289555, 0.222531, 0.999115,
+	0.188797e1, 0.126613e1, 0.120573, -0.281378, -0.906851, -0.772479,
+	-0.489837, -0.257040, 0.161913, 0.257399, -0.325372e-1, 0.698452e-1,
+	0.872102e-2, -0.435673e-2, -0.593264e-3])
+
+# Thermal conductivity, IAPWS 2011 (Eqs. 16-17, and Eq. 25 of the
+# industrial formulation for the reference compressibility)
+_K0_L = np.array([2.443221e-3, 1.323095e-2, 6.770357e-3, -3.454586e-3, 4.096266e-4])
+_K1_N = np.array([
+	[1.60397357, -0.646013523, 0.111443906, 0.102997357, -0.0504123634, 0.00609859258],
+	[2.33771842, -2.78843778, 1.53616167, -0.463045512, 0.0832827019, -0.00719201245],
+	[2.19650529, -4.54580785, 3.55777244, -1.40944978, 0.275418278, -0.0205938816],
+	[-1.21051378, 1.60812989, -0.621178141, 0.0716373224, 0, 0],
+	[-2.7203370, 4.57586331, -3.18369245, 1.1168348, -0.19268305, 0.012913842]])
+_K2_RHO = np.array([0.310559006, 0.776397516, 1.242236025, 1.863354037])
+_K2_A = np.array([
+	[6.53786807199516, -5.61149954923348, 3.39624167361325,
+	 -2.27492629730878, 10.2631854662709, 1.97815050331519],
+	[6.52717759281799, -6.30816983387575, 8.08379285492595,
+	 -9.82240510197603, 12.1358413791395, -5.54349664571295],
+	[5.35500529896124, -3.96415689925446, 8.91990208918795,
+	 -12.0338729505790, 9.19494865194302, -2.16866274479712],
+	[1.55225959906681, 0.464621290821181, 8.93237374861479,
+	 -11.0321960061126, 6.16780999933360, -0.965458722086812],
+	[1.11999926419994, 0.595748562571649, 9.88952565078920,
+	 -10.3255051147040, 4.66861294457414, -0.503243546373828]])
+
+
+def psat(T):
+	"""Saturation pressure (IF97 Eq. 30)
+
+	Parameter:
+	----------
+	T:          float or array, K; temperature on [273.15, 647.096]
+
+	Returns:
+	--------
+	float or array, MPa; saturation pressure (NaN outside the domain)
+	"""
+	n = _R4_N
+	T = np.asarray(T, dtype=float)
+	theta = T + n[9]/(T - n[10])
+	A = theta**2 + n[1]*theta + n[2]
+	B = n[3]*theta**2 + n[4]*theta + n[5]
+	C = n[6]*theta**2 + n[7]*theta + n[8]
+	with np.errstate(invalid="ignore"):
+		p = (2*C/(-B + np.sqrt(B**2 - 4*A*C)))**4
+	return np.where((T >= T_MIN) & (T <= TC), p, np.nan)[()]
+
+
+def tsat(P):
+	"""Saturation temperature (IF97 Eq. 31)
+
+	Parameter:
+	----------
+	P:          float or array, MPa; pressure on [611.213 Pa, 22.064 MPa]
+
+	Returns:
+	--------
+	float or array, K; saturation temperature (NaN outside the domain)
+	"""
+	n = _R4_N
+	P = np.asarray(P, dtype=float)
+	with np.errstate(invalid="ignore"):
+		beta = P**0.25
+		E = beta**2 + n[3]*beta + n[6]
+		F = n[1]*beta**2 + n[4]*beta + n[7]
+		G = n[2]*beta**2 + n[5]*beta + n[8]
+		D = 2*G/(-F - np.sqrt(F**2 - 4*E*G))
+		t = (n[10] + D - np.sqrt((n[10] + D)**2 - 4*(n[9] + n[10]*D)))/2
+	return np.where((P >= 611.212677E-6) & (P <= PC), t, np.nan)[()]
+
+
+def p23(T):
+	"""Pressure on the boundary between regions 2 and 3 (IF97 Eq. 5)
+
+	Parameter:
+	----------
+	T:          float or array, K; temperature
+
+	Returns:
+	--------
+	float or array, MPa; boundary pressure
+	"""
+	T = np.asarray(T, dtype=float)
+	return 0.34805185628969e3 - 0.11671859879975e1*T + 0.10192970039326e-2*T**2
+
+
+def t23(P):
+	"""Temperature on the boundary between regions 2 and 3 (IF97 Eq. 6)
+
+	Parameter:
+	----------
+	P:          float or array, MPa; pressure
+
+	Returns:
+	--------
+	float or array, K; boundary temperature
+	"""
+	P = np.asarray(P, dtype=float)
+	with np.errstate(invalid="ignore"):
+		return 0.57254459862746e3 + np.sqrt((P - 0.13918839778870e2)/0.10192970039326e-2)
+
+
+def _gibbs1(T, P):
+	"""Dimensionless Gibbs free energy of region 1 and its derivatives
+	with respect to pi = P/16.53 and tau = 1386/T"""
+	pi = (P/16.53)[:, np.newaxis]
+	tau = (1386/T)[:, np.newaxis]
+	a = 7.1 - pi
+	b = tau - 1.222
+	n, I, J = _R1_N, _R1_I, _R1_J
+	aI = a**I
+	bJ = b**J
+	aI1 = a**(I - 1)
+	bJ1 = b**(J - 1)
+	g = np.sum(n*aI*bJ, axis=1)
+	gp = -np.sum(n*I*aI1*bJ, axis=1)
+	gpp = np.sum(n*I*(I - 1)*a**(I - 2)*bJ, axis=1)
+	gt = np.sum(n*J*aI*bJ1, axis=1)
+	gtt = np.sum(n*J*(J - 1)*aI*b**(J - 2), axis=1)
+	gpt = -np.sum(n*I*J*aI1*bJ1, axis=1)
+	return pi[:, 0], tau[:, 0], g, gp, gpp, gt, gtt, gpt
+
+
+def _gibbs2(T, P):
+	"""Dimensionless Gibbs free energy of region 2 (ideal + residual)
+	and its derivatives with respect to pi = P/1 MPa and tau = 540/T"""
+	pi = P[:, np.newaxis]
+	tau = (540/T)[:, np.newaxis]
+	n0, J0 = _R2_N0, _R2_J0
+	n, I, J = _R2_N, _R2_I, _R2_J
+	b = tau - 0.5
+	pI = pi**I
+	bJ = b**J
+	pI1 = pi**(I - 1)
+	bJ1 = b**(J - 1)
+	g = np.log(pi[:, 0]) + np.sum(n0*tau**J0, axis=1) + np.sum(n*pI*bJ, axis=1)
+	gp = 1/pi[:, 0] + np.sum(n*I*pI1*bJ, axis=1)
+	gpp = -1/pi[:, 0]**2 + np.sum(n*I*(I - 1)*pi**(I - 2)*bJ, axis=1)
+	gt = np.sum(n0*J0*tau**(J0 - 1), axis=1) + np.sum(n*J*pI*bJ1, axis=1)
+	gtt = (np.sum(n0*J0*(J0 - 1)*tau**(J0 - 2), axis=1) +
+	       np.sum(n*J*(J - 1)*pI*b**(J - 2), axis=1))
+	gpt = np.sum(n*I*J*pI1*bJ1, axis=1)
+	return pi[:, 0], tau[:, 0], g, gp, gpp, gt, gtt, gpt
+
+
+def _thermo(T, P, gibbs):
+	"""Thermodynamic properties from the derivatives of the
+	dimensionless Gibbs free energy
+
+	Returns:
+	--------
+	dict of arrays: v, rho, h, u, s, cp, cv, w, alpha (1/K), and kt (1/MPa)
+	"""
+	pi, tau, g, gp, gpp, gt, gtt, gpt = gibbs
+	props = {}
+	props["v"] = pi*gp*R*T/P/1000
+	props["rho"] = 1/props["v"]
+	props["h"] = tau*gt*R*T
+	props["u"] = props["h"] - P*1000*props["v"]
+	props["s"] = R*(tau*gt - g)
+	props["cp"] = -R*tau**2*gtt
+	props["cv"] = R*(-tau**2*gtt + (gp - tau*gpt)**2/gpp)
+	props["w"] = np.sqrt(R*T*1000*gp**2/((gp - tau*gpt)**2/(tau**2*gtt) - gpp))
+	props["alpha"] = (1 - tau*gpt/gp)/T
+	props["kt"] = -pi*gpp/gp/P
+	return props
+
+
+def thermo(P, T, region):
+	"""Thermodynamic properties and coefficients of region 1 or 2 states
+
+	Unlike PT(), the region is not checked, so that the equations can be
+	evaluated on their boundaries (e.g. both phases on the saturation line).
+
+	Parameters:
+	-----------
+	P:          float or array, MPa; pressure
+	T:          float or array, K; temperature
+	region:     int; 1 or 2
+
+	Returns:
+	--------
+	dict of floats or arrays: v, rho, h, u, s, cp, cv, w,
+	alpha (1/K; isobaric expansion), and kt (1/MPa; isothermal compressibility)
+	"""
+	shape, (P, T) = _broadcast(P, T)
+	gibbs = {1: _gibbs1, 2: _gibbs2}[region]
+	props = _thermo(T, P, gibbs(T, P))
+	return {name: value.reshape(shape)[()] for name, value in props.items()}
+
+
+def viscosity(rho, T):
+	"""Dynamic viscosity of water (IAPWS 2008, without the critical
+	enhancement, as in the industrial formulation)
+
+	Parameters:
+	-----------
+	rho:        float or array, kg/m^3; density
+	T:          float or array, K; temperature
+
+	Returns:
+	--------
+	float or array, Pa-s; viscosity
+	"""
+	Tr = np.asarray(T, dtype=float)/TC
+	d = np.asarray(rho, dtype=float)/RHOC
+	mu0 = 100*np.sqrt(Tr)/np.sum(_MU0_H/Tr[..., np.newaxis]**np.arange(4), axis=-1)
+	terms = (_MU1_H*(1/Tr[..., np.newaxis] - 1)**_MU1_I*
+	         (d[..., np.newaxis] - 1)**_MU1_J)
+	mu1 = np.exp(d*np.sum(terms, axis=-1))
+	return (mu0*mu1*1E-6)[()]
+
+
+def conductivity(rho, T, cp, cv, mu, drhodp):
+	"""Thermal conductivity of water (IAPWS 2011, industrial formulation,
+	including the critical enhancement)
+
+	Parameters:
+	-----------
+	rho:        float or array, kg/m^3; density
+	T:          float or array, K; temperature
+	cp:         float or array, kJ/kg-K; isobaric heat capacity
+	cv:         float or array, kJ/kg-K; isochoric heat capacity
+	mu:         float or array, Pa-s; viscosity
+	drhodp:     float or array, kg/m^3/MPa; (d rho/d P) at constant T
+
+	Returns:
+	--------
+	float or array, W/m-K; thermal conductivity
+	"""
+	Tr = np.asarray(T, dtype=float)/TC
+	d = np.asarray(rho, dtype=float)/RHOC
+	k0 = np.sqrt(Tr)/np.sum(_K0_L/Tr[..., np.newaxis]**np.arange(5), axis=-1)
+	i = np.arange(5)[:, np.newaxis]
+	j = np.arange(6)
+	terms = (_K1_N*(1/Tr[..., np.newaxis, np.newaxis] - 1)**i*
+	         (d[..., np.newaxis, np.newaxis] - 1)**j)
+	k1 = np.exp(d*np.sum(terms, axis=(-2, -1)))
+	# Critical enhancement
+	a = _K2_A[np.searchsorted(_K2_RHO, d)]
+	drho_ref = RHOC/PC/np.sum(a*d[..., np.newaxis]**np.arange(6), axis=-1)
+	dx = np.maximum(d*(PC/RHOC*drhodp - PC/RHOC*drho_ref*1.5/Tr), 0)
+	y = 0.13*(dx/0.06)**(0.63/1.239)/0.4
+	cpcv = cp/cv
+	with np.errstate(divide="ignore", invalid="ignore"):
+		Z = 2/np.pi/y*(((1 - 1/cpcv)*np.arctan(y) + y/cpcv) -
+		               (1 - np.exp(-1/(1/y + y**2/3/d**2))))
+	Z = np.where(y < 1.2E-7, 0, Z)
+	k2 = 177.8514*d*cp/0.46151805*Tr/mu*1E-6*Z
+	return ((k0*k1 + k2)*1E-3)[()]
+
+
+def tension(T):
+	"""Surface tension of water (IAPWS 2014)
+
+	Parameter:
+	----------
+	T:          float or array, K; temperature on [248.15, 647.096]
+
+	Returns:
+	--------
+	float or array, N/m; surface tension (NaN outside the domain)
+	"""
+	T = np.asarray(T, dtype=float)
+	tau = 1 - T/TC
+	with np.errstate(invalid="ignore"):
+		sigma = 235.8E-3*tau**1.256*(1 - 0.625*tau)
+	return np.where((T >= 248.15) & (T <= TC), sigma, np.nan)[()]
+
+
+def _single_phase(T, P, region):
+	"""Every property of single-phase states in region 1 or 2,
+	as a dict of flat arrays"""
+	props = {}
+	n = len(T)
+	for name in State._fields:
+		props[name] = np.full(n, np.nan)
+	for r, gibbs in ((1, _gibbs1), (2, _gibbs2)):
+		mask = region == r
+		if not mask.any():
+			continue
+		sub = _thermo(T[mask], P[mask], gibbs(T[mask], P[mask]))
+		for name in ("v", "rho", "h", "u", "s", "cp", "cv", "w"):
+			props[name][mask] = sub[name]
+		mu = viscosity(sub["rho"], T[mask])
+		k = conductivity(sub["rho"], T[mask], sub["cp"], sub["cv"], mu,
+		                 sub["rho"]*sub["kt"])
+		props["mu"][mask] = mu
+		props["k"][mask] = k
+		props["Prandt"][mask] = mu*sub["cp"]*1000/k
+		props["x"][mask] = r - 1
+	props["T"] = T
+	props["P"] = P
+	props["region"] = region
+	props["sigma"] = np.where(region == 1, tension(T), np.nan)
+	return props
+
+
+def region_PT(P, T):
+	"""Which IF97 region a state is in
+
+	Parameters:
+	-----------
+	P:          array, MPa; pressure
+	T:          array, K; temperature
+
+	Returns:
+	--------
+	array of ints: 1 or 2, or 0 for the states this module does not cover
+	"""
+	region = np.zeros(np.shape(P), dtype=int)
+	with np.errstate(invalid="ignore"):
+		valid = (T >= T_MIN) & (T <= T_MAX) & (P > 0) & (P <= P_MAX)
+		low = T <= T13
+		ps = psat(np.minimum(T, T13))
+		region[valid & low & (P >= ps)] = 1
+		region[valid & low & (P < ps)] = 2
+		region[valid & ~low & (P <= p23(np.maximum(T, T13)))] = 2
+	return region
+
+
+def _broadcast(*args):
+	arrays = np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+	return arrays[0].shape, [a.ravel() for a in arrays]
+
+
+def _finish(props, shape):
+	return State(*[np.asarray(props[name]).reshape(shape)[()] for name in State._fields])
+
+
+def PT(P, T):
+	"""Properties of single-phase water or steam from pressure and temperature
+
+	Parameters:
+	-----------
+	P:          float or array, MPa; pressure
+	T:          float or array, K; temperature
+
+	Returns:
+	--------
+	State of floats or arrays (broadcast over P and T), with the same
+	names and units as iapws. States outside regions 1 and 2 are NaN.
+	"""
+	shape, (P, T) = _broadcast(P, T)
+	return _finish(_single_phase(T, P, region_PT(P, T)), shape)
+
+
+def _saturated(P, x):
+	"""Region 4 states from flat arrays of pressure and quality"""
+	T = tsat(np.where(P <= psat(T13), P, np.nan))
+	liquid = _single_phase(T, P, np.where(np.isnan(T), 0, 1))
+	vapor = _single_phase(T, P, np.where(np.isnan(T), 0, 2))
+	props = {}
+	for name in ("v", "h", "u", "s"):
+		props[name] = liquid[name] + x*(vapor[name] - liquid[name])
+	props["rho"] = 1/props["v"]
+	for name in ("cp", "cv", "w", "mu", "k", "Prandt"):
+		props[name] = np.where(x == 0, liquid[name],
+		                       np.where(x == 1, vapor[name], np.nan))
+	props["T"] = T
+	props["P"] = P
+	props["x"] = x
+	props["region"] = np.where(np.isnan(T), 0, 4)
+	props["sigma"] = tension(T)
+	return props
+
+
+def Px(P, x):
+	"""Properties of saturated water and steam from pressure and quality
+
+	Parameters:
+	-----------
+	P:          float or array, MPa; pressure (up to Psat(623.15 K), 16.53 MPa)
+	x:          float or array; quality on [0, 1]
+
+	Returns:
+	--------
+	State of floats or arrays. For 0 < x < 1, only the mixture
+	properties (v, rho, h, u, s) are defined; the rest are NaN.
+	"""
+	shape, (P, x) = _broadcast(P, x)
+	return _finish(_saturated(P, x), shape)
+
+
+def Tx(T, x):
+	"""Properties of saturated water and steam from temperature and quality
+
+	Parameters:
+	-----------
+	T:          float or array, K; temperature (up to 623.15 K)
+	x:          float or array; quality on [0, 1]
+
+	Returns:
+	--------
+	State of floats or arrays; see Px()
+	"""
+	shape, (T, x) = _broadcast(T, x)
+	return _finish(_saturated(psat(T), x), shape)
+
+
+def hbc(P):
+	"""Enthalpy on the boundary between regions 2b and 2c (IF97 Eq. 21)
+
+	Parameter:
+	----------
+	P:          float or array, MPa; pressure
+
+	Returns:
+	--------
+	float or array, kJ/kg; boundary enthalpy
+	"""
+	P = np.asarray(P, dtype=float)
+	with np.errstate(invalid="ignore"):
+		return 0.26526571908428e4 + np.sqrt((P - 0.45257578905948e1)/1.2809002730136e-4)
+
+
+def _backward(P, h, n, I, J, p0, h0):
+	"""Evaluate a backward polynomial sum(n*(P - p0)^I*(h/h* - h0)^J)"""
+	return np.sum(n*(P[:, np.newaxis] - p0)**I*(h[:, np.newaxis] - h0)**J, axis=1)
+
+
+def backward_T_Ph(P, h, region):
+	"""Temperature from the IF97 backward equations T(P, h)
+
+	Parameters:
+	-----------
+	P:          array, MPa; pressure
+	h:          array, kJ/kg; specific enthalpy
+	region:     array of ints; 1 or 2 (anything else gives NaN)
+
+	Returns:
+	--------
+	array, K; temperature
+	"""
+	P = np.asarray(P, dtype=float)
+	h = np.asarray(h, dtype=float)
+	T = np.full(P.shape, np.nan)
+	one = region == 1
+	T[one] = _backward(P[one], h[one]/2500, _B1_N, _B1_I, _B1_J, 0, -1)
+	two = region == 2
+	a = two & (P <= 4)
+	c = two & (P > 6.546699678) & (h < hbc(P))
+	b = two & ~a & ~c
+	T[a] = _backward(P[a], h[a]/2000, _B2A_N, _B2A_I, _B2A_J, 0, 2.1)
+	T[b] = _backward(P[b], h[b]/2000, _B2B_N, _B2B_I, _B2B_J, 2, 2.6)
+	T[c] = _backward(P[c], h[c]/2000, _B2C_N, _B2C_I, _B2C_J, -25, 1.8)
+	return T
+
+
+def Ph(P, h, iterations = 1):
+	"""Properties of water and steam from pressure and specific enthalpy
+
+	The temperature comes from the IF97 backward equations, followed by
+	Newton iterations on the forward equations (h = h(P, T)), which remove
+	the few millikelvin of inconsistency between the two. Enthalpies between
+	the saturated liquid and vapor give region 4 states.
+
+	Parameters:
+	-----------
+	P:          float or array, MPa; pressure
+	h:          float or array, kJ/kg; specific enthalpy
+	iterations: int; number of Newton corrections of the temperature
+	            [Default: 1]
+
+	Returns:
+	--------
+	State of floats or arrays (broadcast over P and h). States in
+	region 3 or outside regions 1, 2, and 4 are NaN.
+	"""
+	shape, (P, h) = _broadcast(P, h)
+	sat = _saturated(P, np.zeros_like(P))
+	hf = sat["h"]
+	hg = _saturated(P, np.ones_like(P))["h"]
+	region = np.where(h <= hf, 1, np.where(h >= hg, 2, 4))
+	# Above Psat(623.15 K), regions 1 and 2 border region 3 instead
+	high = np.isnan(hf)
+	if high.any():
+		ph = P[high]
+		h1 = _single_phase(np.full(ph.shape, T13), ph, np.ones(ph.shape, int))["h"]
+		h2 = _single_phase(t23(ph), ph, np.full(ph.shape, 2))["h"]
+		region[high] = np.where(h[high] <= h1, 1, np.where(h[high] >= h2, 2, 0))
+	T = backward_T_Ph(P, h, region)
+	single = (region == 1) | (region == 2)
+	for __ in range(iterations):
+		props = _single_phase(T[single], P[single], region[single])
+		T[single] -= (props["h"] - h[single])/props["cp"]
+	# Outside the ranges of P and T covered by regions 1 and 2
+	single &= region_PT(P, T) == region
+	region[(region != 4) & ~single] = 0
+	T[~single] = np.nan
+	props = _single_phase(T, P, np.where(single, region, 0))
+	props["h"] = np.where(single, h, np.nan)
+	props["u"] = props["h"] - P*1000*props["v"]
+	wet = region == 4
+	if wet.any():
+		x = (h[wet] - hf[wet])/(hg[wet] - hf[wet])
+		mix = _saturated(P[wet], x)
+		for name in State._fields:
+			props[name] = np.array(props[name])
+			props[name][wet] = mix[name]
+	return _finish(props, shape)
+
+
+def state(P = None, T = None, h = None, x = None):
+	"""Properties of water and steam with the same keywords as IAPWS97
+
+	Parameters:
+	-----------
+	Exactly two of the following, as floats or arrays:
+	P:          MPa; pressure
+	T:          K; temperature
+	h:          kJ/kg; specific enthalpy
+	x:          quality on [0, 1]
+	Supported pairs are (P, T), (P, h), (P, x), and (T, x).
+
+	Returns:
+	--------
+	State of floats or arrays
+	"""
+	given = tuple(name for name, value in (("P", P), ("T", T), ("h", h), ("x", x))
+	              if value is not None)
+	if given == ("P", "T"):
+		return PT(P, T)
+	elif given == ("P", "h"):
+		return Ph(P, h)
+	elif given == ("P", "x"):
+		return Px(P, x)
+	elif given == ("T", "x"):
+		return Tx(T, x)
+	raise TypeError("Unsupported combination of inputs: " + ", ".join(given))
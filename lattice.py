@@ -0,0 +1,393 @@
+# Lattice
+#
+# Geometry of rod bundles: square lattices, hexagonal (triangular pitch)
+# bundles in a duct, and circular ring bundles (CANDU, AGR) in a tube.
+# Each subchannel is the polygon between rod centers (and the bundle
+# boundary); its flow area, perimeters, and hydraulic diameter, the gaps
+# to its neighbors, and the rod-subchannel and subchannel-subchannel
+# adjacency (as CSR matrices) are computed once per geometry and cached.
+
+from functools import lru_cache
+import numpy as np
+import scipy.sparse
+from scipy.spatial import Delaunay
+
+# Coordinates are rounded to this many digits (m) to match shared vertices
+_DIGITS = 9
+
+
+def cell_area(pitch, shape = "square"):
+	"""Area of the unit cell around one rod
+
+	Parameters:
+	-----------
+	pitch:      float; rod pitch (flat-to-flat for a hexagonal cell)
+	shape:      str; {"square", "hexagon", "triangle"}
+	            [Default: "square"]
+
+	Returns:
+	--------
+	float; cell area, in units of pitch^2
+	"""
+	if shape == "square":
+		return pitch**2
+	elif shape in ("hexagon", "triangle"):
+		return np.sqrt(3)/2*pitch**2
+	raise TypeError("Unknown cell shape: {}".format(shape))
+
+
+def equivalent_diameter(area):
+	"""Diameter of the circle with the same area"""
+	return 2*np.sqrt(area/np.pi)
+
+
+def _shoelace(points):
+	x, y = points[:, 0], points[:, 1]
+	return (np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))/2
+
+
+def _centroid(points):
+	area = _shoelace(points)
+	x, y = points[:, 0], points[:, 1]
+	cross = x*np.roll(y, -1) - np.roll(x, -1)*y
+	return np.array([np.dot(x + np.roll(x, -1), cross),
+	                 np.dot(y + np.roll(y, -1), cross)])/(6*area)
+
+
+def _interior_angle(points, i):
+	a = points[i - 1] - points[i]
+	b = points[(i + 1) % len(points)] - points[i]
+	return np.arccos(np.clip(np.dot(a, b)/np.hypot(*a)/np.hypot(*b), -1, 1))
+
+
+class Lattice(object):
+	"""Subchannel geometry of a rod bundle
+
+	Built from subchannel polygons, each a counterclockwise list of
+	vertices that are either rod centers or points on the boundary.
+	Use square(), hexagonal(), rings(), or from_reactor().
+
+	Parameters:
+	-----------
+	kind:       str; {"square", "hexagon", "circle"}
+	x, y:       arrays; rod centers
+	d:          float; rod diameter
+	polygons:   list of (k, 2) arrays; subchannel vertices
+	vertex_rods:list of int arrays; rod of each vertex, or -1 on the boundary
+	wall:       Boolean; whether the boundary is a wetted wall (a duct or
+	            tube) rather than a symmetry line
+	arc:        float; radius of a circular boundary (edges between two
+	            boundary points follow this arc)
+	            [Default: None -- straight boundary]
+
+	Attributes:
+	-----------
+	area, wetted, heated, dh, centroid: per subchannel
+	gap_from, gap_to, gap, distance: per gap, with gap_from < gap_to
+	rods:       CSR (rods x subchannels); fraction of each rod's perimeter
+	            facing each subchannel
+	adjacency:  CSR (subchannels x subchannels); gap index of each pair of
+	            neighbors
+	"""
+	def __init__(self, kind, x, y, d, polygons, vertex_rods, wall, arc = None):
+		self.kind = kind
+		self.x = np.asarray(x, dtype=float)
+		self.y = np.asarray(y, dtype=float)
+		self.d = d
+		n = len(polygons)
+		self.area = np.empty(n)
+		self.heated = np.empty(n)
+		self.wetted = np.empty(n)
+		self.centroid = np.empty((n, 2))
+		rod_rows, rod_cols, rod_fractions = [], [], []
+		edges = {}
+		gaps = []
+		r = d/2.0
+		for i, (points, rods) in enumerate(zip(polygons, vertex_rods)):
+			self.centroid[i] = _centroid(points)
+			area = _shoelace(points)
+			heated = 0.0
+			boundary = 0.0
+			for v in range(len(points)):
+				w = (v + 1) % len(points)
+				if rods[v] >= 0:
+					angle = _interior_angle(points, v)
+					area -= angle*r**2/2
+					heated += angle*r
+					rod_rows.append(rods[v])
+					rod_cols.append(i)
+					rod_fractions.append(angle/(2*np.pi))
+				length = np.hypot(*(points[w] - points[v]))
+				if rods[v] < 0 and rods[w] < 0:
+					if arc:
+						theta = 2*np.arcsin(min(length/(2*arc), 1))
+						area += arc**2*(theta - np.sin(theta))/2
+						length = arc*theta
+					boundary += length
+					continue
+				key = frozenset((tuple(np.round(points[v], _DIGITS)),
+				                 tuple(np.round(points[w], _DIGITS))))
+				if key in edges:
+					j = edges.pop(key)
+					width = length - r*(int(rods[v] >= 0) + int(rods[w] >= 0))
+					gaps.append((j, i, width))
+				else:
+					edges[key] = i
+			self.area[i] = area
+			self.heated[i] = heated
+			self.wetted[i] = heated + (boundary if wall else 0.0)
+		self.dh = 4*self.area/self.wetted
+		gaps = np.array(gaps, dtype=float).reshape(-1, 3)
+		self.gap_from = gaps[:, 0].astype(int)
+		self.gap_to = gaps[:, 1].astype(int)
+		self.gap = gaps[:, 2]
+		self.distance = np.hypot(*(self.centroid[self.gap_from] - self.centroid[self.gap_to]).T)
+		self.rods = scipy.sparse.csr_matrix((rod_fractions, (rod_rows, rod_cols)),
+		                                    shape=(len(self.x), n))
+		ngaps = len(self.gap)
+		rows = np.concatenate((self.gap_from, self.gap_to))
+		cols = np.concatenate((self.gap_to, self.gap_from))
+		order = np.lexsort((cols, rows))
+		indptr = np.searchsorted(rows[order], np.arange(n + 1)).astype(np.int32)
+		gap_index = np.tile(np.arange(ngaps), 2)[order].astype(np.int32)
+		self.adjacency = scipy.sparse.csr_matrix(
+			(gap_index, cols[order].astype(np.int32), indptr), shape=(n, n))
+
+	def __str__(self):
+		return "{} lattice: {} rods, {} subchannels, {} gaps".format(
+			self.kind.capitalize(), self.nrods, self.size, len(self.gap))
+
+	@property
+	def size(self):
+		return len(self.area)
+
+	@property
+	def nrods(self):
+		return len(self.x)
+
+	@property
+	def flow_area(self):
+		return self.area.sum()
+
+	@property
+	def hydraulic_diameter(self):
+		"""Hydraulic diameter of the whole bundle"""
+		return 4*self.flow_area/self.wetted.sum()
+
+	def neighbors(self, i):
+		"""Subchannels connected to subchannel i, and the connecting gaps
+
+		Returns:
+		--------
+		(int array, int array): neighbor indices, gap indices
+		"""
+		start, stop = self.adjacency.indptr[i], self.adjacency.indptr[i + 1]
+		return self.adjacency.indices[start:stop], self.adjacency.data[start:stop]
+
+	def incidence(self):
+		"""Sparse (gaps x subchannels) matrix: +1 at gap_from, -1 at gap_to"""
+		ngaps = len(self.gap)
+		rows = np.tile(np.arange(ngaps), 2)
+		cols = np.concatenate((self.gap_from, self.gap_to))
+		values = np.repeat([1.0, -1.0], ngaps)
+		return scipy.sparse.csr_matrix((values, (rows, cols)), shape=(ngaps, self.size))
+
+
+def _boundary_subchannels(points, hull, offset, corners):
+	"""Edge (and corner) subchannels outside the hull of the outer rods
+
+	hull:       int array; outer rods, counterclockwise
+	offset:     float; distance from the outer rod centers to the boundary
+	corners:    Boolean; whether to add corner subchannels where the hull turns
+	"""
+	polygons, vertex_rods = [], []
+	m = len(hull)
+	normals = []
+	for k in range(m):
+		a, b = points[hull[k]], points[hull[(k + 1) % m]]
+		t = (b - a)/np.hypot(*(b - a))
+		normals.append(np.array([t[1], -t[0]]))
+	for k in range(m):
+		i, j = hull[k], hull[(k + 1) % m]
+		n = normals[k]
+		a, b = points[i], points[j]
+		polygons.append(np.array([a, a + offset*n, b + offset*n, b]))
+		vertex_rods.append(np.array([i, -1, -1, j]))
+		following = normals[(k + 1) % m]
+		if corners and np.dot(n, following) < 1 - 1E-9:
+			corner = b + offset*(n + following)/(1 + np.dot(n, following))
+			polygons.append(np.array([b, b + offset*n, corner, b + offset*following]))
+			vertex_rods.append(np.array([j, -1, -1, -1]))
+	return polygons, vertex_rods
+
+
+@lru_cache(maxsize = None)
+def square(npins, pitch, d, wall = 0.0):
+	"""Square npins x npins lattice; the boundary is a symmetry line
+
+	Subchannels sit at the corners of the rod cells, numbered row by row:
+	(npins + 1)^2 of them, including edge and corner subchannels.
+
+	Parameters:
+	-----------
+	npins:      int; rods across
+	pitch:      float; rod pitch
+	d:          float; rod diameter
+	wall:       float; distance beyond the last half pitch to the boundary
+	            (e.g., half the water gap between assemblies)
+	            [Default: 0.0]
+
+	Returns:
+	--------
+	Lattice
+	"""
+	n = npins + 1
+	# Subchannel corner coordinates along one direction
+	edges = np.concatenate(([-wall], pitch/2 + pitch*np.arange(npins), [npins*pitch + wall]))
+	edges = edges - npins*pitch/2
+	centers = pitch/2 + pitch*np.arange(npins) - npins*pitch/2
+	rod = np.arange(npins*npins).reshape(npins, npins)
+	x, y = np.meshgrid(centers, centers)
+	polygons, vertex_rods = [], []
+	for i in range(n):
+		for j in range(n):
+			corners = [(i - 1, j - 1), (i - 1, j), (i, j), (i, j - 1)]
+			points, rods = [], []
+			for (a, b), (ex, ey) in zip(corners, [(0, 0), (1, 0), (1, 1), (0, 1)]):
+				points.append((edges[j + ex], edges[i + ey]))
+				inside = 0 <= a < npins and 0 <= b < npins
+				rods.append(rod[a, b] if inside else -1)
+			polygons.append(np.array(points))
+			vertex_rods.append(np.array(rods))
+	return Lattice("square", x.ravel(), y.ravel(), d, polygons, vertex_rods, False)
+
+
+def _triangulated(kind, x, y, d, offset, wetted, corners, arc = None):
+	"""Delaunay subchannels between rods, plus the boundary subchannels"""
+	points = np.column_stack((x, y))
+	mesh = Delaunay(points)
+	polygons, vertex_rods = [], []
+	for tri in mesh.simplices:
+		if _shoelace(points[tri]) < 0:
+			tri = tri[::-1]
+		polygons.append(points[tri])
+		vertex_rods.append(np.array(tri))
+	hull = np.unique(mesh.convex_hull)
+	angles = np.arctan2(y[hull], x[hull])
+	hull = hull[np.argsort(angles)]
+	if arc:
+		boundary, rods = [], []
+		m = len(hull)
+		for k in range(m):
+			i, j = hull[k], hull[(k + 1) % m]
+			a, b = points[i], points[j]
+			boundary.append(np.array([a, a*arc/np.hypot(*a), b*arc/np.hypot(*b), b]))
+			rods.append(np.array([i, -1, -1, j]))
+	else:
+		boundary, rods = _boundary_subchannels(points, hull, offset, corners)
+	return Lattice(kind, x, y, d, polygons + boundary, vertex_rods + rods, wetted, arc)
+
+
+@lru_cache(maxsize = None)
+def hexagonal(rings, pitch, d, wall = 0.0):
+	"""Hexagonal bundle on a triangular pitch, inside a hexagonal duct
+
+	Parameters:
+	-----------
+	rings:      int; rings of rods around the central one
+	            (1 + 3*rings*(rings + 1) rods)
+	pitch:      float; rod pitch
+	d:          float; rod diameter
+	wall:       float; distance beyond half a pitch from the outer rod
+	            centers to the duct
+	            [Default: 0.0]
+
+	Returns:
+	--------
+	Lattice
+	"""
+	q, r = np.meshgrid(np.arange(-rings, rings + 1), np.arange(-rings, rings + 1))
+	keep = np.abs(q + r) <= rings
+	q, r = q[keep], r[keep]
+	x = pitch*(q + r/2.0)
+	y = pitch*np.sqrt(3)/2*r
+	return _triangulated("hexagon", x, y, d, pitch/2 + wall, True, True)
+
+
+@lru_cache(maxsize = None)
+def rings(counts, radii, d, wall = 0.0):
+	"""Circular bundle of concentric rings of rods, inside a tube
+
+	Parameters:
+	-----------
+	counts:     tuple of int; rods in each ring (1 for a central rod)
+	radii:      tuple of float; radius of each ring
+	d:          float; rod diameter
+	wall:       float; distance beyond half a pitch from the outer rod
+	            centers to the tube, with the pitch taken between the
+	            outer two rings
+	            [Default: 0.0]
+
+	Returns:
+	--------
+	Lattice
+	"""
+	x, y = [], []
+	for count, radius in zip(counts, radii):
+		theta = 2*np.pi*np.arange(count)/count
+		x.append(radius*np.cos(theta))
+		y.append(radius*np.sin(theta))
+	x = np.concatenate(x)
+	y = np.concatenate(y)
+	pitch = radii[-1] - radii[-2] if len(radii) > 1 else d
+	tube = radii[-1] + pitch/2 + wall
+	return _triangulated("circle", x, y, d, None, True, False, arc = tube)
+
+
+def from_reactor(reactor, wall = None):
+	"""Lattice of one assembly of a ReactorType, in m
+
+	Square lattices have reactor.npins rods across; hexagonal ones have
+	reactor.npins rods in complete rings; circular ones have rings of
+	6, 12, 18, ... rods around a central rod, spaced by the pin pitch.
+
+	Parameters:
+	-----------
+	reactor:    reactors.ReactorType; with ppitch, npins, and dco (cm)
+	wall:       float, m; distance to the boundary (see square(), etc.)
+	            [Default: None -- half the gap to the next assembly for
+	            square lattices with apitch, otherwise 0]
+
+	Returns:
+	--------
+	Lattice
+	"""
+	pitch = reactor.ppitch/100
+	d = reactor.dco/100
+	npins = reactor.npins
+	if not (pitch and d and npins):
+		raise ValueError("{} needs ppitch, dco, and npins.".format(reactor))
+	if reactor.shape == "square":
+		if wall is None:
+			wall = 0.0
+			if reactor.apitch:
+				wall = (reactor.apitch - npins*reactor.ppitch)/200
+		return square(npins, pitch, d, wall)
+	if wall is None:
+		wall = 0.0
+	if reactor.shape == "hexagon":
+		count = 0
+		while 1 + 3*count*(count + 1) < npins:
+			count += 1
+		if 1 + 3*count*(count + 1) != npins:
+			raise ValueError("{} rods do not fill hexagonal rings.".format(npins))
+		return hexagonal(count, pitch, d, wall)
+	elif reactor.shape == "circle":
+		counts = [1]
+		while sum(counts) < npins:
+			counts.append(6*len(counts))
+		if sum(counts) != npins:
+			raise ValueError("{} rods do not fill circular rings.".format(npins))
+		radii = tuple(pitch*np.arange(len(counts)))
+		return rings(tuple(counts), radii, d, wall)
+	raise TypeError("Unknown lattice shape: {}".format(reactor.shape))
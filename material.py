@@ -3,6 +3,8 @@
 # Classes for materials to be used in the simulation
 
 import random
+import numpy as np
+from scipy.constants import Avogadro
 
 
 def number_density(density, A, frac = 1):
@@ -21,6 +23,130 @@ def number_density(density, A, frac = 1):
 	return n
 
 
+def check_groups(groups):
+	"""Energy group boundaries as a read-only array
+	
+	Inputs:
+		groups:     array of floats; energy group boundaries (eV)
+	
+	Output:
+		array of floats; the boundaries, checked to be strictly increasing
+	"""
+	groups = np.array(groups, dtype = float)
+	if groups.ndim != 1 or len(groups) < 2 or np.any(np.diff(groups) <= 0):
+		raise ValueError("Group boundaries must be at least 2 increasing energies.")
+	groups.setflags(write = False)
+	return groups
+
+
+def common_groups(nuclides):
+	"""The group boundaries shared by an iterable of Nuclide
+	
+	Output:
+		array of floats, or None if every nuclide is one-group
+	"""
+	groups = None
+	for nuclide in nuclides:
+		if getattr(nuclide, "groups", None) is None:
+			continue
+		if groups is None:
+			groups = check_groups(nuclide.groups)
+		elif not np.array_equal(groups, nuclide.groups):
+			errstr = "Nuclide {} has a different group structure.".format(nuclide.name)
+			raise ValueError(errstr)
+	return groups
+
+
+class AliasTable(object):
+	"""Walker's alias table (Vose's construction) for sampling from a
+	discrete distribution in constant time per sample
+	
+	Each of the n columns holds a probability of keeping the column and
+	an alias to take otherwise, so that a sample costs one uniform draw
+	and one comparison, regardless of the number of outcomes.
+	
+	Parameters:
+		weights:    array of non-negative floats; relative probabilities
+	
+	Attributes:
+		prob:       array of floats; probability of keeping each column
+		alias:      array of ints; outcome taken when the column is rejected
+	"""
+	def __init__(self, weights):
+		weights = np.asarray(weights, dtype = float).ravel()
+		total = weights.sum()
+		if not len(weights) or not total > 0 or np.any(weights < 0):
+			raise ValueError("Weights must be non-negative with a positive sum.")
+		size = len(weights)
+		scaled = weights*size/total
+		self.prob = np.ones(size)
+		self.alias = np.arange(size)
+		small = list(np.flatnonzero(scaled < 1))
+		large = list(np.flatnonzero(scaled >= 1))
+		while small and large:
+			s = small.pop()
+			l = large.pop()
+			self.prob[s] = scaled[s]
+			self.alias[s] = l
+			scaled[l] -= 1 - scaled[s]
+			if scaled[l] < 1:
+				small.append(l)
+			else:
+				large.append(l)
+		# Whatever is left over is 1 to within round-off
+	
+	def __len__(self):
+		return len(self.prob)
+	
+	def draw(self, xi):
+		"""Outcome for one uniform number xi in [0, 1)"""
+		u = xi*len(self.prob)
+		i = int(u)
+		if u - i < self.prob[i]:
+			return i
+		return int(self.alias[i])
+	
+	def sample(self, n, rng = None):
+		"""Sample n outcomes
+		
+		Inputs:
+			n:          int; number of samples
+			rng:        numpy.random.Generator or RandomState
+						[Default: None -- the global numpy.random state]
+		
+		Output:
+			array of n ints; the sampled outcomes
+		"""
+		if rng is None:
+			rng = np.random
+		u = rng.random(n)*len(self.prob)
+		i = u.astype(int)
+		return np.where(u - i < self.prob[i], i, self.alias[i])
+
+
+class _Composition(dict):
+	"""Dictionary that counts its modifications in self.version"""
+	def __init__(self, *args, **kwargs):
+		dict.__init__(self, *args, **kwargs)
+		self.version = 0
+	
+	def _modified(method):
+		def modify(self, *args, **kwargs):
+			self.version += 1
+			return method(self, *args, **kwargs)
+		modify.__name__ = method.__name__
+		return modify
+	
+	__setitem__ = _modified(dict.__setitem__)
+	__delitem__ = _modified(dict.__delitem__)
+	clear = _modified(dict.clear)
+	pop = _modified(dict.pop)
+	popitem = _modified(dict.popitem)
+	setdefault = _modified(dict.setdefault)
+	update = _modified(dict.update)
+	del _modified
+
+
 class Nuclide(object):
 	"""A simple nuclide with a name, mass, number density, and
 	cross section dictionary
@@ -29,16 +155,207 @@ class Nuclide(object):
 		name:       str; human-readable name of the nuclide ("U235")
 		mass:       float; atomic mass
 		xs_dict:    dictionary of {"xs_type":xs}, where 'xs' is a float
-		            representing the microscopic cross section (1/cm)
+		            representing the microscopic cross section (1/cm),
+		            or an array of one per energy group
+		groups:     array of floats; increasing energy group boundaries (eV),
+		            one more than the groups in each xs_dict array
+		            [Default: None -- one-group; every xs is a float]
 	"""
-	def __init__(self, name, mass = 0.0, xs_dict = None):
+	def __init__(self, name, mass = 0.0, xs_dict = None, groups = None):
 		self.name = name
 		self.mass = mass
 		self.xs_dict = xs_dict
+		self.groups = groups
 	
 	def __str__(self):
 		return self.name + " @ " + str(self.mass) + " g/mol"
-		
+
+
+class LibraryNuclide(Nuclide):
+	"""A read-only view of one nuclide in a NuclideLibrary
+	
+	Holds only the library and the index, so every Material that uses the
+	nuclide shares the library's single copy of the data.
+	
+	Attributes:
+		library:    NuclideLibrary; where the data are stored
+		index:      int; row of the nuclide in the library
+		name, mass, xs_dict, groups:    as for Nuclide; xs_dict is built
+					on access
+		zaid:       int; ZZAAA identifier
+	"""
+	def __init__(self, library, index):
+		self.library = library
+		self.index = index
+	
+	@property
+	def name(self):
+		return str(self.library.names[self.index])
+	
+	@property
+	def mass(self):
+		return float(self.library.masses[self.index])
+	
+	@property
+	def zaid(self):
+		return int(self.library.zaids[self.index])
+	
+	@property
+	def groups(self):
+		return self.library.groups
+	
+	@property
+	def xs_dict(self):
+		row = self.library.xs[self.index]
+		if self.library.groups is None:
+			return {r: float(xs) for r, xs in zip(self.library.reactions, row)
+			        if not np.isnan(xs)}
+		return {r: xs for r, xs in zip(self.library.reactions, row)
+		        if not np.all(np.isnan(xs))}
+
+
+class NuclideLibrary(object):
+	"""A collection of nuclides stored as arrays
+	
+	Masses, ZAIDs, and microscopic cross sections are held in one array
+	each, with a dictionary from name to row. Nuclides are handed out as
+	LibraryNuclide views, one per row, so that looking up the same name
+	again gives the same object.
+	
+	The data may be given directly, or read from a .npz file (see save())
+	the first time they are needed.
+	
+	Parameters:
+		path:       str; .npz file to load the library from
+					[Default: None -- use the arrays below]
+		names:      list of str; nuclide names ("U235")
+		masses:     list of floats; atomic masses (g/mol)
+		zaids:      list of ints; ZZAAA identifiers
+					[Default: None -- 0 for all]
+		reactions:  list of str; reaction names, the columns of xs
+					[Default: None -- no reactions]
+		xs:         array of floats (nuclides, reactions), or (nuclides,
+					reactions, groups); microscopic cross sections (barns),
+					NaN where a nuclide lacks a reaction
+					[Default: None -- all NaN]
+		groups:     array of floats; increasing energy group boundaries (eV)
+					[Default: None -- one-group]
+	
+	Attributes:
+		index:          dictionary of {name:row}
+		reaction_index: dictionary of {reaction:column}
+	"""
+	def __init__(self, path = None, names = None, masses = None, zaids = None,
+	             reactions = None, xs = None, groups = None):
+		if (path is None) == (names is None):
+			raise TypeError("Give either a path or the names, but not both.")
+		self.path = path
+		self._data = None
+		self._views = {}
+		if names is not None:
+			self._set(names, masses, zaids, reactions, xs, groups)
+	
+	def _set(self, names, masses, zaids, reactions, xs, groups):
+		names = np.asarray(names, dtype = str)
+		size = len(names)
+		masses = np.asarray(masses, dtype = float)
+		if zaids is None:
+			zaids = np.zeros(size, dtype = int)
+		zaids = np.asarray(zaids, dtype = int)
+		reactions = tuple(reactions or ())
+		shape = (size, len(reactions))
+		if groups is not None:
+			groups = check_groups(groups)
+			shape += (len(groups) - 1,)
+		if xs is None:
+			xs = np.full(shape, np.nan)
+		xs = np.asarray(xs, dtype = float).reshape(shape)
+		if masses.shape != (size,) or zaids.shape != (size,):
+			raise ValueError("Need one mass and one ZAID per nuclide.")
+		index = {str(n): i for i, n in enumerate(names)}
+		if len(index) != size:
+			raise ValueError("Nuclide names must be unique.")
+		for a in (names, masses, zaids, xs):
+			a.setflags(write = False)
+		self._data = (names, masses, zaids, reactions, xs, index,
+		              {r: j for j, r in enumerate(reactions)}, groups)
+	
+	def _load(self):
+		if self._data is None:
+			with np.load(self.path) as f:
+				reactions = [str(r) for r in f["reactions"]]
+				groups = f["groups"] if "groups" in f else None
+				self._set(f["names"], f["masses"], f["zaids"], reactions, f["xs"], groups)
+		return self._data
+	
+	@classmethod
+	def from_nuclides(cls, nuclides):
+		"""Build a library from an iterable of Nuclide, which must share
+		one group structure"""
+		nuclides = list(nuclides)
+		groups = common_groups(nuclides)
+		reactions = []
+		for nuclide in nuclides:
+			for r in nuclide.xs_dict or {}:
+				if r not in reactions:
+					reactions.append(r)
+		shape = (len(nuclides), len(reactions))
+		if groups is not None:
+			shape += (len(groups) - 1,)
+		xs = np.full(shape, np.nan)
+		for i, nuclide in enumerate(nuclides):
+			for r, value in (nuclide.xs_dict or {}).items():
+				xs[i, reactions.index(r)] = value
+		return cls(names = [n.name for n in nuclides],
+		           masses = [n.mass for n in nuclides],
+		           zaids = [getattr(n, "zaid", 0) for n in nuclides],
+		           reactions = reactions, xs = xs, groups = groups)
+	
+	def save(self, path):
+		"""Write the library to a .npz file"""
+		arrays = dict(names = self.names, masses = self.masses, zaids = self.zaids,
+		              reactions = np.array(self.reactions, dtype = str), xs = self.xs)
+		if self.groups is not None:
+			arrays["groups"] = self.groups
+		np.savez(path, **arrays)
+	
+	names = property(lambda self: self._load()[0])
+	masses = property(lambda self: self._load()[1])
+	zaids = property(lambda self: self._load()[2])
+	reactions = property(lambda self: self._load()[3])
+	xs = property(lambda self: self._load()[4])
+	index = property(lambda self: self._load()[5])
+	reaction_index = property(lambda self: self._load()[6])
+	groups = property(lambda self: self._load()[7])
+	
+	def __len__(self):
+		return len(self.names)
+	
+	def __contains__(self, name):
+		return name in self.index
+	
+	def __getitem__(self, name):
+		"""LibraryNuclide for a name, or for a row number"""
+		if isinstance(name, str):
+			i = self.index[name]
+		else:
+			i = int(name)
+			if not -len(self) <= i < len(self):
+				raise IndexError("Nuclide {} is out of range.".format(i))
+			i %= len(self)
+		if i not in self._views:
+			self._views[i] = LibraryNuclide(self, i)
+		return self._views[i]
+	
+	def rows(self, names):
+		"""Rows of a list of nuclide names, as an array of ints"""
+		index = self.index
+		return np.fromiter((index[n] for n in names), dtype = int, count = len(names))
+	
+	def nuclides(self, names):
+		"""Dictionary of {name:LibraryNuclide}, ready for Material.nuclides"""
+		return {n: self[n] for n in names}
+
 
 class Material(object):
 	"""A material with mass density, and nuclear composition.
@@ -51,18 +368,71 @@ class Material(object):
 	Other attributes:
 		wts:        dictionary of {Nuclide.name:weight fraction}
 		ats:        dictionary of {Nuclide.name:atom fraction}
+		version:    tuple; changes whenever the composition does
 		total_xs:   float; total macroscopic cross section (1/cm)
 		a_avg:		float; average of all the atomic masses weighted
 					by their atom fractions
+		groups:     array of floats; energy group boundaries (eV) shared by
+					the nuclides, or None if they are all one-group
+		nuclide_index:  dictionary of {Nuclide.name:row of macro_xs}
+		reaction_index: dictionary of {xs_type:column of macro_xs}
+		macro_xs:   array of floats (nuclides, reactions); macroscopic
+					cross sections (1/cm), 0 where a nuclide lacks a reaction
+		reaction_xs:    array of floats (reactions,); macroscopic cross
+					section of each reaction, over all nuclides (1/cm)
+		nuclide_xs: array of floats (nuclides,); total macroscopic cross
+					section of each nuclide (1/cm)
+		group_xs:   array of floats (groups, reactions); reaction_xs in each
+					energy group (one group if the material is one-group)
+		reactions:  list of (Nuclide.name, xs_type); the outcomes of
+					sample_reactions()
+	
+	With multigroup nuclides, macro_xs, reaction_xs, nuclide_xs, and
+	total_xs gain a trailing axis over the energy groups.
+	
+	Every derived quantity (a_avg, the cross section arrays, and the
+	reaction sampling table) is computed on first use after a change in
+	composition: assigning density, nuclides, wts, or ats, or editing the
+	dictionaries in place. Changes inside a Nuclide are not seen; call
+	invalidate() after them.
 	"""
 	def __init__(self, name, density = None, nuclides = None):
+		self._cache = {}
+		self._cache_version = None
+		self._revision = 0
 		self.name = name
 		self.density = density
 		self.nuclides = nuclides
 		self.wts = {}
 		self.ats = {}
-		self.total_xs = 0.0
-		self.a_avg = 0.0
+	
+	def __setattr__(self, name, value):
+		if name in ("density", "nuclides", "wts", "ats"):
+			if isinstance(value, dict) and not isinstance(value, _Composition):
+				value = _Composition(value)
+			object.__setattr__(self, "_revision", self._revision + 1)
+		object.__setattr__(self, name, value)
+	
+	@property
+	def version(self):
+		return (self._revision,
+		        getattr(self.nuclides, "version", 0),
+		        self.wts.version,
+		        self.ats.version)
+	
+	def invalidate(self):
+		"""Recompute every derived quantity on next use"""
+		self._revision += 1
+	
+	def _derived(self, key, compute):
+		"""Cached value of compute(), recomputed once per composition change"""
+		version = self.version
+		if version != self._cache_version:
+			self._cache.clear()
+			self._cache_version = version
+		if key not in self._cache:
+			self._cache[key] = compute()
+		return self._cache[key]
 	
 	
 	def __str__(self):
@@ -104,76 +474,265 @@ class Material(object):
 				self.ats[n] = self.wts[n] / self.nuclides[n].mass / total_at
 	
 	
+	def _a_avg(self):
+		library, rows = self._derived("library", self._library)
+		if library is not None:
+			ats = np.array([self.ats[n] for n in self.nuclides])
+			return float(np.dot(library.masses[rows], ats))
+		return sum(self.nuclides[n].mass * self.ats[n] for n in self.nuclides)
+	
+	@property
+	def a_avg(self):
+		return self._derived("a_avg", self._a_avg)
+	
 	def get_average_atomic_mass(self):
 		"""Get self.a_avg: the average atomic mass
-		If the value exists, return it; otherwise, calculate it.
 		
 		Output:
 			self.a_avg: float; average of all the atomic masses
 						weighted by their atom fractions
 		"""
-		if not self.a_avg:
-			for n in self.nuclides:
-				self.a_avg += self.nuclides[n].mass * self.ats[n]
 		return self.a_avg
 	
 	
-	def get_reaction_type(self):
+	def _library(self):
+		"""The NuclideLibrary that every nuclide is a view of, and their
+		rows in it; or (None, None)"""
+		library = None
+		for nuclide in self.nuclides.values():
+			if not isinstance(nuclide, LibraryNuclide):
+				return None, None
+			if library is None:
+				library = nuclide.library
+			elif nuclide.library is not library:
+				return None, None
+		if library is None:
+			return None, None
+		rows = np.fromiter((nuclide.index for nuclide in self.nuclides.values()),
+		                   dtype = int, count = len(self.nuclides))
+		return library, rows
+	
+	def _groups(self):
+		library, rows = self._derived("library", self._library)
+		if library is not None:
+			return library.groups
+		return common_groups(self.nuclides.values())
+	
+	@property
+	def groups(self):
+		return self._derived("groups", self._groups)
+	
+	def group_of(self, energy):
+		"""Find the energy group of each energy
+		
+		Inputs:
+			energy:     float or array of floats; energies (eV)
+		
+		Output:
+			int or array of ints; indices into the groups (rows of group_xs)
+		"""
+		groups = self.groups
+		if groups is None:
+			return np.zeros(np.shape(energy), dtype = int)[()]
+		energy = np.asarray(energy, dtype = float)
+		if np.any((energy < groups[0]) | (energy > groups[-1])):
+			errstr = "Energies must be within the group structure, "
+			errstr += "{} to {} eV.".format(groups[0], groups[-1])
+			raise ValueError(errstr)
+		g = np.searchsorted(groups, energy, side = "right") - 1
+		return np.minimum(g, len(groups) - 2)[()]
+	
+	def _indices(self):
+		library, rows = self._derived("library", self._library)
+		if library is not None:
+			nuclide_index = {n: i for i, n in enumerate(self.nuclides)}
+			valid = ~np.isnan(library.xs[rows]).reshape(len(rows), len(library.reactions), -1)
+			present = np.flatnonzero(np.any(valid, axis = (0, 2)))
+			reaction_index = {library.reactions[j]: i for i, j in enumerate(present)}
+			return nuclide_index, reaction_index
+		nuclide_index = {}
+		reaction_index = {}
+		for n in self.nuclides:
+			nuclide_index[n] = len(nuclide_index)
+			for xs_type in self.nuclides[n].xs_dict or {}:
+				reaction_index.setdefault(xs_type, len(reaction_index))
+		return nuclide_index, reaction_index
+	
+	@property
+	def nuclide_index(self):
+		return self._derived("indices", self._indices)[0]
+	
+	@property
+	def reaction_index(self):
+		return self._derived("indices", self._indices)[1]
+	
+	def _micro_xs(self):
+		"""Microscopic cross sections (barns), shaped (nuclides, reactions,
+		groups), NaN where a nuclide lacks a reaction"""
+		rindex = self.reaction_index
+		groups = self.groups
+		ngroups = 1 if groups is None else len(groups) - 1
+		library, rows = self._derived("library", self._library)
+		if library is not None:
+			columns = [library.reaction_index[r] for r in rindex]
+			micro_xs = library.xs[np.ix_(rows, columns)]
+			return micro_xs.reshape(len(rows), len(columns), ngroups)
+		micro_xs = np.full((len(self.nuclide_index), len(rindex), ngroups), np.nan)
+		for n, i in self.nuclide_index.items():
+			for xs_type, xs in (self.nuclides[n].xs_dict or {}).items():
+				micro_xs[i, rindex[xs_type]] = xs
+		return micro_xs
+	
+	def _macro_xs(self):
+		micro_xs = self._derived("micro_xs", self._micro_xs)
+		ats = np.array([self.ats[n] for n in self.nuclide_index])
+		n = number_density(self.density, self.a_avg, frac = ats)
+		macro_xs = np.nan_to_num(micro_xs)*1E-24*n[:, np.newaxis, np.newaxis]
+		if self.groups is None:
+			macro_xs = macro_xs[..., 0]
+		macro_xs.setflags(write = False)
+		return macro_xs
+	
+	@property
+	def macro_xs(self):
+		return self._derived("macro_xs", self._macro_xs)
+	
+	@property
+	def group_xs(self):
+		return self._derived("group_xs", lambda:
+			self.reaction_xs.reshape(len(self.reaction_index), -1).T)
+	
+	@property
+	def reaction_xs(self):
+		return self._derived("reaction_xs", lambda: self.macro_xs.sum(axis = 0))
+	
+	@property
+	def nuclide_xs(self):
+		return self._derived("nuclide_xs", lambda: self.macro_xs.sum(axis = 1))
+	
+	@property
+	def total_xs(self):
+		return self._derived("total_xs", lambda: self.reaction_xs.sum(axis = 0))
+	
+	@property
+	def reactions(self):
+		return self._derived("sampler", self._sampler)[1]
+	
+	def _sampler(self):
+		"""Sampling table over every (nuclide, reaction) pair, weighted by
+		its macroscopic cross section, and the list of those pairs
+		
+		One-group, the table is an AliasTable. Multigroup, it is the
+		cumulative distribution of each group, normalized and offset by the
+		group index, in one flat increasing array: the pair for a uniform
+		number u in group g is found by one searchsorted for g + u.
+		"""
+		micro_xs = self._derived("micro_xs", self._micro_xs)
+		rows, columns = np.nonzero(~np.all(np.isnan(micro_xs), axis = 2))
+		names = list(self.nuclide_index)
+		xs_types = list(self.reaction_index)
+		reactions = [(names[i], xs_types[j]) for i, j in zip(rows, columns)]
+		weights = self.macro_xs[rows, columns]
+		if self.groups is None:
+			return AliasTable(weights), reactions
+		cdf = np.cumsum(weights.T, axis = 1)
+		totals = cdf[:, -1].copy()
+		with np.errstate(invalid = "ignore", divide = "ignore"):
+			cdf /= totals[:, np.newaxis]
+		# Groups without reactions keep the flat array increasing; _search
+		# refuses to sample them
+		cdf[totals <= 0] = 1
+		cdf += np.arange(len(cdf))[:, np.newaxis]
+		return (cdf.ravel(), totals), reactions
+	
+	def _search(self, table, group, u):
+		"""Pair for uniform numbers u in energy groups, from a multigroup table"""
+		cdf, totals = table
+		if np.any(totals[group] <= 0):
+			raise ValueError("No reactions in the energy group.")
+		size = len(cdf)//len(totals)
+		i = np.searchsorted(cdf, group + u, side = "right") - group*size
+		return np.minimum(i, size - 1)
+	
+	def get_reaction_type(self, energy = None):
 		"""Choose the microscopic cross section for an interaction from the
 		cross section dicionaries of self.nuclides.
 		
+		Each reaction of each nuclide is chosen with probability equal to
+		its share of the total macroscopic cross section.
+		
+		Inputs:
+			energy:     float; neutron energy (eV), for multigroup materials
+						[Default: None]
+		
 		Outputs:
 			xs_type:            str; key in 'cross_sections' for the reaction type
-			xs:                 float; microscopic cross section (1/cm) for the reaction
 		"""
-		xi = random.random()
-		total = self.get_total_xs()
-		# New, less-efficient code that gets you the reaction type
-		ratio = 0
-		for n in self.nuclides:
-			nuclide = self.nuclides[n]
-			for xs_type in nuclide.xs_dict:
-				xs = self.get_macro_xs(n, xs_type)
-				ratio += self.ats[n]*(xs / total)
-				if ratio > xi:
-					return xs_type
+		table, reactions = self._derived("sampler", self._sampler)
+		if self.groups is None:
+			return reactions[table.draw(random.random())][1]
+		if energy is None:
+			raise TypeError("A multigroup material needs the energy.")
+		i = self._search(table, self.group_of(energy), random.random())
+		return reactions[int(i)][1]
+	
+	def sample_reactions(self, n, rng = None, energy = None):
+		"""Choose the reactions for a batch of interactions
 		
-		# If the for loop ends without returning a value, something went wrong!
-		errstr = "The loop terminated without selecting a value;\n"
-		errstr += "did you supply a list of floating point numbers?"
-		raise TypeError(errstr)
+		Inputs:
+			n:          int; number of interactions
+			rng:        numpy.random.Generator or RandomState
+						[Default: None -- the global numpy.random state]
+			energy:     float or array of n floats; neutron energies (eV),
+						for multigroup materials
+						[Default: None]
 		
+		Output:
+			array of n ints; indices into self.reactions
+		"""
+		table, reactions = self._derived("sampler", self._sampler)
+		if self.groups is None:
+			return table.sample(n, rng)
+		if energy is None:
+			raise TypeError("A multigroup material needs the energies.")
+		if rng is None:
+			rng = np.random
+		group = np.broadcast_to(self.group_of(energy), (n,))
+		return self._search(table, group, rng.random(n))
 	
-	def get_macro_xs(self, nkey, reaction):
-		"""Calculate the macroscopic cross section for a nuclide and reaction
+	
+	def get_macro_xs(self, nkey, reaction, energy = None):
+		"""Get the macroscopic cross section for a nuclide and reaction
 		
 		Inputs:
 			nkey:       str; name of the nuclide (key in self.nuclides)
 			rtype:      str; name of the reaction (key in Nuclide.xs_dict)
+			energy:     float or array; energies (eV), for multigroup materials
+						[Default: None -- every group]
 		
 		Output:
-			macro_xs:   float; macroscopic xs (1/cm)
+			macro_xs:   float; macroscopic xs (1/cm), or an array over the
+						groups or energies
 		"""
-		nuclide = self.nuclides[nkey]
-		at = self.ats[nkey]
-		# if reaction not in nuclide.xs_dict: return 0
-		micro_xs = nuclide.xs_dict[reaction] * 1E-24
-		A = self.get_average_atomic_mass()
-		n = number_density(self.density, A, frac = at)
-		macro_xs = micro_xs * n
-		return macro_xs
+		i = self.nuclide_index[nkey]
+		j = self.reaction_index[reaction]
+		if energy is None or self.groups is None:
+			return self.macro_xs[i, j]
+		return self.macro_xs[i, j, self.group_of(energy)]
 		
 	
-	def get_total_xs(self):
+	def get_total_xs(self, energy = None):
 		"""Get self.total_xs: the total macroscopic cross section.
-		If the value exists, return it; otherwise, calculate it.
+		
+		Inputs:
+			energy:     float or array; energies (eV), for multigroup materials
+						[Default: None -- every group]
 		
 		Output:
-			self.total_xs:  float; the total macroscopic xs (1/cm)
+			self.total_xs:  float; the total macroscopic xs (1/cm), or an
+							array over the groups or energies
 		"""
-		if not self.total_xs:
-			for n in self.nuclides:
-				for r in self.nuclides[n].xs_dict:
-					self.total_xs += self.get_macro_xs(n, r)
-		return self.total_xs
+		if energy is None or self.groups is None:
+			return self.total_xs
+		return self.total_xs[self.group_of(energy)]
 	
@@ -1,21 +1,29 @@
 # Models
 #
 # Commonly-used thermal hydraulic correlations
+#
+# Every correlation accepts scalars or NumPy arrays and follows the usual
+# broadcasting rules, so whole axial profiles (or axial x channel grids)
+# can be evaluated in a single call.
+
+import numpy as np
+
 
 def mcadams(re):
 	"""McAdams correlation for friction factor
 
 	Parameters:
 	-----------
-	:param re: Reynolds number
+	:param re: Reynolds number (float or array)
 
 	Returns:
 	--------
-	:return: friction factor
+	:return: friction factor, with the shape of `re`
 	"""
 	# assert 3E4 <= re <= 1E6, "Reynolds number {:.3e}".format(re) + \
 	#	" is outside the domain of the McAdams correlation."
-	return 0.184/re**0.2
+	re = np.asarray(re, dtype=float)
+	return 0.184*re**-0.2
 
 
 def blasius(re):
@@ -23,15 +31,16 @@ def blasius(re):
 
 	Parameters:
 	-----------
-	:param re: Reynolds number
+	:param re: Reynolds number (float or array)
 
 	Returns:
 	--------
-	:return: friction factor
+	:return: friction factor, with the shape of `re`
 	"""
 	# assert 4E3 <= re <= 1E5, "Re = {:.3e}".format(re) + \
 	#	" is outside the domain of the Blasius correlation."
-	return 0.316/re**0.25
+	re = np.asarray(re, dtype=float)
+	return 0.316*re**-0.25
 
 
 def dittus_boelter(re, pr, cooled = False):
@@ -40,19 +49,19 @@ def dittus_boelter(re, pr, cooled = False):
 
 	Parameters:
 	-----------
-	re:         float; Reynolds number
-	pr:         float; Prandtl number (should be high for this correlation)
-	cooled:     Boolean; whether the channel is cooled (True) or heated (False)
-				[Default: True]
+	re:         float or array; Reynolds number
+	pr:         float or array; Prandtl number (should be high for this correlation)
+	cooled:     Boolean (or array of them); whether the channel is cooled (True)
+				or heated (False)
+				[Default: False]
 
 	Returns
 	-------
-	nusselt:    float; Nusselt number
+	nusselt:    float or array; Nusselt number, broadcast over the inputs
 	"""
-	if cooled:
-		n = 0.3
-	else:
-		n = 0.4
+	re = np.asarray(re, dtype=float)
+	pr = np.asarray(pr, dtype=float)
+	n = np.where(cooled, 0.3, 0.4)
 	nusselt = 0.023 * re**0.8 * pr**n
 	return nusselt
 
@@ -62,13 +71,15 @@ def lyon(re, pr):
 
 	Parameters:
 	-----------
-	re:         float; Reynolds number
-	pr:         float; Prandtl number (should be high for this correlation)
+	re:         float or array; Reynolds number
+	pr:         float or array; Prandtl number (should be low for this correlation)
 
 	Returns
 	-------
-	nusselt:    float; Nusselt number
+	nusselt:    float or array; Nusselt number, broadcast over the inputs
 	"""
+	re = np.asarray(re, dtype=float)
+	pr = np.asarray(pr, dtype=float)
 	nusselt = 7 + 0.025 * (re*pr)**0.8
 	return nusselt
 
@@ -78,15 +89,18 @@ def film_boiling(water, vapor, tw, d):
 	
 	Parameters:
 	-----------
-	water:          iapws instance for saturated liquid (x=0)
-	vapor:          iapws instance for saturated vapor (x=1)
-	tw:             float, K; wall/surface temperature
-	d:              float, m; hydraulic diameter
+	water:          iapws instance for saturated liquid (x=0), or any object
+	                with the same attributes (scalars or arrays)
+	vapor:          iapws instance for saturated vapor (x=1), likewise
+	tw:             float or array, K; wall/surface temperature
+	d:              float or array, m; hydraulic diameter
 	
 	Returns:
 	--------
-	nusselt:        float; Nusselt number
+	nusselt:        float or array; Nusselt number, broadcast over the inputs
 	"""
+	tw = np.asarray(tw, dtype=float)
+	d = np.asarray(d, dtype=float)
 	dt = tw - water.T               # K; Temperature difference
 	hfg = (vapor.h - water.h)*1000  # J/kg; enthalpy of vaporization
 	hfg1 = hfg + 680*vapor.cp*dt    # J/kg
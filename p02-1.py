@@ -10,13 +10,13 @@ from reactors import *
 
 
 reactor_list = (bwr, pwr, candu, htgr, agr, lmfbr)
-for rx in reactor_list:
-	print('\n' + rx.name)
+fleet = ReactorFleet.from_reactors(reactor_list)
+heat = fleet.evaluate()
+for i, name in enumerate(fleet.name):
+	print('\n' + name)
 	
-	q3 = rx.get_volumetric_heat()
-	q3_print = str( round(q3*100**3 / 1000, 1) )
+	q3_print = str( round(heat.q3[i]*100**3 / 1000, 1) )
 	print("q''':", q3_print, "MW/m^3")
 	
-	q2 = rx.get_heat_flux()
-	q2_print = str( round(q2*100**2, 1) )
+	q2_print = str( round(heat.q2[i]*100**2, 1) )
 	print("q'': ", q2_print, "kW/m^2")
\ No newline at end of file
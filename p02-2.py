@@ -12,6 +12,7 @@ tained constant? Repeat for core average heat flux, q′′.
 """
 
 import reactors
+import design
 from copy import copy
 
 pwr17 = copy(reactors.pwr)
@@ -37,5 +38,13 @@ print(" q'(17)/q'(15)  =", q1frac)
 q2frac = round(1/pin_ratio, 3)
 print("q''(17)/q''(15) =", q2frac)
 
-
-
+# Check with the design explorer: same assembly pitch, so the 15x15 lattice
+# has a pitch and diameter larger by 17/15. The ratios do not depend on the
+# power or the number of assemblies.
+explorer = design.Explorer(pwr17, power = 3411E6, npins = 17, ppitch = pwr17.ppitch,
+                           dco = pwr17.dco, nassm = 193)
+lattices = explorer.at([17, 15], [pwr17.ppitch, pwr17.ppitch*pin_ratio],
+                       [pwr17.dco, pwr17.dco*pin_ratio])
+print("\nDesign explorer:")
+print(" q'(17)/q'(15)  =", round(lattices.q1[0]/lattices.q1[1], 3))
+print("q''(17)/q''(15) =", round(lattices.q2[0]/lattices.q2[1], 3))
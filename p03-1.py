@@ -43,16 +43,16 @@ pwr.height = 365.8
 pwr.dco = 0.962 #0.95
 
 # Fuel
-u235 = material.Nuclide("U235", 235.0439)
-u238 = material.Nuclide("U238", 238.0508)
+library = material.NuclideLibrary(names = ["U235", "U238", "O16"],
+                                  masses = [235.0439, 238.0508, 15.9994],
+                                  zaids = [92235, 92238, 8016])
 uranium = material.Material("Uranium (3.25% enriched)")
-uranium.nuclides = {"U235":u235, "U238":u238}
+uranium.nuclides = library.nuclides(["U235", "U238"])
 uranium.wts = {"U235":.0325, "U238":1-0.0325}
 uranium.convert_wt_to_at()
 
-o16 = material.Nuclide("O16", 15.9994)
 uo2 = material.Material("UO2 (3.25% enriched)")
-uo2.nuclides = {"U235":u235, "U238":u238, "O16":o16}
+uo2.nuclides = library.nuclides(["U235", "U238", "O16"])
 uo2.ats["O16"] = 2.0/3
 uo2.ats["U235"] = uranium.ats["U235"]*1.0/3
 uo2.ats["U238"] = uranium.ats["U238"]*1.0/3
@@ -14,7 +14,8 @@ Evaluate the energy generated in a 3411 MWt PWR after
 it has operated for 1 year at 75% power.
 """
 
-import scipy.integrate
+import numpy as np
+import quadrature
 import reactors
 pwr = reactors.pwr
 pwr.power = 0.75*3411
@@ -27,9 +28,13 @@ labels = ("1 hour: ", "1 day:  ", "1 month:")
 # Equation 3.70d
 P = lambda t: 0.066*(t**(-0.2) - (t + TAU_s)**(-0.2))   # 't' is time after shutdown
 
+# The t^-0.2 term is singular at shutdown: Gauss-Jacobi absorbs it in the
+# weights. The second term is smooth. All three intervals at once.
+t_end = np.array(t_s, dtype = float)
+frac = quadrature.integrate(lambda t: 0.066, 0, t_end, power = -0.2) - \
+       quadrature.integrate(lambda t: 0.066*(t + TAU_s)**(-0.2), 0, t_end)
 for i in range(len(t_s)):
-	frac = scipy.integrate.quad(P, 0, t_s[i])[0]
-	power = pwr.power * frac / 1E6
+	power = pwr.power * frac[i] / 1E6
 	print(labels[i], round(power, 3), "TJ")
 	
 print("\nThe values would be higher using equation 3.71 because it includes the")
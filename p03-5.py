@@ -4,7 +4,7 @@
 # Problem 3-5: Decay heat from a PWR fuel rod
 
 
-import scipy.integrate
+import quadrature
 from scipy.optimize import fsolve
 
 P = lambda t: 0.066*t**(-0.2)    # 't' is time after shutdown after infinite operation
@@ -27,5 +27,7 @@ print("t:   {0} s".format(round(tau, 1)))
 
 # Then integrate 'f' from [0, tau] to find the max value of q_rod
 #tau = 1490.6
-q_max = scipy.integrate.quad(f, 0, tau)[0]
+# The t^-0.2 decay heat term is integrated with its singularity in the weights
+q_max = quadrature.integrate(lambda t: q0_rod*0.066, 0, tau, power = -0.2) - \
+        q_cool*tau
 print("Q_max: {0} kJ".format(round(q_max)))
\ No newline at end of file
@@ -3,8 +3,8 @@
 #
 # Problem 4-8: Internal conservation equations for an extensive property
 
-from scipy import *
-import scipy.integrate as integrate
+from numpy import pi
+import quadrature
 
 # Given
 V_MAX = 2.0 # 2.0 m/s
@@ -16,7 +16,7 @@ velocity = lambda r: V_MAX * (1 - (r/R)**2)
 # Equation for volumetric flow rate: Area * velocity
 # Integrate that equation over 'r' from 0 to R
 integrand1 = lambda r: velocity(r) * (2*pi*r)
-vdot = integrate.quad(integrand1, 0, R)[0]
+vdot = quadrature.integrate(integrand1, 0, R)
 print("Coolant flow rate: {0:.3E} m^3/s".format(vdot))
 
 
@@ -25,6 +25,6 @@ print("Coolant flow rate: {0:.3E} m^3/s".format(vdot))
 # Find the velocity by integrating over the velocity profile,
 # and dividing by the integral of the radii
 integrand2 = lambda r: (2*pi*r)
-v_avg = integrate.quad(integrand1, 0, R)[0] / integrate.quad(integrand2, 0, R)[0]
+v_avg = quadrature.integrate(integrand1, 0, R) / quadrature.integrate(integrand2, 0, R)
 print("Average velocity:  {0:.3} m/s".format(v_avg))
 
@@ -3,7 +3,10 @@
 #
 # Problem 7-1: Containment pressure analysis
 
-from iapws import IAPWS97 as steam
+import steam_tables
+
+# Saturated states are requested repeatedly; build each one only once
+steam = steam_tables.SteamCache()
 
 # Constants
 V_C = 50970     # m^3
@@ -5,9 +5,13 @@
 # Behavior of a fully contained pressurized pool reactor under decay power conditions
 
 import math
-from iapws import IAPWS97 as steam
+import steam_tables
+import saturation
 import pylab
 
+# Saturated states are requested repeatedly; build each one only once
+steam = steam_tables.SteamCache()
+
 # Reactor parameters
 Q0 = 1600E3                             # kWt; steady-state core power
 Q_DOT = 25E3                            # kWt; constant decay heat rate
@@ -56,71 +60,30 @@ Conservation of energy:
 M0*[liquid2.u*(1-X) + vapor2.u*X] = integral(QDOT, [0, TIME]) + U0
 """
 
-def x_iterate(t, xguess = X0, Tguess = 400, eps = 0.02):
-	"""Iterate to find x(t) and T(t)
+def x_iterate(t, eps = 1E-9):
+	"""Find x(t) and T(t) from the energy and volume of the vessel contents
 	
 	Inputs:
 		t:          time in s
-		xguess:     where to start x at
-		Tguess:     where to start T at (K)
-		eps:        fractionally, how close to get
-					[Default: 0.02]
+		eps:        how close to get to T (K)
+					[Default: 1E-9]
 	
 	Outputs:
-		x:          quality
-		T:          Temperature (K)
+		v_liquid:   volume of the liquid per unit mass of coolant (m^3/kg)
+		overflooded:whether the liquid fills the entire vessel
 	"""
 	# Q_DOT is given as constant; the integral is trivial
 	Q_decay = Q_DOT*t
 	u_target = u0 + Q_decay/M0
 	
-	
-	#
-	Tmin = int(liquid0.T)
-	Tmax = Tmin + 305
-	for Tguess in range(Tmin, Tmax, 5):
-		#print("\n\n\nTguess:", Tguess)
-		xguess = 0.5
-		last_x = 10*xguess
-		u1 = 0.0
-		c = 0
-		converged = True
-		overflooded = False
-		while abs(xguess - last_x)/xguess > eps or abs(u_target - u1)/u_target > eps:
-			last_x = xguess
-			liquid1 = steam(T = Tguess, x = 0)
-			vapor1 =  steam(T = Tguess, x = 1)
-			u_fg = vapor1.u - liquid1.u
-			v_fg = vapor1.v - liquid1.v
-			v1   = liquid1.v + v_fg*xguess
-			
-			# Revise the x guess based on specific volume
-			xguess = (v0 - liquid1.v)/v_fg
-			u1 = liquid1.u + u_fg*xguess
-			#print("u_target {:.4}\tu_actual {:.4}".format(u_target, u1))
-			#print("v_target {:.4}\tv_actual {:.4}".format(v0, v1))
-			
-			#xguess = fsolve(v, last_x)[0]
-			#xguess = (u_target - liquid1.u)/u_fg
-			#xguess = fsolve()
-			#print("xguess: {:.4} / last_x {:.4}".format(xguess, last_x))
-			#print()
-			
-			c += 1
-			if c > 10:
-				converged = False
-				break
-		
-		if converged or v1 > v0 or v1 == 0:
-			if converged:
-				print("Converged")
-			if v1 > v0 or v1 == 0:
-				overflooded = True
-				print("Overflooded at t = {:.3} hours!".format(t/3600))
-			break
-		
-		
-	
+	state = saturation.solve_uv(u_target, v0, tol = eps)
+	if not state.converged:
+		print("Did not converge after {} iterations".format(state.iterations))
+	liquid1 = saturation.phases(T = state.T)[0]
+	overflooded = state.x <= 0
+	if overflooded:
+		print("Overflooded at t = {:.3} hours!".format(t/3600))
+	v1 = liquid1.v*(1 - state.x)
 	return v1, overflooded
 
 
@@ -6,6 +6,7 @@
 
 from iapws import IAPWS97 as steam
 from scipy.optimize import fsolve
+import saturation
 
 # Fixed parameters
 P_MAX   = 0.4       # MPa
@@ -81,9 +82,8 @@ while abs(x - last_x) / last_x > EPS:
 	p_air2 = last_T * MRV_AIR
 	psat = P_MAX - p_air2
 	# Saturated liquid and vapor states at max pressure
-	liquid2 = steam(P = psat, x = 0)
+	liquid2, vapor2 = saturation.phases(P = psat)
 	u_l = liquid2.u*(1-x)
-	vapor2 = steam(P = psat, x = 1)
 	u_v = vapor2.u * x
 	T2 = liquid2.T
 	
@@ -4,7 +4,7 @@
 # Problem 7-6: Containment sizing for a gas-cooled reactor with passive emergency cooling
 
 from scipy.optimize import fsolve
-import scipy.integrate as integrate
+import quadrature
 
 # Initial parameters
 Q0 = 300        # MWt; reactor thermal power
@@ -87,7 +87,8 @@ tguess = 500                        # Seconds
 tau = fsolve(dedt, 500)[0]          # Time at which the maximum temp. occurs
 
 # Find the energy stored in the gas at tau
-u_max = 1E6*integrate.quad(dedt, 0, tau)[0]     # Joules
+# (the t^-0.2 decay heat term is singular at t = 0; it goes in the weights)
+u_max = 1E6*(quadrature.integrate(lambda t: Q0*0.066, 0, tau, power = -0.2) - Qcool*tau)  # Joules
 # Then solve for temperature at an internal energy of u_max
 # u_max = ntotal*c*(T2 - T1)
 T2 = T1 + u_max/(ntotal*c)
@@ -4,6 +4,7 @@
 # Problem 7-9: Drain tank pressurization problem
 
 from iapws import IAPWS97 as steam
+import saturation
 
 # Constants
 EPS = 0.02      # How close to converge
@@ -77,8 +78,7 @@ def iterate(p_air2 = 0, tguess = 1000.0, xguess = 0.1, T2 = liquid_in.T):
 			psat = P_BURST
 			de_air = 0
 		
-		liquid2 = steam(P = psat, x = 0)
-		vapor2 = steam(P = psat, x = 1)
+		liquid2, vapor2 = saturation.phases(P = psat)
 		T2 = liquid2.T  # K
 		vmix2 = lambda x: liquid2.v*(1 - x) + vapor2.v*x
 		umix2 = lambda x: liquid2.u*(1 - x) + vapor2.u*x
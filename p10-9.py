@@ -5,7 +5,8 @@
 # AHTR
 
 import models
-from math import pi, log, sqrt
+import lattice
+from math import pi, log
 from scipy.optimize import fsolve
 
 # Given parameters
@@ -104,8 +105,8 @@ print("\tNa: {:.2f} W, \tMS: {:.2f} W".format(wna, wms))
 
 print("\nPart 3: Max Linear Power rate")
 # Find the dimensions of equivalent annular cell
-area = 1/2*sqrt(3)*DFLAT**2     # Area of a regular hexagon
-d_eq = 2*sqrt(area/pi)          # diameter of a circle
+area = lattice.cell_area(DFLAT, "hexagon")    # Area of a regular hexagon
+d_eq = lattice.equivalent_diameter(area)        # diameter of a circle
 print("\tEquivalent diameter: {:.2f} cm".format(d_eq*100))
 dratio = (d_eq/DFLOW)
 fcoeff = (2*d_eq**2/(d_eq**2 - DFLOW**2)*log(d_eq/DFLOW) - 1)
@@ -8,6 +8,7 @@ import two_phase
 from math import pi
 from iapws import IAPWS97 as Steam
 from scipy.optimize import fsolve
+import steam_tables
 
 # Given constants
 P = 6.7         # MPa; pressure
@@ -32,7 +33,7 @@ mst = QDOT/1000/(hg - hin)
 mdot = mst/XOUT
 # water mixture in the downcomer
 hdown = hin*XOUT + hf*(1 - XOUT)
-water_down = Steam(P=P, h=hdown)
+water_down = steam_tables.get_single_phase_table().Ph(P, hdown)
 rho_down = water_down.rho
 print("hdown:  {:.0f} kJ/kg".format(hdown))
 print("rho:    {:.1f} kg/m^3".format(rho_down))
@@ -6,7 +6,8 @@
 import models
 import two_phase
 from math import pi, sqrt
-from scipy.integrate import quad as integral
+from numpy import linspace
+from channel import Channel
 from iapws import IAPWS97 as Steam
 
 # Given constants
@@ -39,43 +40,15 @@ dp1 = rhom1*9.81*L + fff*L/DH*G**2/(2*rhom1)
 print("\t -> DP = {:.3} kPa".format(-dp1/1000))
 
 print("\nPart 2) Uniform heat flux")
-def x(z, x0 = 0):
-	"""Quality of the mixture on [0, L]
-	Requires saturated liquid entering the tube.
-	
-	Parameters:
-	-----------
-	z:          float, m; distance from tube inlet at bottom
-	x0:         float; inlet quality
-				[Default: 0]
-	"""
-	return x0 + z/L*X1
-	
-def alpha(z):
-	"""Void fraction of the mixture on [0, L]
-	
-	Parameter:
-	----------
-	z:      float, m; distance from the inlet at the bottom
-	"""
-	return two_phase.alpha(x(z), rhof, rhog)
-
-def rho(z):
-	"""Mixture density on [0, L]
-	
-	Parameter:
-	----------
-	z:      float, m; distance from the inlet at the bottom
-	"""
-	return two_phase.mixture_density(rhof, rhog, alpha(z))
-
-grav = lambda z: rho(z)*9.81
-dp_grav = integral(grav, 0, L)[0]
+# Saturated liquid enters the tube; the quality rises linearly to X1
+q1 = X1*(vapor.h - water.h)*1000*MDOT/L     # W/m
+chan = Channel(linspace(0, L, 2001), lambda z: q1, G, AFLOW, DH,
+               water.h, water, vapor, fff = fff)
+dp_grav = chan.dp_grav[-1]
 print("\tDeltaP_grav: {:.2f} kPa".format(dp_grav/1000))
-fric = lambda z: fff/DH*G**2/(2*rho(z))
-dp_fric = integral(fric, 0, L)[0]
+dp_fric = chan.dp_fric[-1]
 print("\tDeltaP_fric: {:.2f} kPa".format(dp_fric/1000))
-dp_accl = G**2 * (1/rhom1 - 1/rhof)
+dp_accl = chan.dp_acc[-1]
 print("\tDeltaP_accl: {:.2f} kPa".format(dp_accl/1000))
-dp_total = dp_grav + dp_fric + dp_accl
+dp_total = chan.dp[-1]
 print("\t -> DeltaP: {:.2f} kPa".format(-dp_total/1000))
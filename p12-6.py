@@ -58,14 +58,15 @@ else:
 	print("cooling down")
 
 print("\nPart 2: Void Fraction")
-vvj = 1.53*(9.81*water0.sigma*(water0.rho - vapor0.rho)/water0.rho**2)**0.25
+vvj = two_phase.drift_velocity(water0.rho, vapor0.rho, water0.sigma)
 print("\tvvj:            {:.3f} m/s".format(vvj))
 hfg = (vapor0.h - water0.h)*1000
 g = Q2/hfg
 print("\tG:              {:.3f} kg/s/m^2".format(g))
 jayv = g/vapor0.rho
 print("\tjayv:           {:.3f} m/s".format(jayv))
-alpha = jayv/(C0 + vvj)
+# Vapor bubbling up through the stagnant pool: x = 1
+alpha = two_phase.ZuberFindlay(C0, vvj).alpha(1, water0.rho, vapor0.rho, g)
 print("\t -> alpha = {:.3f}".format(alpha))
 
 print("\nPart 3: HEM?")
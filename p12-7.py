@@ -84,7 +84,7 @@ def x(z):
 
 zvals = linspace(0, L)
 xvals = array([x(z) for z in zvals])
-avals = array([two_phase.alpha(x, RHOF, RHOG) for x in xvals])
+avals = two_phase.alpha(xvals, RHOF, RHOG)
 plot(zvals, xvals, "b-", label = "Quality $X$")
 plot(zvals, avals, "r-", label = "Void fraction $\\alpha$")
 xlim([0, L])
@@ -104,7 +104,9 @@ rhobar = 2/(VG + VF)
 print("\trhobar:       {:.0f} kg/m^3".format(rhobar))
 dp_acc = G**2*(VG - VF)/1000
 print("\tDeltaP_acc:  {:+.2f} kPa".format(dp_acc))
-dp_fric = -fff*L/D*G**2/(2000*rhobar)
+# Mean HEM multiplier over the linear quality profile
+phi2 = mean(two_phase.phi_hem(xvals, RHOF, RHOG))
+dp_fric = -fff*L/D*G**2/(2000*RHOF)*phi2
 print("\tDeltaP_fric: {:+.2f} kPa".format(dp_fric))
 dp_tot = dp_acc + dp_fric
 print("\t -> DeltaP_tot = {:+.2f} kPa".format(dp_tot))
@@ -4,9 +4,11 @@
 # Problem 13-3: Heat transfer problems for a BWR channel
 
 import models
+import axial
 from pylab import *
 from scipy.optimize import fsolve
 from iapws import IAPWS97 as Steam
+import steam_tables
 
 PLOT = True
 KELVIN = 273.15
@@ -19,7 +21,7 @@ TIN = 278.3 + KELVIN    # K
 G = 1625                # kg/s/m^2
 Q1MAX = 47240           # W/m
 # Steam tables
-water_in = Steam(P=P0, T=TIN)
+water_in = steam_tables.get_single_phase_table().PT(P0, TIN)
 sat_water = Steam(P=P0, x=0)
 sat_vapor = Steam(P=P0, x=1)
 tsat = sat_water.T
@@ -37,16 +39,17 @@ print("Tsat:           {:.1f} K".format(tsat))
 print("\nPart 1: Axial location where equilibrium quality is 0")
 xe0 = (hin - hf)/hfg
 print("\tXe(-L/2):       {:.3f}".format(xe0))
-qdot = 2/pi*Q1MAX*L
+q1 = axial.Cosine(L, peak = Q1MAX)
+qdot = q1.total
 print("\tqdot:           {:.0f} kW".format(qdot/1000))
 mdot = G*A
 print("\tmdot:           {:.3f} kg/s".format(mdot))
 
 def xe(z):
-	return xe0 + qdot/(2*mdot*hfg*1000) * (sin(pi/L*z) + 1)
+	return xe0 + q1.cumulative(z)/(mdot*hfg*1000)
 
 
-ze = fsolve(xe, -L/4)[0]
+ze = q1.locate(-xe0*mdot*hfg*1000)
 print("\t -> ze:        {:.2f} m = {:.2f} m from inlet".format(ze, ze + L/2))
 
 print("\nPart 2: Axial location of ONB")
@@ -63,11 +66,10 @@ htc = nu*sat_water.k/D
 print("\th:             {:.1f} kW/m^2-K".format(htc/1000))
 
 def tbulk(z):
-	return TIN + L/(1000*pi*mdot*sat_water.cp) * \
-	             Q1MAX*(sin(pi/L*z) + 1)
+	return TIN + q1.cumulative(z)/(1000*mdot*sat_water.cp)
 
 def q2(z):
-	return q2max*cos(pi/L*z)
+	return q1(z)/(pi*D)
 
 def twall(z):
 	return tbulk(z) + q2(z)/htc
@@ -88,7 +90,7 @@ print("\t -> zonb:      {:.2f} m = {:.2f} m from inlet".format(zonb, zonb + L/2)
 if PLOT:
 	figure()
 	zvals = linspace(-L/2, L/2)
-	xevals = array([xe(x) for x in zvals])
+	xevals = xe(zvals)
 	plot(xevals, zvals, label="X_{eq}")
 	plot([xe0, 0.5], [ze, ze], "gray")
 	text(xevals.max()/1.5, -1.0, "$X_e = 0$")
@@ -98,9 +100,9 @@ if PLOT:
 	grid()
 
 	fig2, ax1 = subplots()
-	tbulkvals = array([tbulk(x) for x in zvals])
+	tbulkvals = tbulk(zvals)
 	ax1.plot(tbulkvals, zvals, "blue", label="$T_{bulk}$")
-	twallvals = array([twall(x) for x in zvals])
+	twallvals = twall(zvals)
 	ax1.plot(twallvals, zvals, "orange", label="$T_{wall}$")
 	ax1.plot([500, tbulkvals.max()], [zonb, zonb], "gray")
 	text(twallvals.min() + 50, zonb + 0.15, "Onset of nucleate boiling")
@@ -109,7 +111,7 @@ if PLOT:
 	legend()
 	
 	ax2 = ax1.twiny()
-	dtvals = array([delta_t(x) for x in zvals])
+	dtvals = delta_t(zvals)
 	ax2.plot(dtvals, zvals, "green")
 	ax2.set_xlim([0, 3*max(dtvals)])
 	
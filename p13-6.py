@@ -6,6 +6,7 @@
 
 from math import pi
 from iapws import IAPWS97 as Steam
+import steam_tables
 
 # Given constants
 KELVIN = 273.15
@@ -17,7 +18,7 @@ AHT = 2*pi*R**2     # m^2; area for heat transfer
 Q2 = 350            # kW/m^2;  heat flux through the vessel
 MDOT = 300          # kg/s;    mass flow rate
 # Steam tables
-sub_water = Steam(P=P0, T=T0)
+sub_water = steam_tables.get_single_phase_table().PT(P0, T0)
 hin = sub_water.h
 sat_water = Steam(P=P0, x=0)
 hf = sat_water.h
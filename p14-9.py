@@ -4,6 +4,7 @@
 # Problem 14.9
 
 import models
+import axial
 from math import *
 from scipy.optimize import fsolve
 
@@ -65,15 +66,15 @@ print("\tHeight at max. T:    {:.1f} cm".format(zcrit*100))
 # And again from the previous PSet, Eq. 14.19
 q2peak = pi/2*Q2AVG
 q1peak = q2peak*pi*DC
-tco = lambda z: TIN + q1peak*(cos(pi/L*z)/(pi*DC*h) +
-                              (sin(pi/L*z) + 1)*L/(pi*MDOTPRIME*CW))
+q1 = axial.Cosine(L, peak = q1peak)
+tco = lambda z: TIN + q1(z)/(pi*DC*h) + q1.cumulative(z)/(MDOTPRIME*CW)
 tmax = tco(zcrit)
 print("\tMaximum crd T:       {:.1f} degC".format(tmax))
 
 # Plotting
 from pylab import *
 zvals = linspace(-L/2, L/2)
-yvals = [tco(zval) for zval in zvals]
+yvals = tco(zvals)
 plot(zvals, yvals)
 xlim([-L/2, L/2])
 ylim([TIN, tmax*1.02])
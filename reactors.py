@@ -3,10 +3,74 @@
 # Module containing parameters for typical BWR, PWR, CANDU, HTGR, AGR, AND LMFBR specimens
 
 from math import *
+from collections import namedtuple
+import numpy as np
+import lattice
+
+
+class _Input(object):
+	"""Attribute that clears the cached quantities depending on it when set"""
+	def __init__(self, name):
+		self.name = name
+		self.slot = "_" + name
+
+	def __get__(self, obj, owner):
+		if obj is None:
+			return self
+		return getattr(obj, self.slot)
+
+	def __set__(self, obj, value):
+		setattr(obj, self.slot, value)
+		obj._invalidate(self.name)
+
+
+class _Derived(object):
+	"""Quantity computed on first access and cached until one of the
+	attributes it depends on changes
+
+	Parameters:
+	-----------
+	*depends:   str; names of the inputs and derived quantities it uses
+	"""
+	def __init__(self, *depends):
+		self.depends = depends
+		self.fset = None
+
+	def __call__(self, func):
+		self.func = func
+		self.name = func.__name__
+		self.__doc__ = func.__doc__
+		return self
+
+	def __get__(self, obj, owner):
+		if obj is None:
+			return self
+		try:
+			return obj._cache[self.name]
+		except KeyError:
+			value = obj._cache[self.name] = self.func(obj)
+			return value
+
+	def __set__(self, obj, value):
+		if self.fset is None:
+			raise AttributeError("{} cannot be set.".format(self.name))
+		self.fset(obj, value)
+
+	def setter(self, func):
+		self.fset = func
+		return self
+
 
 class ReactorType(object):
 	"""Container for reactor data
 	
+	Derived quantities (radii, flow area, hydraulic diameter, total pins,
+	heat transfer area, and the conversions among q', q'', and q''') are
+	computed on first use and cached; setting any attribute they depend on
+	clears them. Setting one of q1, q2, or q3 defines the heat rate, and
+	the other two follow from it and the pin geometry. Without any of
+	them, q1 follows from the power, the total pins, and the height.
+	
 	Required Parameters:
 		name:       str; name of the reactor
 		ppitch:     float; pin pitch (cm)
@@ -21,20 +85,33 @@ class ReactorType(object):
 		nassm:      int; number of assemblies
 		shape:      str; {"square", "hexagon", or "circle"}
 	"""
+	__slots__ = ("name", "Q3", "q1max", "_cache", "_heat", "_total_pins",
+	             "_ppitch", "_npins", "_df", "_dfo", "_dci", "_dco", "_height",
+	             "_apitch", "_nassm", "_shape", "_power")
+	
+	ppitch = _Input("ppitch")
+	npins = _Input("npins")
+	df = _Input("df")
+	dfo = _Input("dfo")
+	dci = _Input("dci")
+	dco = _Input("dco")
+	height = _Input("height")
+	apitch = _Input("apitch")
+	nassm = _Input("nassm")
+	shape = _Input("shape")
+	power = _Input("power")    # MW
+	
 	def __init__(self, name, ppitch, npins,
 	             df = None, dci = None, dco = None, height = None,
 	             apitch = None, nassm = None, shape = "square"):
+		self._cache = {}
+		self._heat = None
+		self._total_pins = None
 		self.name = name
 		self.ppitch = ppitch
 		self.npins = npins
 		
-		self._rfo = None
-		self._dfo = None
-		self._rci = None
-		self._dci = None
-		self._rco = None
-		self._dco = None
-		
+		self.dfo = None
 		self.df = df
 		self.dci = dci
 		self.dco = dco
@@ -49,111 +126,310 @@ class ReactorType(object):
 		# Heat generation parameters that can be changed by functions
 		self.power = None   # MW
 		self.Q3 = None      # Power density core average
-		self.q1 = None      # Linear heat rate (avg)
-		self.q2 = None
-		self.q3 = None
 		self.q1max = None   # Linear heat rate (max)
 		
 	def __str__(self):
 		return self.name
 	
-	@property
-	def dco(self):
-		return self._dco
+	def __copy__(self):
+		other = object.__new__(type(self))
+		for slot in self.__slots__:
+			setattr(other, slot, getattr(self, slot))
+		other._cache = dict(self._cache)
+		return other
 	
-	@property
-	def rco(self):
-		return self._rco
+	def _invalidate(self, name):
+		for key in self._dependents.get(name, (name,)):
+			self._cache.pop(key, None)
 	
-	@property
-	def dci(self):
-		return self._dci
+	@_Derived("dco")
+	def rco(self):
+		if self.dco is not None:
+			return self.dco/2.0
 	
-	@property
+	@_Derived("dci")
 	def rci(self):
-		return self._rci
-	
-	@property
-	def dfo(self):
-		return self._dfo
+		if self.dci is not None:
+			return self.dci/2.0
 	
-	@property
+	@_Derived("dfo")
 	def rfo(self):
-		return self._rfo
-	
-	@dco.setter
-	def dco(self, dco):
-		self._dco = dco
-		if dco is not None:
-			self._rco = dco/2.0
-		else:
-			self._rco = None
-	
-	@dci.setter
-	def dci(self, dci):
-		self._dci = dci
-		if dci is not None:
-			self._rci = dci/2.0
-		else:
-			self._rci = None
-	
-	@dfo.setter
-	def dfo(self, dfo):
-		self._dfo = dfo
-		if dfo is not None:
-			self._rfo = dfo/2.0
-		else:
-			self._rfo = None
+		if self.dfo is not None:
+			return self.dfo/2.0
 	
 	@rco.setter
 	def rco(self, rco):
-		self._rco = rco
-		if rco is not None:
-			self._dco = rco*2.0
-		else:
-			self._dco = None
+		self.dco = None if rco is None else rco*2.0
 	
 	@rci.setter
 	def rci(self, rci):
-		self._rci = rci
-		if rci is not None:
-			self._dci = rci*2.0
-		else:
-			self._dci = None
+		self.dci = None if rci is None else rci*2.0
 	
 	@rfo.setter
 	def rfo(self, rfo):
-		self._rfo = rfo
-		if rfo is not None:
-			self._dfo = rfo*2.0
+		self.dfo = None if rfo is None else rfo*2.0
+	
+	@_Derived("npins", "nassm", "shape")
+	def total_pins(self):
+		"""Number of pins in the core, unless set explicitly
+		(npins across each square assembly, npins per assembly otherwise)"""
+		if self._total_pins is not None:
+			return self._total_pins
+		if self.npins and self.nassm:
+			if self.shape == "square":
+				return self.npins**2*self.nassm
+			return self.npins*self.nassm
+	
+	@total_pins.setter
+	def total_pins(self, total_pins):
+		self._total_pins = total_pins
+		self._invalidate("total_pins")
+	
+	@_Derived("ppitch", "npins", "dco", "apitch", "shape")
+	def flow_area(self):
+		"""Coolant flow area per pin (cm^2)"""
+		if not (self.ppitch and self.dco):
+			return None
+		if self.shape == "circle":
+			if not self.npins:
+				return None
+			bundle = lattice.from_reactor(self)
+			return bundle.flow_area/bundle.nrods*100**2
+		return lattice.cell_area(self.ppitch, self.shape) - pi/4*self.dco**2
+	
+	@_Derived("flow_area", "dco")
+	def dh(self):
+		"""Hydraulic diameter of the unit cell (cm)"""
+		if self.flow_area and self.dco:
+			return 4*self.flow_area/(pi*self.dco)
+	
+	@_Derived("total_pins", "dco", "height")
+	def heat_transfer_area(self):
+		"""Clad outer surface area of the core (cm^2)"""
+		if self.total_pins and self.dco and self.height:
+			return self.total_pins*pi*self.dco*self.height
+	
+	def _set_heat(self, kind, value):
+		if value is not None:
+			self._heat = (kind, value)
+		elif self._heat is not None and self._heat[0] == kind:
+			self._heat = None
 		else:
-			self._dfo = None
+			return
+		self._invalidate("heat")
+	
+	@_Derived("heat", "dco", "df", "power", "total_pins", "height")
+	def q1(self):
+		"""Linear heat rate (avg)"""
+		if self._heat is None:
+			if self.power and self.total_pins and self.height:
+				return self.power/(self.total_pins*self.height)
+			return None
+		kind, value = self._heat
+		if kind == "q1":
+			return value
+		elif kind == "q2" and self.dco:
+			return value*pi*self.dco
+		elif kind == "q3" and self.df:
+			return value*pi/4*self.df**2
+	
+	@_Derived("q1", "dco")
+	def q2(self):
+		"""Heat flux at the clad outer surface (avg)"""
+		if self.q1 and self.dco:
+			return self.q1/(pi*self.dco)
+	
+	@_Derived("q1", "df")
+	def q3(self):
+		"""Volumetric heat generation rate in the fuel (avg)"""
+		if self.q1 and self.df:
+			return 4/pi*self.q1/self.df**2
+	
+	@q1.setter
+	def q1(self, q1):
+		self._set_heat("q1", q1)
+	
+	@q2.setter
+	def q2(self, q2):
+		self._set_heat("q2", q2)
+	
+	@q3.setter
+	def q3(self, q3):
+		self._set_heat("q3", q3)
 
 
 	def get_volumetric_heat(self):
 		if not self.q3:
-			if self.q1 and self.dco:
-				self.q3 = 4/pi * self.q1 / self.df**2
-			elif self.q2:
-				if self.dco and self.df and self.q2:
-					if self.shape in ("square", "triangle"):
-						self.q3 = self.q2 * self.dco / self.df**2
-					else:
-						raise TypeError("Cannot calculate this shape yet")
-			else:
-				raise TypeError("Not enough information to calculate q'''.")
+			raise TypeError("Not enough information to calculate q'''.")
 		return self.q3
 		
 	
 	def get_heat_flux(self):
 		if not self.q2:
-			assert self.q1, "Linear heat rate (q1) needs to be set"
-			assert self.height, "Active fuel height (height) needs to be set"
-			assert self.dco, "Clad outer diameter (dco) needs to be set"
-			
-			self.q2 = self.q1 / (self.dco * pi)
+			raise TypeError("Not enough information to calculate q''.")
 		return self.q2
+
+
+def _dependents(cls):
+	"""For each attribute, the cached quantities that depend on it
+	(directly or through other derived quantities), itself included"""
+	derived = {k: v for k, v in vars(cls).items() if isinstance(v, _Derived)}
+	direct = {}
+	for name, d in derived.items():
+		for dep in d.depends:
+			direct.setdefault(dep, set()).add(name)
+	closure = {}
+	for name in set(direct) | set(derived):
+		found = {name}
+		stack = [name]
+		while stack:
+			for dep in direct.get(stack.pop(), ()):
+				if dep not in found:
+					found.add(dep)
+					stack.append(dep)
+		closure[name] = tuple(found)
+	return closure
+
+ReactorType._dependents = _dependents(ReactorType)
+
+
+
+FleetHeat = namedtuple("FleetHeat", ["q1", "q2", "q3", "q1max", "q2max", "q3max", "peaking"])
+
+
+class ReactorFleet(object):
+	"""Many reactor designs stored as columns, one entry per design
+
+	Numeric attributes are float arrays, with NaN where a ReactorType
+	attribute is None; name and shape are arrays of strings. Like
+	ReactorType, the fleet stores only what was set: total_pins, and at
+	most one of the heat rates q1, q2, and q3, are NaN unless they were
+	given explicitly, and are otherwise derived as ReactorType derives
+	them (see get_total_pins() and evaluate()).
+
+	Parameters:
+	-----------
+	name:       str or array; names of the designs
+	            [Default: None -- "Design 0", "Design 1", ...]
+	shape:      str or array; {"square", "hexagon", or "circle"}
+	            [Default: "square"]
+	**columns:  float or array; any of ReactorFleet.COLUMNS, broadcast
+	            against each other. Missing columns are NaN.
+	"""
+	COLUMNS = ("ppitch", "npins", "df", "dfo", "dci", "dco", "height", "apitch",
+	           "nassm", "total_pins", "power", "Q3", "q1", "q2", "q3", "q1max")
+	HEAT = ("q1", "q2", "q3")
+	
+	def __init__(self, name = None, shape = "square", **columns):
+		unknown = set(columns) - set(self.COLUMNS)
+		if unknown:
+			raise TypeError("Unknown columns: {}".format(", ".join(sorted(unknown))))
+		values = [np.asarray(np.nan if columns.get(c) is None else columns[c], dtype=float)
+		          for c in self.COLUMNS]
+		values = np.broadcast_arrays(*(values + [np.asarray(shape)]))
+		size = values[0].size
+		for column, value in zip(self.COLUMNS, values):
+			setattr(self, column, np.array(value, dtype=float).ravel())
+		self.shape = np.array(values[-1]).ravel()
+		heat_set = sum(~np.isnan(getattr(self, q)) for q in self.HEAT)
+		if np.any(heat_set > 1):
+			raise ValueError("Set at most one of q1, q2, and q3 for each design.")
+		if name is None:
+			name = ["Design {}".format(i) for i in range(size)]
+		self.name = np.broadcast_to(np.asarray(name), (size,)).copy()
+	
+	def __len__(self):
+		return len(self.name)
+	
+	def __getitem__(self, index):
+		"""A ReactorType for an integer index, or a ReactorFleet for a
+		slice, index array, or mask"""
+		if isinstance(index, (int, np.integer)):
+			return self._reactor(index)
+		columns = {c: getattr(self, c)[index] for c in self.COLUMNS}
+		return ReactorFleet(self.name[index], self.shape[index], **columns)
+	
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self._reactor(i)
 	
+	@classmethod
+	def from_reactors(cls, reactors):
+		"""Fleet of the given ReactorType instances"""
+		reactors = list(reactors)
+		inputs = [c for c in cls.COLUMNS if c not in cls.HEAT + ("total_pins",)]
+		columns = {c: [np.nan if getattr(rx, c) is None else getattr(rx, c)
+		               for rx in reactors] for c in inputs}
+		# Only the explicitly set values, so that the rest stay derived
+		columns["total_pins"] = [np.nan if rx._total_pins is None else rx._total_pins
+		                         for rx in reactors]
+		for q in cls.HEAT:
+			columns[q] = [rx._heat[1] if rx._heat is not None and rx._heat[0] == q
+			              else np.nan for rx in reactors]
+		return cls([rx.name for rx in reactors], [rx.shape for rx in reactors], **columns)
+	
+	def to_reactors(self):
+		"""List of ReactorType instances, one per design"""
+		return list(self)
+	
+	def _reactor(self, i):
+		value = lambda c: None if np.isnan(getattr(self, c)[i]) else getattr(self, c)[i].item()
+		integer = lambda c: None if value(c) is None else int(value(c))
+		rx = ReactorType(str(self.name[i]), value("ppitch"), integer("npins"),
+		                 df = value("df"), dci = value("dci"), dco = value("dco"),
+		                 height = value("height"), apitch = value("apitch"),
+		                 nassm = integer("nassm"), shape = str(self.shape[i]))
+		rx.dfo = value("dfo")
+		rx.power = value("power")
+		rx.Q3 = value("Q3")
+		rx.q1max = value("q1max")
+		for q in self.HEAT:
+			if value(q) is not None:
+				setattr(rx, q, value(q))
+		if value("total_pins") is not None:
+			rx.total_pins = integer("total_pins")
+		return rx
+	
+	def get_total_pins(self):
+		"""Total pins of every design: the total_pins column where it is
+		set, otherwise npins**2*nassm for square assemblies and
+		npins*nassm for the others"""
+		per_assembly = np.where(self.shape == "square", self.npins**2, self.npins)
+		return np.where(np.isnan(self.total_pins), per_assembly*self.nassm,
+		                self.total_pins)
+	
+	def evaluate(self, *factors):
+		"""Average and peak heat rates of every design
+		
+		The peak linear heat rate is q1 times the product of the peaking
+		factors, if any are given (e.g., radial, axial, local, and
+		engineering factors, each a float or an array over the designs);
+		otherwise it is the q1max column.
+		
+		Parameters:
+		-----------
+		*factors:   float or array; chain of peaking factors
+		
+		Returns:
+		--------
+		FleetHeat(q1, q2, q3, q1max, q2max, q3max, peaking): arrays, with
+		NaN where the data are insufficient; peaking is q1max/q1
+		"""
+		with np.errstate(divide="ignore", invalid="ignore"):
+			to_q2 = 1/(np.pi*self.dco)
+			to_q3 = 4/(np.pi*self.df**2)
+			# As ReactorType.q1: the heat rate that was set, converted to
+			# q1, or else the power over the total pins and the height
+			q1 = self.power/(self.get_total_pins()*self.height)
+			q1 = np.where(np.isnan(self.q3), q1, self.q3/to_q3)
+			q1 = np.where(np.isnan(self.q2), q1, self.q2/to_q2)
+			q1 = np.where(np.isnan(self.q1), q1, self.q1)
+			if factors:
+				q1max = q1*np.prod(np.broadcast_arrays(*factors), axis=0)
+			else:
+				q1max = self.q1max
+			peaking = q1max/q1
+		return FleetHeat(q1, q1*to_q2, q1*to_q3, q1max, q1max*to_q2, q1max*to_q3, peaking)
 
 
 # Common reactor types
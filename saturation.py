@@ -0,0 +1,223 @@
+# Saturation
+#
+# The saturation curve of water from the IF97 region 4 equations:
+# Tsat(P) and Psat(T) with their analytic derivatives, and the slopes
+# of the saturated liquid and vapor properties along the curve, for
+# Newton-type solvers that would otherwise finite-difference steam tables.
+
+from collections import namedtuple
+import numpy as np
+import if97
+
+# Region 4 ends where region 1 does; above this, the liquid is in region 3.
+P_MAX = if97.psat(if97.T13)     # MPa
+
+SaturationSlopes = namedtuple("SaturationSlopes",
+                              ("P", "T", "dTsat", "dhf", "dhg", "dvf", "dvg"))
+
+
+def Tsat(P):
+	"""Saturation temperature
+
+	Parameter:
+	----------
+	P:          float or array, MPa; pressure
+
+	Returns:
+	--------
+	float or array, K; saturation temperature
+	"""
+	return if97.tsat(P)
+
+
+def Psat(T):
+	"""Saturation pressure
+
+	Parameter:
+	----------
+	T:          float or array, K; temperature
+
+	Returns:
+	--------
+	float or array, MPa; saturation pressure
+	"""
+	return if97.psat(T)
+
+
+def dPsat_dT(T):
+	"""Slope of the saturation curve, from differentiating IF97 Eq. 30
+
+	Parameter:
+	----------
+	T:          float or array, K; temperature
+
+	Returns:
+	--------
+	float or array, MPa/K; dPsat/dT
+	"""
+	n = if97._R4_N
+	T = np.asarray(T, dtype=float)
+	theta = T + n[9]/(T - n[10])
+	dtheta = 1 - n[9]/(T - n[10])**2
+	A = theta**2 + n[1]*theta + n[2]
+	B = n[3]*theta**2 + n[4]*theta + n[5]
+	C = n[6]*theta**2 + n[7]*theta + n[8]
+	dA = 2*theta + n[1]
+	dB = 2*n[3]*theta + n[4]
+	dC = 2*n[6]*theta + n[7]
+	with np.errstate(invalid="ignore"):
+		D = np.sqrt(B**2 - 4*A*C)
+		dD = (B*dB - 2*(dA*C + A*dC))/D
+		q = 2*C/(-B + D)
+		dq = (2*dC - q*(-dB + dD))/(-B + D)
+	slope = 4*q**3*dq*dtheta
+	return np.where(np.isnan(if97.psat(T)), np.nan, slope)[()]
+
+
+def dTsat_dP(P):
+	"""Slope of the saturation temperature with pressure
+
+	Parameter:
+	----------
+	P:          float or array, MPa; pressure
+
+	Returns:
+	--------
+	float or array, K/MPa; dTsat/dP
+	"""
+	return (1/np.asarray(dPsat_dT(Tsat(P))))[()]
+
+
+def phases(P = None, T = None):
+	"""Exact saturated liquid and vapor states
+
+	Parameters:
+	-----------
+	Exactly one of:
+	P:          float or array, MPa; pressure
+	T:          float or array, K; temperature
+
+	Returns:
+	--------
+	tuple of (liquid, vapor) if97.State
+	"""
+	if (P is None) == (T is None):
+		raise TypeError("Specify exactly one of P or T.")
+	if P is None:
+		P = Psat(T)
+	return if97.Px(P, 0), if97.Px(P, 1)
+
+
+def slopes(P):
+	"""Derivatives of the saturated properties along the saturation curve
+
+	Each property y of a saturated phase changes with pressure as
+		dy/dP = (dy/dP)_T + (dy/dT)_P * dTsat/dP
+	where the partial derivatives come from the IF97 region 1 (liquid)
+	and region 2 (vapor) equations.
+
+	Parameter:
+	----------
+	P:          float or array, MPa; pressure (up to P_MAX, 16.53 MPa)
+
+	Returns:
+	--------
+	SaturationSlopes of floats or arrays:
+	P:          MPa; pressure
+	T:          K; saturation temperature
+	dTsat:      K/MPa; dTsat/dP
+	dhf, dhg:   kJ/kg/MPa; dh/dP of the saturated liquid and vapor
+	dvf, dvg:   m^3/kg/MPa; dv/dP of the saturated liquid and vapor
+	"""
+	P = np.asarray(P, dtype=float)
+	P = np.where(P <= P_MAX, P, np.nan)
+	T = Tsat(P)
+	dT = dTsat_dP(P)
+	dh = []
+	dv = []
+	for region in (1, 2):
+		phase = if97.thermo(P, T, region)
+		v = phase["v"]
+		# (dh/dP)_T = v*(1 - T*alpha); 1 m^3/kg * MPa = 1000 kJ/kg
+		dh.append(1000*v*(1 - T*phase["alpha"]) + phase["cp"]*dT)
+		dv.append(-v*phase["kt"] + v*phase["alpha"]*dT)
+	return SaturationSlopes(P[()], T, dT, dh[0], dh[1], dv[0], dv[1])
+
+
+MixtureState = namedtuple("MixtureState", ("T", "P", "x", "iterations", "converged"))
+
+
+def solve_uv(u, v, tol = 1E-9, maxiter = 50):
+	"""Equilibrium state of a closed two-phase mixture from its
+	specific internal energy and specific volume
+
+	Solves u = uf(T) + x*ufg(T) with x = (v - vf(T))/vfg(T) by Newton
+	iteration on the saturation temperature, using the exact slopes of
+	the saturated properties. A bracket on the saturation line is kept
+	for every state, and any Newton step that leaves it is replaced by
+	bisection, so the iteration cannot wander out of region 4.
+
+	Parameters:
+	-----------
+	u:          float or array, kJ/kg; specific internal energy of the mixture
+	v:          float or array, m^3/kg; specific volume of the mixture
+	tol:        float, K; convergence tolerance on the temperature
+	            [Default: 1E-9]
+	maxiter:    int; maximum number of iterations
+	            [Default: 50]
+
+	Returns:
+	--------
+	MixtureState of floats or arrays:
+	T:          K; saturation temperature
+	P:          MPa; saturation pressure
+	x:          quality. x < 0 means the volume holds only compressed liquid,
+	            and x > 1 only superheated steam, at this energy.
+	iterations: int; number of iterations taken
+	converged:  bool; whether the tolerance was met
+	"""
+	u, v = np.broadcast_arrays(np.asarray(u, dtype=float), np.asarray(v, dtype=float))
+	shape = u.shape
+	u = u.ravel()
+	v = v.ravel()
+	lo = np.full(u.shape, if97.T_MIN + 0.01)
+	hi = np.full(u.shape, if97.T13)
+	T = (lo + hi)/2
+	iterations = np.zeros(u.shape, dtype=int)
+	active = np.ones(u.shape, dtype=bool)
+	for __ in range(maxiter):
+		if not active.any():
+			break
+		Ta = T[active]
+		P = Psat(Ta)
+		liquid = if97.thermo(P, Ta, 1)
+		vapor = if97.thermo(P, Ta, 2)
+		vfg = vapor["v"] - liquid["v"]
+		ufg = vapor["u"] - liquid["u"]
+		xa = (v[active] - liquid["v"])/vfg
+		f = liquid["u"] + xa*ufg - u[active]
+		# df/dT along the saturation line; 1 m^3/kg * MPa = 1000 kJ/kg
+		s = slopes(P)
+		du_f = s.dhf - 1000*(liquid["v"] + P*s.dvf)
+		du_g = s.dhg - 1000*(vapor["v"] + P*s.dvg)
+		dx = -(s.dvf + xa*(s.dvg - s.dvf))/vfg
+		df = (du_f + xa*(du_g - du_f) + ufg*dx)/s.dTsat
+		# Tighten the bracket, then step
+		above = f > 0
+		hi[active] = np.where(above, Ta, hi[active])
+		lo[active] = np.where(above, lo[active], Ta)
+		step = Ta - f/df
+		done = np.abs(step - Ta) < tol
+		inside = (step >= lo[active]) & (step <= hi[active])
+		step = np.where(inside, step, (lo[active] + hi[active])/2)
+		T[active] = step
+		iterations[active] += 1
+		active[np.flatnonzero(active)[done]] = False
+	converged = ~active
+	P = Psat(T)
+	# Quality at the final temperature
+	vf = if97.thermo(P, T, 1)["v"]
+	x = (v - vf)/(if97.thermo(P, T, 2)["v"] - vf)
+	return MixtureState(T.reshape(shape)[()], P.reshape(shape)[()],
+	                    x.reshape(shape)[()], iterations.reshape(shape)[()],
+	                    converged.reshape(shape)[()])
@@ -0,0 +1,831 @@
+# Steam Tables
+#
+# Pre-tabulated IAPWS-IF97 water properties for fast, vectorized lookups.
+# The tables are built once from the `iapws` package and then interpolated,
+# instead of constructing a new IAPWS97 instance for every state.
+#
+# Tabulated data are saved to binary files in TABLE_DIR the first time they
+# are needed, and later opened with numpy.memmap, so that every script and
+# every worker process shares the same pages instead of rebuilding them.
+# Where exact IAPWS97 states are required, SteamCache memoizes them.
+
+import os
+import tempfile
+from collections import namedtuple, OrderedDict
+import numpy as np
+from scipy.interpolate import CubicSpline, PPoly
+import iapws
+from iapws import IAPWS97
+
+# Where the tables are stored; override with the STEAM_TABLE_DIR variable
+TABLE_DIR = os.environ.get("STEAM_TABLE_DIR",
+                           os.path.join(os.path.expanduser("~"), ".cache", "steam_tables"))
+# Bump this whenever the layout or grid of a tabulated file changes
+TABLE_FORMAT = 1
+
+# Saturation line limits
+T_TRIPLE = 273.16       # K
+T_CRIT = 647.096        # K
+T_SAT_MAX = 646.0       # K; tables stop short of the critical point
+T_REGION3 = 623.15      # K; IF97 switches to region 3 above this temperature
+# Properties of each saturated phase, named as in iapws
+SAT_PROPERTIES = ("h", "u", "v", "rho", "cp", "mu", "k", "sigma", "Prandt")
+# Strictly positive properties are interpolated on a log scale
+_LOG_PROPERTIES = ("v", "rho", "cp", "mu", "k", "sigma", "Prandt")
+
+SaturatedPhase = namedtuple("SaturatedPhase", ("T", "P") + SAT_PROPERTIES)
+
+
+def _saturation_grid(npoints):
+	"""Temperature nodes on the saturation line
+
+	IF97 changes equations at T_REGION3, and the properties are not smooth
+	across it, so the grid is split into two segments: a uniform one up to
+	T_REGION3, and one just above it that is clustered toward the critical
+	point, where the properties change fastest.
+
+	Parameter:
+	----------
+	npoints:    int; number of nodes
+
+	Returns:
+	--------
+	temps:      array of floats, K; saturation temperatures
+	split:      int; index of the first node of the second segment
+	"""
+	split = npoints*5//8
+	s = np.linspace(0, 1, npoints - split)
+	lower = np.linspace(T_TRIPLE, T_REGION3, split)
+	upper = T_SAT_MAX - (T_SAT_MAX - T_REGION3)*(1 - s)**1.5
+	upper[0] = np.nextafter(T_REGION3, T_SAT_MAX)
+	return np.concatenate([lower, upper]), split
+
+
+def _split_spline(x, y, split):
+	"""Cubic splines on either side of a discontinuity, joined into one
+	piecewise polynomial
+
+	Parameters:
+	-----------
+	x:          array of floats; increasing nodes
+	y:          array; values at the nodes (along the first axis)
+	split:      int; index of the first node after the discontinuity
+
+	Returns:
+	--------
+	scipy.interpolate.PPoly
+	"""
+	lower = CubicSpline(x[:split], y[:split])
+	upper = CubicSpline(x[split:], y[split:])
+	# Constant across the (vanishingly small) gap between the segments
+	bridge = np.zeros((4, 1) + y.shape[1:])
+	bridge[3] = y[split]
+	c = np.concatenate([lower.c, bridge, upper.c], axis=1)
+	return PPoly.construct_fast(c, np.concatenate([lower.x, upper.x]))
+
+
+def _iapws_saturation(temps):
+	"""Evaluate IAPWS97 for both saturated phases at each temperature
+
+	Parameter:
+	----------
+	temps:      array of floats, K; saturation temperatures
+
+	Returns:
+	--------
+	data:       array of shape (len(temps), 2 + 2*len(SAT_PROPERTIES)).
+	            The columns are T, P, the liquid properties, and then
+	            the vapor properties, in the order of SAT_PROPERTIES.
+	"""
+	nprop = len(SAT_PROPERTIES)
+	data = np.empty((len(temps), 2 + 2*nprop))
+	for i, t in enumerate(temps):
+		liquid = IAPWS97(T=t, x=0)
+		vapor = IAPWS97(T=t, x=1)
+		data[i, 0] = t
+		data[i, 1] = liquid.P
+		for j, prop in enumerate(SAT_PROPERTIES):
+			data[i, 2 + j] = getattr(liquid, prop)
+			data[i, 2 + nprop + j] = getattr(vapor, prop)
+	return data
+
+
+def tabulate_saturation(npoints):
+	"""Tabulate both saturated phases on the table nodes
+
+	Parameter:
+	----------
+	npoints:    int; number of nodes along the saturation line
+
+	Returns:
+	--------
+	data:       array of shape (npoints, 2 + 2*len(SAT_PROPERTIES));
+	            see _iapws_saturation()
+	"""
+	return _iapws_saturation(_saturation_grid(npoints)[0])
+
+
+class SaturationTable(object):
+	"""Interpolated properties of saturated liquid and vapor
+
+	The table is built once over the saturation line from the triple point
+	to T_SAT_MAX, and cubic splines are used for every lookup. Lookups by
+	pressure or temperature accept scalars or arrays of any shape.
+	With the default 256 nodes, the relative error against IAPWS97 is
+	below 5E-5 for every property up to 20 MPa, and below 1E-2 up to
+	T_SAT_MAX, where cp and Pr begin to diverge; see check().
+
+	Parameters:
+	-----------
+	npoints:        int; number of nodes along the saturation line
+	                [Default: 256]
+	data:           array from tabulate_saturation(), if it has
+	                already been computed (e.g., a memory-mapped file)
+	                [Default: None -- tabulate it now]
+
+	Attributes:
+	-----------
+	tmin, tmax:     float, K; temperature limits of the table
+	pmin, pmax:     float, MPa; pressure limits of the table
+	"""
+	def __init__(self, npoints = 256, data = None):
+		if data is None:
+			data = tabulate_saturation(npoints)
+		self.data = data
+		self.npoints = len(data)
+		temps = data[:, 0]
+		logp = np.log(data[:, 1])
+		self.tmin, self.tmax = temps[0], temps[-1]
+		self.pmin, self.pmax = data[0, 1], data[-1, 1]
+
+		nprop = len(SAT_PROPERTIES)
+		self._islog = np.array([p in _LOG_PROPERTIES for p in SAT_PROPERTIES]*2)
+		values = np.array(data[:, 2:])
+		values[:, self._islog] = np.log(values[:, self._islog])
+		self._nprop = nprop
+		split = np.searchsorted(temps, T_REGION3, side="right")
+		self._props = _split_spline(temps, values, split)
+		self._logp = _split_spline(temps, logp, split)
+		self._tsat = _split_spline(logp, temps, split)
+
+	def _check_domain(self, values, lower, upper, name):
+		if np.any(values < lower) or np.any(values > upper):
+			errstr = "{} is outside the saturation table [{:.5g}, {:.5g}]"
+			raise ValueError(errstr.format(name, lower, upper))
+
+	def Tsat(self, P):
+		"""Saturation temperature
+
+		Parameter:
+		----------
+		P:          float or array, MPa; pressure
+
+		Returns:
+		--------
+		float or array, K; saturation temperature
+		"""
+		P = np.asarray(P, dtype=float)
+		self._check_domain(P, self.pmin, self.pmax, "Pressure")
+		return self._tsat(np.log(P))[()]
+
+	def Psat(self, T):
+		"""Saturation pressure
+
+		Parameter:
+		----------
+		T:          float or array, K; temperature
+
+		Returns:
+		--------
+		float or array, MPa; saturation pressure
+		"""
+		T = np.asarray(T, dtype=float)
+		self._check_domain(T, self.tmin, self.tmax, "Temperature")
+		return np.exp(self._logp(T))[()]
+
+	def _lookup(self, P, T):
+		"""Both phases at once: (T, P, values), where the last axis of
+		`values` follows the columns of tabulate_saturation()."""
+		if (P is None) == (T is None):
+			raise TypeError("Specify exactly one of P or T.")
+		if T is None:
+			P = np.asarray(P, dtype=float)
+			T = self.Tsat(P)
+		else:
+			T = np.asarray(T, dtype=float)
+			P = self.Psat(T)
+		values = self._props(T)
+		values[..., self._islog] = np.exp(values[..., self._islog])
+		return T, P, values
+
+	def _phase(self, T, P, values, x):
+		offset = x*self._nprop
+		props = [values[..., offset + j][()] for j in range(self._nprop)]
+		return SaturatedPhase(T[()], P[()], *props)
+
+	def liquid(self, P = None, T = None):
+		"""Saturated liquid (x=0) at a pressure or temperature
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		T:          float or array, K; temperature
+		            (specify exactly one of P or T)
+
+		Returns:
+		--------
+		SaturatedPhase of floats or arrays, with the same units as iapws
+		"""
+		return self._phase(*self._lookup(P, T), x=0)
+
+	def vapor(self, P = None, T = None):
+		"""Saturated vapor (x=1) at a pressure or temperature
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		T:          float or array, K; temperature
+		            (specify exactly one of P or T)
+
+		Returns:
+		--------
+		SaturatedPhase of floats or arrays, with the same units as iapws
+		"""
+		return self._phase(*self._lookup(P, T), x=1)
+
+	def phases(self, P = None, T = None):
+		"""Saturated liquid and vapor from a single lookup
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		T:          float or array, K; temperature
+		            (specify exactly one of P or T)
+
+		Returns:
+		--------
+		(liquid, vapor): tuple of SaturatedPhase
+		"""
+		T, P, values = self._lookup(P, T)
+		return self._phase(T, P, values, 0), self._phase(T, P, values, 1)
+
+	def __call__(self, P = None, T = None, x = 0):
+		"""Look up a saturated phase with the same keywords as IAPWS97
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		T:          float or array, K; temperature
+		x:          int; 0 for saturated liquid, 1 for saturated vapor
+		            [Default: 0]
+
+		Returns:
+		--------
+		SaturatedPhase of floats or arrays
+		"""
+		if x not in (0, 1):
+			raise ValueError("The saturation table only holds x=0 and x=1.")
+		return self._phase(*self._lookup(P, T), x=x)
+
+	def check(self):
+		"""Compare the table against IAPWS97 halfway between every pair of nodes
+
+		Returns:
+		--------
+		dict of {"property": maximum error}, for both phases ("hf", "hg", ...).
+		The error is relative, except that it is taken as absolute
+		where the magnitude of the exact value is below 1.
+		"""
+		temps = self.data[:, 0]
+		exact = _iapws_saturation((temps[1:] + temps[:-1])/2)
+		__, pvals, values = self._lookup(None, exact[:, 0])
+		table = np.column_stack([pvals, values])
+		exact = exact[:, 1:]
+		relerr = np.max(abs(table - exact)/np.maximum(abs(exact), 1.0), axis=0)
+		errors = {"P": relerr[0]}
+		for j, prop in enumerate(SAT_PROPERTIES):
+			errors[prop + "f"] = relerr[1 + j]
+			errors[prop + "g"] = relerr[1 + self._nprop + j]
+		return errors
+
+
+# Single-phase (subcooled liquid and superheated vapor) limits
+P_MIN = 0.01            # MPa
+P_MAX = 21.0            # MPa
+T_MAX = 1073.15         # K; upper limit of IF97 region 2
+# Properties of the single-phase tables, named as in iapws
+SP_PROPERTIES = ("T", "h", "u", "rho", "cp", "mu", "k")
+# Strictly positive properties are tabulated as their logarithms
+_SP_LOG = np.array([p in ("rho", "cp", "mu", "k") for p in SP_PROPERTIES])
+# Offset (K or kJ/kg) that keeps the tabulated edges off the saturation line
+_SAT_OFFSET = 1E-3
+
+SinglePhaseState = namedtuple("SinglePhaseState", ("P",) + SP_PROPERTIES)
+
+
+def _pressure_grid(npressure):
+	"""Pressure nodes of the single-phase tables, uniform in ln(P)"""
+	return np.exp(np.linspace(np.log(P_MIN), np.log(P_MAX), npressure))
+
+
+def _theta(s, phase):
+	"""Map uniform nodes on [0, 1] to the normalized coordinate theta,
+	clustered toward the saturation line (theta=1 for the liquid,
+	theta=0 for the vapor)."""
+	if phase == 0:
+		return 1 - (1 - s)**2
+	return s**2
+
+
+def _s_of_theta(theta, phase):
+	"""Inverse of _theta(), for an array of phases"""
+	theta = np.clip(theta, 0, 1)
+	return np.where(phase == 0, 1 - np.sqrt(1 - theta), np.sqrt(theta))
+
+
+def _stencil(u, n):
+	"""First node of the four-point stencil around coordinate `u`
+	(in units of the node spacing) on a uniform grid of `n` nodes, and
+	the Lagrange weights of the four nodes."""
+	i = np.clip(np.floor(u).astype(int), 1, n - 3)
+	t = u - i
+	weights = (-t*(t - 1)*(t - 2)/6, (t + 1)*(t - 1)*(t - 2)/2,
+	           -(t + 1)*t*(t - 2)/2, (t + 1)*t*(t - 1)/6)
+	return i - 1, weights
+
+
+def tabulate_single_phase(variable, npressure, nnodes):
+	"""Evaluate IAPWS97 for subcooled liquid and superheated vapor
+	on the nodes of a single-phase table
+
+	Each phase is tabulated on a rectangle in (ln P, theta), where theta
+	runs across the phase from one edge to the other:
+		liquid:     T_TRIPLE -> saturation
+		vapor:      saturation -> T_MAX
+	and is measured in temperature or enthalpy, according to `variable`.
+
+	Parameters:
+	-----------
+	variable:       str; "T" or "h"
+	npressure:      int; number of pressure nodes
+	nnodes:         int; number of nodes across each phase
+
+	Returns:
+	--------
+	data:           array of shape (2, npressure, nnodes, len(SP_PROPERTIES)),
+	                with liquid first. Columns flagged in _SP_LOG hold
+	                the natural logarithm of the property.
+	"""
+	s = np.linspace(0, 1, nnodes)
+	data = np.empty((2, npressure, nnodes, len(SP_PROPERTIES)))
+	for i, p in enumerate(_pressure_grid(npressure)):
+		sat = IAPWS97(P=p, x=0)
+		if variable == "T":
+			sat_value = sat.T
+			low = T_TRIPLE
+			high = T_MAX
+		else:
+			sat_value = sat.h
+			low = IAPWS97(P=p, T=T_TRIPLE).h
+			high = IAPWS97(P=p, T=T_MAX).h
+		if variable == "h":
+			bounds = ((low, sat_value - _SAT_OFFSET),
+			          (IAPWS97(P=p, x=1).h + _SAT_OFFSET, high))
+		else:
+			bounds = ((low, sat_value - _SAT_OFFSET),
+			          (sat_value + _SAT_OFFSET, high))
+		for phase, (lo, hi) in enumerate(bounds):
+			for j, theta in enumerate(_theta(s, phase)):
+				state = IAPWS97(P=p, **{variable: lo + theta*(hi - lo)})
+				data[phase, i, j] = [getattr(state, prop) for prop in SP_PROPERTIES]
+	data[..., _SP_LOG] = np.log(data[..., _SP_LOG])
+	return data
+
+
+class SinglePhaseTable(object):
+	"""Interpolated properties of subcooled liquid and superheated vapor
+
+	States are looked up by (P, T) or (P, h) with scalars or broadcastable
+	arrays, using bicubic (four-point Lagrange) interpolation on tables
+	that are uniform in ln(P) and in a coordinate that is normalized
+	between the edges of each phase. The edges themselves (saturation,
+	T_TRIPLE, and T_MAX) are interpolated from the tables, so a state is
+	never interpolated across the saturation line.
+
+	States outside the tables -- below P_MIN, above P_MAX, in the two-phase
+	dome, or beyond T_MAX -- fall back to an exact IAPWS97 call.
+	With the default 64x64 nodes, the relative error against IAPWS97 is
+	below 2E-4 for every property up to 15 MPa. Above that, the tables
+	cross into IF97 region 3 and approach the critical point, and the
+	error in cp grows to a few percent; see check().
+
+	Parameters:
+	-----------
+	npressure:      int; number of pressure nodes
+	                [Default: 64]
+	nnodes:         int; number of nodes across each phase
+	                [Default: 64]
+	data_pt:        array from tabulate_single_phase("T", ...), if it has
+	                already been computed (e.g., a memory-mapped file)
+	                [Default: None -- tabulate it now]
+	data_ph:        array from tabulate_single_phase("h", ...), likewise
+	                [Default: None -- tabulate it now]
+	"""
+	def __init__(self, npressure = 64, nnodes = 64, data_pt = None, data_ph = None):
+		if data_pt is None:
+			data_pt = tabulate_single_phase("T", npressure, nnodes)
+		if data_ph is None:
+			data_ph = tabulate_single_phase("h", npressure, nnodes)
+		self.data_pt = data_pt
+		self.data_ph = data_ph
+		self.npressure = data_pt.shape[1]
+		self.nnodes = data_pt.shape[2]
+		self._logpmin = np.log(P_MIN)
+		self._dlogp = (np.log(P_MAX) - self._logpmin)/(self.npressure - 1)
+
+	def _interpolate(self, data, column, P, value):
+		"""Interpolate the properties at (P, value), where `value` is the
+		property in `column` of `data`.
+
+		Returns:
+		--------
+		out:        array of shape (len(P), len(SP_PROPERTIES)); NaN where
+		            (P, value) lies outside the tables
+		"""
+		out = np.full((len(P), len(SP_PROPERTIES)), np.nan)
+		inside = np.flatnonzero((P >= P_MIN) & (P <= P_MAX))
+		if not inside.size:
+			return out
+		pin = P[inside]
+		vin = value[inside]
+		ip, wp = _stencil((np.log(pin) - self._logpmin)/self._dlogp, self.npressure)
+
+		def edge(phase, node):
+			return sum(wp[a]*data[phase, ip + a, node, column] for a in range(4))
+
+		liquid_high = edge(0, -1)
+		phase = (vin > liquid_high).astype(int)
+		low = np.where(phase, edge(1, 0), edge(0, 0))
+		high = np.where(phase, edge(1, -1), liquid_high)
+		theta = (vin - low)/(high - low)
+		ok = (theta >= 0) & (theta <= 1)
+		inside, ip, phase, theta = inside[ok], ip[ok], phase[ok], theta[ok]
+		wp = [w[ok] for w in wp]
+		u = _s_of_theta(theta, phase)*(self.nnodes - 1)
+		iu, wu = _stencil(u, self.nnodes)
+		result = 0
+		for a in range(4):
+			for b in range(4):
+				weight = (wp[a]*wu[b])[:, np.newaxis]
+				result = result + weight*data[phase, ip + a, iu + b]
+		result[:, _SP_LOG] = np.exp(result[:, _SP_LOG])
+		out[inside] = result
+		return out
+
+	def _lookup(self, P, variable, value):
+		P, value = np.broadcast_arrays(np.asarray(P, dtype=float),
+		                               np.asarray(value, dtype=float))
+		shape = P.shape
+		P = P.ravel()
+		value = value.ravel()
+		if variable == "T":
+			data = self.data_pt
+		else:
+			data = self.data_ph
+		column = SP_PROPERTIES.index(variable)
+		out = self._interpolate(data, column, P, value)
+		# Fall back to the exact equations outside of the tables
+		for i in np.flatnonzero(np.isnan(out[:, 0])):
+			try:
+				state = IAPWS97(P=P[i], **{variable: value[i]})
+			except NotImplementedError:
+				continue
+			for j, prop in enumerate(SP_PROPERTIES):
+				prop_value = getattr(state, prop, None)
+				if prop_value is not None:
+					out[i, j] = prop_value
+		out[:, column] = value
+		props = [out[:, j].reshape(shape)[()] for j in range(len(SP_PROPERTIES))]
+		return SinglePhaseState(P.reshape(shape)[()], *props)
+
+	def PT(self, P, T):
+		"""Look up states by pressure and temperature
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		T:          float or array, K; temperature
+
+		Returns:
+		--------
+		SinglePhaseState of floats or arrays, with the same units as iapws
+		"""
+		return self._lookup(P, "T", T)
+
+	def Ph(self, P, h):
+		"""Look up states by pressure and specific enthalpy
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		h:          float or array, kJ/kg; specific enthalpy
+
+		Returns:
+		--------
+		SinglePhaseState of floats or arrays, with the same units as iapws
+		"""
+		return self._lookup(P, "h", h)
+
+	def __call__(self, P, T = None, h = None):
+		"""Look up states with the same keywords as IAPWS97
+
+		Parameters:
+		-----------
+		P:          float or array, MPa; pressure
+		T:          float or array, K; temperature
+		h:          float or array, kJ/kg; specific enthalpy
+		            (specify exactly one of T or h)
+
+		Returns:
+		--------
+		SinglePhaseState of floats or arrays
+		"""
+		if (T is None) == (h is None):
+			raise TypeError("Specify exactly one of T or h.")
+		if h is None:
+			return self.PT(P, T)
+		return self.Ph(P, h)
+
+	def check(self, variable = "T", nsamples = 400, seed = None):
+		"""Compare the table against IAPWS97 at random states inside it
+
+		Parameters:
+		-----------
+		variable:   str; which table to check: "T" or "h"
+		            [Default: "T"]
+		nsamples:   int; number of states to sample in each phase
+		            [Default: 400]
+		seed:       int; seed for the random states
+		            [Default: None]
+
+		Returns:
+		--------
+		dict of {"property": maximum error}. The error is relative, except
+		that it is taken as absolute where the magnitude of the exact value
+		is below 1.
+		"""
+		rng = np.random.RandomState(seed)
+		if variable == "T":
+			data = self.data_pt
+		else:
+			data = self.data_ph
+		column = SP_PROPERTIES.index(variable)
+		lnp = rng.uniform(self._logpmin, np.log(P_MAX), (2, nsamples))
+		pressures = np.exp(lnp)
+		values = np.empty_like(pressures)
+		u = (lnp - self._logpmin)/self._dlogp
+		for phase in (0, 1):
+			ip, wp = _stencil(u[phase], self.npressure)
+			low = sum(wp[a]*data[phase, ip + a, 0, column] for a in range(4))
+			high = sum(wp[a]*data[phase, ip + a, -1, column] for a in range(4))
+			theta = _theta(rng.uniform(0, 1, nsamples), phase)
+			values[phase] = low + theta*(high - low)
+		pressures = pressures.ravel()
+		values = values.ravel()
+		table = np.column_stack(self._lookup(pressures, variable, values)[1:])
+		exact = np.empty_like(table)
+		for i in range(len(pressures)):
+			state = IAPWS97(P=pressures[i], **{variable: values[i]})
+			exact[i] = [getattr(state, prop) for prop in SP_PROPERTIES]
+		# Skip any samples right at the edge that IAPWS97 puts in the dome
+		single = ~np.isnan(exact).any(axis=1)
+		table, exact = table[single], exact[single]
+		relerr = np.max(abs(table - exact)/np.maximum(abs(exact), 1.0), axis=0)
+		return dict(zip(SP_PROPERTIES, relerr))
+
+
+CacheInfo = namedtuple("CacheInfo", ("hits", "misses", "evictions", "maxsize", "currsize"))
+
+
+class SteamCache(object):
+	"""Memoized IAPWS97 state factory
+
+	Call it with the same keywords as IAPWS97 (e.g., `P=7.14, x=0` or
+	`T=550, x=1`); it returns the IAPWS97 instance, so properties are read
+	exactly as before. States are kept in a least-recently-used cache, so a
+	loop that asks for the same state again and again only builds it once.
+	The returned instances are shared: do not modify them.
+
+	Parameters:
+	-----------
+	maxsize:        int; largest number of states to keep. The least
+	                recently used state is evicted beyond this.
+	                None lets the cache grow without bound.
+	                [Default: 1024]
+	digits:         int; if given, round every input to this many
+	                significant digits before looking it up, so that
+	                nearly identical states share one entry. The state is
+	                built at the rounded inputs.
+	                [Default: None -- use the inputs exactly]
+
+	Attributes:
+	-----------
+	hits:           int; calls answered from the cache
+	misses:         int; calls that built a new IAPWS97 instance
+	evictions:      int; states dropped to respect `maxsize`
+	"""
+	def __init__(self, maxsize = 1024, digits = None):
+		self.maxsize = maxsize
+		self.digits = digits
+		self._states = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def _quantize(self, value):
+		if self.digits is None:
+			return float(value)
+		return float("{:.{}g}".format(value, self.digits))
+
+	def __call__(self, **kwargs):
+		"""Get the IAPWS97 state for these keywords
+
+		Parameters:
+		-----------
+		any keywords accepted by iapws.IAPWS97 (P, T, h, s, x, ...)
+
+		Returns:
+		--------
+		iapws.IAPWS97 instance
+		"""
+		key = tuple(sorted((name, self._quantize(value)) for name, value in kwargs.items()))
+		try:
+			state = self._states[key]
+		except KeyError:
+			pass
+		else:
+			self.hits += 1
+			self._states.move_to_end(key)
+			return state
+		self.misses += 1
+		state = IAPWS97(**dict(key))
+		self._states[key] = state
+		if self.maxsize is not None and len(self._states) > self.maxsize:
+			self._states.popitem(last=False)
+			self.evictions += 1
+		return state
+
+	def __len__(self):
+		return len(self._states)
+
+	def info(self):
+		"""Report the cache statistics
+
+		Returns:
+		--------
+		CacheInfo(hits, misses, evictions, maxsize, currsize)
+		"""
+		return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize,
+		                 len(self._states))
+
+	def clear(self):
+		"""Empty the cache and reset the statistics"""
+		self._states.clear()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+
+def table_path(kind, resolution, directory = None):
+	"""Path of the file holding a tabulated property set
+
+	The name records the iapws version, the table resolution, and
+	TABLE_FORMAT, so a stale file is never opened by mistake.
+
+	Parameters:
+	-----------
+	kind:           str; name of the table (e.g., "saturation")
+	resolution:     tuple of ints; number of nodes along each axis
+	directory:      str; where the tables are stored
+	                [Default: TABLE_DIR]
+
+	Returns:
+	--------
+	str; path to the .npy file
+	"""
+	if directory is None:
+		directory = TABLE_DIR
+	res = "x".join(str(n) for n in resolution)
+	fname = "{}-iapws{}-{}-f{}.npy".format(kind, iapws.__version__, res, TABLE_FORMAT)
+	return os.path.join(directory, fname)
+
+
+def open_table(kind, resolution, tabulate, directory = None):
+	"""Open a tabulated property set as a read-only memory map,
+	tabulating it and saving it first if the file does not exist yet.
+
+	The file is written to a temporary name and then renamed, so
+	processes that race to build the same table never see a partial file.
+
+	Parameters:
+	-----------
+	kind:           str; name of the table (e.g., "saturation")
+	resolution:     tuple of ints; number of nodes along each axis
+	tabulate:       function with no arguments that returns the array
+	directory:      str; where the tables are stored
+	                [Default: TABLE_DIR]
+
+	Returns:
+	--------
+	numpy.memmap of the tabulated data
+	"""
+	path = table_path(kind, resolution, directory)
+	if not os.path.exists(path):
+		data = tabulate()
+		dirname = os.path.dirname(path)
+		os.makedirs(dirname, exist_ok=True)
+		fd, tmpname = tempfile.mkstemp(suffix=".npy", dir=dirname)
+		try:
+			with os.fdopen(fd, "wb") as f:
+				np.save(f, data)
+			os.replace(tmpname, path)
+		except BaseException:
+			os.remove(tmpname)
+			raise
+	return np.load(path, mmap_mode="r")
+
+
+_tables = {}
+
+def get_saturation_table(npoints = 256, directory = None, persistent = True):
+	"""Get the shared SaturationTable for this process.
+
+	On the first call, the tabulated data are opened from disk (or built
+	and saved there if they do not exist yet); later calls with the same
+	arguments reuse the table.
+
+	Parameters:
+	-----------
+	npoints:        int; number of nodes along the saturation line
+	                [Default: 256]
+	directory:      str; where the tables are stored
+	                [Default: TABLE_DIR]
+	persistent:     Boolean; whether to use the file on disk at all.
+	                If False, the table is tabulated in memory.
+	                [Default: True]
+
+	Returns:
+	--------
+	SaturationTable
+	"""
+	if directory is None:
+		directory = TABLE_DIR
+	key = ("saturation", npoints, directory if persistent else None)
+	if key not in _tables:
+		if persistent:
+			data = open_table("saturation", (npoints,),
+			                  lambda: tabulate_saturation(npoints), directory)
+		else:
+			data = tabulate_saturation(npoints)
+		_tables[key] = SaturationTable(npoints, data)
+	return _tables[key]
+
+
+def get_single_phase_table(npressure = 64, nnodes = 64, directory = None,
+                           persistent = True):
+	"""Get the shared SinglePhaseTable for this process.
+
+	On the first call, the tabulated data are opened from disk (or built
+	and saved there if they do not exist yet); later calls with the same
+	arguments reuse the table.
+
+	Parameters:
+	-----------
+	npressure:      int; number of pressure nodes
+	                [Default: 64]
+	nnodes:         int; number of nodes across each phase
+	                [Default: 64]
+	directory:      str; where the tables are stored
+	                [Default: TABLE_DIR]
+	persistent:     Boolean; whether to use the files on disk at all.
+	                If False, the tables are tabulated in memory.
+	                [Default: True]
+
+	Returns:
+	--------
+	SinglePhaseTable
+	"""
+	if directory is None:
+		directory = TABLE_DIR
+	key = ("single-phase", npressure, nnodes, directory if persistent else None)
+	if key not in _tables:
+		data = {}
+		for variable in ("T", "h"):
+			tabulate = lambda v=variable: tabulate_single_phase(v, npressure, nnodes)
+			if persistent:
+				data[variable] = open_table("single-phase-P" + variable,
+				                            (npressure, nnodes), tabulate, directory)
+			else:
+				data[variable] = tabulate()
+		_tables[key] = SinglePhaseTable(npressure, nnodes, data["T"], data["h"])
+	return _tables[key]
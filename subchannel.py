@@ -0,0 +1,186 @@
+# Subchannel
+#
+# Subchannel analysis of a rod bundle. Neighboring subchannels exchange
+# coolant through the gaps between rods by diversion crossflow and by
+# turbulent mixing. The bundle is marched from the inlet; at each axial
+# level, the crossflow and the enthalpy rise are found from sparse linear
+# systems over the gap connectivity.
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+import models
+import lattice
+from two_phase import G_ACCEL
+
+# Turbulent mixing coefficient, w' = beta*s*G
+MIXING_BETA = 0.005
+
+
+class SubchannelSolution(object):
+	"""Axial fields of a subchannel solution, shaped (levels, subchannels)
+	or (levels, gaps)
+
+	Attributes:
+	-----------
+	z:          array, m; axial levels, inlet to outlet
+	mdot:       array, kg/s; axial flow rate of each subchannel
+	h:          array, kJ/kg; enthalpy of each subchannel
+	tbulk:      array, K; bulk temperature of each subchannel
+	crossflow:  array, kg/s-m; diversion crossflow through each gap, positive
+	            from the lower to the higher subchannel index
+	dp:         array, Pa; pressure drop from the inlet, shared by all
+	            subchannels
+	"""
+	def __init__(self, z, mdot, h, tbulk, crossflow, dp):
+		self.z = z
+		self.mdot = mdot
+		self.h = h
+		self.tbulk = tbulk
+		self.crossflow = crossflow
+		self.dp = dp
+
+	@property
+	def hot_subchannel(self):
+		"""Index of the subchannel with the highest outlet enthalpy"""
+		return int(np.argmax(self.h[-1]))
+
+
+class Bundle(object):
+	"""Rod bundle of single-phase coolant, solved by subchannels
+
+	Lateral pressure differences are assumed to vanish: at every level,
+	the diversion crossflow redistributes the axial flow so that all
+	subchannels have the same axial pressure gradient (friction and
+	gravity). The crossflow through each gap is the one that carries that
+	redistribution with the least resistance, weighted by gap width over
+	centroid distance. Turbulent mixing exchanges enthalpy, but not mass,
+	between neighbors.
+
+	Parameters:
+	-----------
+	reactor:    reactors.ReactorType; lattice (see lattice.from_reactor())
+	coolant:    single-phase inlet state with T, h, rho, mu, cp
+	            (e.g., if97.PT(P, tin))
+	mdot:       float, kg/s; bundle flow rate
+	q1:         float or array, W/m; average linear heat rate of each rod,
+	            in the order of the lattice rods (e.g., (npins, npins) for
+	            a square lattice)
+	shape:      axial.AxialShape; axial power shape over the height
+	nodes:      int; number of axial levels
+	            [Default: 100]
+	beta:       float; turbulent mixing coefficient
+	            [Default: MIXING_BETA]
+	density:    callable; coolant density (kg/m^3) as a function of
+	            enthalpy (kJ/kg), vectorized
+	            [Default: None -- constant coolant.rho]
+	"""
+	def __init__(self, reactor, coolant, mdot, q1, shape, nodes = 100,
+	             beta = MIXING_BETA, density = None):
+		self.reactor = reactor
+		self.geometry = lattice.from_reactor(reactor)
+		self.coolant = coolant
+		self.mdot = mdot
+		q1 = np.asarray(q1, dtype=float).ravel()
+		self.q1 = np.broadcast_to(q1, (self.geometry.nrods,))
+		self.shape = shape
+		self.nodes = nodes
+		self.beta = beta
+		if density is None:
+			density = lambda h: np.full(np.shape(h), coolant.rho)
+		self.density = density
+		geo = self.geometry
+		self.size = geo.size
+		self._incidence = geo.incidence()
+		# Crossflow routing: the Laplacian of the gap conductances, with the
+		# first subchannel pinned to remove the constant null space
+		self._conductance = geo.gap/geo.distance
+		laplacian = self._incidence.T.dot(
+			scipy.sparse.diags(self._conductance).dot(self._incidence)).tolil()
+		laplacian[0, 0] += 1
+		self._route = scipy.sparse.linalg.factorized(laplacian.tocsc())
+
+	@property
+	def z(self):
+		"""Axial levels (m), with z = 0 at the midplane"""
+		return np.linspace(self.shape.bottom, self.shape.top, self.nodes)
+
+	def linear_heat_rate(self):
+		"""Linear heat rate into each subchannel (W/m)
+
+		Returns:
+		--------
+		array; shaped (nodes, subchannels)
+		"""
+		axial_shape = self.shape(self.z)/self.shape.average
+		rods = self.geometry.rods.T.dot(self.q1)
+		return axial_shape[:, np.newaxis]*rods
+
+	def _gradient(self, m, rho):
+		"""Axial pressure gradient (Pa/m) and its derivative in m"""
+		geo = self.geometry
+		re = np.abs(m)/geo.area*geo.dh/self.coolant.mu
+		fric = models.mcadams(re)*m*np.abs(m)/(2*rho*geo.area**2*geo.dh)
+		# McAdams: f ~ Re^-0.2, so d(fric)/dm = 1.8*fric/m
+		return fric + rho*G_ACCEL, 1.8*fric/m
+
+	def _energy(self, m_old, m_new, h_old, w, q1, dz, rho):
+		"""Implicit enthalpy at the next level, with donor-cell crossflow"""
+		geo = self.geometry
+		g = (m_old + m_new)/2/geo.area
+		mixing = self.beta*geo.gap*(g[geo.gap_from] + g[geo.gap_to])/2
+		forward = np.maximum(w, 0)      # from gap_from to gap_to
+		backward = np.maximum(-w, 0)
+		# Row i: m_new*h_i + dz*(outflow*h_i - inflow*h_j + mixing*(h_i - h_j))
+		diagonal = m_new.copy()
+		np.add.at(diagonal, geo.gap_from, dz*(forward + mixing))
+		np.add.at(diagonal, geo.gap_to, dz*(backward + mixing))
+		rows = np.concatenate((np.arange(self.size), geo.gap_to, geo.gap_from))
+		cols = np.concatenate((np.arange(self.size), geo.gap_from, geo.gap_to))
+		values = np.concatenate((diagonal, -dz*(forward + mixing), -dz*(backward + mixing)))
+		matrix = scipy.sparse.csr_matrix((values, (rows, cols)),
+		                                 shape=(self.size, self.size))
+		return scipy.sparse.linalg.spsolve(matrix, m_old*h_old + dz*q1/1000)
+
+	def solve(self):
+		"""March the bundle from the inlet
+
+		Returns:
+		--------
+		SubchannelSolution
+		"""
+		geo = self.geometry
+		z = self.z
+		q1 = self.linear_heat_rate()
+		nodes = self.nodes
+		m = np.empty((nodes, self.size))
+		h = np.empty((nodes, self.size))
+		w = np.zeros((nodes, len(geo.gap)))
+		dp = np.zeros(nodes)
+		# Inlet: uniform pressure gradient
+		h[0] = self.coolant.h
+		rho = self.density(h[0])
+		m[0] = self.mdot*geo.area/geo.area.sum()
+		grad, slope = self._gradient(m[0], rho)
+		m[0] += self._redistribute(grad, slope)
+		for k in range(1, nodes):
+			dz = z[k] - z[k - 1]
+			heat = (q1[k] + q1[k - 1])/2
+			# Predict the enthalpy with the upstream flows to update density
+			h[k] = self._energy(m[k - 1], m[k - 1], h[k - 1], w[k - 1], heat, dz, rho)
+			rho = self.density(h[k])
+			grad, slope = self._gradient(m[k - 1], rho)
+			change = self._redistribute(grad, slope)
+			w[k] = self._conductance*self._incidence.dot(self._route(-change/dz))
+			m[k] = m[k - 1] + change
+			h[k] = self._energy(m[k - 1], m[k], h[k - 1], w[k], heat, dz, rho)
+			grad, __ = self._gradient(m[k], rho)
+			dp[k] = dp[k - 1] + dz*np.average(grad, weights=geo.area)
+		tbulk = self.coolant.T + (h - self.coolant.h)/self.coolant.cp
+		return SubchannelSolution(z, m, h, tbulk, w, dp)
+
+	def _redistribute(self, grad, slope):
+		"""Flow changes, summing to zero, that equalize the linearized
+		pressure gradients"""
+		c = np.sum(grad/slope)/np.sum(1/slope)
+		return (c - grad)/slope
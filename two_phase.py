@@ -1,56 +1,396 @@
 # Two-phase
 #
-# Module with commmon equations for two-phase flow
+# Module with commmon equations for two-phase flow.
+# Every function accepts floats or arrays, and broadcasts over them,
+# so that whole axial profiles can be evaluated in one call.
+
+import numpy as np
+import models
+
+G_ACCEL = 9.81      # m/s^2
+PSI_PER_MPA = 145.038
+RE_LAMINAR = 1000   # Reynolds number below which Lockhart-Martinelli treat a phase as laminar
+# Chisholm's constants for the Lockhart-Martinelli correlation, by
+# (liquid turbulent, vapor turbulent)
+CHISHOLM_C = {(True, True): 20, (False, True): 12, (True, False): 10, (False, False): 5}
+
+
+def _check_bounds(values, name):
+	if np.any((values < 0) | (values > 1)):
+		raise ValueError("{} is not on [0, 1]!".format(name))
 
 
 def alpha(x, rhof, rhog, s=1):
 	"""Find the void fraction given the quality
-	
+
 	Parameters:
 	-----------
-	x:          float; quality. must be on [0, 1]
-	rhof:       float, kg/m^3; liquid density
-	rhog:       float, kg/m^3; vapor density
-	s:          float; slip ratio
+	x:          float or array; quality. must be on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	s:          float or array; slip ratio
 				[Default: 1 -- HEM approximation]
-	
+
 	Returns:
 	--------
-	float; void fraction
+	float or array; void fraction
 	"""
-	assert 0 <= x <= 1, "Quality is not on [0, 1]!"
-	return 1/(1 + s*rhog/rhof*(1 - x)/x)
+	x = np.asarray(x, dtype=float)
+	_check_bounds(x, "Quality")
+	with np.errstate(divide="ignore", invalid="ignore"):
+		a = x/(x + s*np.divide(rhog, rhof)*(1 - x))
+	return np.where(x == 0, 0.0, np.where(x == 1, 1.0, a))[()]
 
 
 def quality(a, rhof, rhog):
 	"""Find the quality given the void fraction
-	
+
 	Parameters:
 	-----------
-	a:          float; void fraction. must be on [0, 1]
-	rhof:       float, kg/m^3; liquid density
-	rhog:       float, kg/m^3; vapor density
-	
+	a:          float or array; void fraction. must be on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+
 	Returns:
 	--------
-	float; quality
+	float or array; quality
 	"""
-	return 1/(1 + rhof/rhog*(1-a)/a)
+	a = np.asarray(a, dtype=float)
+	_check_bounds(a, "Void fraction")
+	with np.errstate(divide="ignore", invalid="ignore"):
+		x = a/(a + np.divide(rhof, rhog)*(1 - a))
+	return np.where(a == 0, 0.0, np.where(a == 1, 1.0, x))[()]
 
 
 def mixture_density(rhof, rhog, a):
 	"""Density of a two-phase mixture
-	
+
 	Parameters:
 	-----------
-	rhof:       float, mass/volume; density of phase 1 (e.g., liquid)
-	rhog:       float, mass/volume; density of phase 2 (e.g., vapor)
-	a:          float; void fraction. Must be on [0, 1].
-	
+	rhof:       float or array, mass/volume; density of phase 1 (e.g., liquid)
+	rhog:       float or array, mass/volume; density of phase 2 (e.g., vapor)
+	a:          float or array; void fraction. Must be on [0, 1].
+
 	Returns:
 	--------
-	float, mass/volume; density of the mixture in the same units
+	float or array, mass/volume; density of the mixture in the same units
 	as the densities given
 	"""
-	assert 0 <= a <= 1, "Void fraction is not on [0, 1]!"
-	return a*rhog + (1 - a)*rhof
+	a = np.asarray(a, dtype=float)
+	_check_bounds(a, "Void fraction")
+	return (a*rhog + (1 - a)*rhof)[()]
+
+
+def drift_velocity(rhof, rhog, sigma, coefficient = 1.53):
+	"""Vapor drift velocity for churn-turbulent flow
+
+	Parameters:
+	-----------
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	sigma:      float or array, N/m; surface tension
+	coefficient:float; leading coefficient of the correlation
+				[Default: 1.53]
+
+	Returns:
+	--------
+	float or array, m/s; drift velocity V_vj
+	"""
+	rhof = np.asarray(rhof, dtype=float)
+	return (coefficient*(G_ACCEL*sigma*(rhof - rhog)/rhof**2)**0.25)[()]
+
+
+class VoidModel(object):
+	"""Base class for void fraction models
+
+	Every model has the same interface, so that they can be swapped:
+		model.alpha(x, rhof, rhog, g)
+	where g (mass flux, kg/s/m^2) is needed only by the drift-flux models.
+	"""
+	name = None
+
+	def __str__(self):
+		return self.name
+
+	def alpha(self, x, rhof, rhog, g = None):
+		"""Find the void fraction given the quality
+
+		Parameters:
+		-----------
+		x:          float or array; quality. must be on [0, 1]
+		rhof:       float or array, kg/m^3; liquid density
+		rhog:       float or array, kg/m^3; vapor density
+		g:          float or array, kg/s/m^2; mass flux
+					[Default: None -- only needed for drift flux]
+
+		Returns:
+		--------
+		float or array; void fraction
+		"""
+		raise NotImplementedError(self.name)
+
+
+class HEM(VoidModel):
+	"""Homogeneous equilibrium model (no slip)"""
+	name = "HEM"
+
+	def alpha(self, x, rhof, rhog, g = None):
+		return alpha(x, rhof, rhog)
+
+
+class ConstantSlip(VoidModel):
+	"""Separated flow with a constant slip ratio
+
+	Parameter:
+	----------
+	s:          float; slip ratio
+	"""
+	name = "Constant slip"
+
+	def __init__(self, s):
+		self.s = s
+
+	def alpha(self, x, rhof, rhog, g = None):
+		return alpha(x, rhof, rhog, self.s)
+
+
+class Bankoff(VoidModel):
+	"""Bankoff's correction of the HEM void fraction: alpha = K*beta
+
+	Parameter:
+	----------
+	p:          float or array, MPa; system pressure
+	"""
+	name = "Bankoff"
+
+	def __init__(self, p):
+		self.p = p
+
+	@property
+	def k(self):
+		return 0.71 + 1E-4*self.p*PSI_PER_MPA
+
+	def alpha(self, x, rhof, rhog, g = None):
+		return (self.k*np.asarray(alpha(x, rhof, rhog)))[()]
+
+
+class ZuberFindlay(VoidModel):
+	"""Zuber-Findlay drift-flux model:
+		alpha = beta/(C0 + V_vj/j)
+
+	Parameters:
+	-----------
+	c0:         float or array; distribution parameter
+	vvj:        float or array, m/s; drift velocity (see drift_velocity())
+	"""
+	name = "Zuber-Findlay"
+
+	def __init__(self, c0, vvj):
+		self.c0 = c0
+		self.vvj = vvj
+
+	def _distribution(self, beta, rhof, rhog):
+		return self.c0
+
+	def alpha(self, x, rhof, rhog, g = None):
+		if g is None:
+			raise TypeError("The drift-flux models require the mass flux g.")
+		x = np.asarray(x, dtype=float)
+		beta = np.asarray(alpha(x, rhof, rhog))
+		# Total volumetric flux
+		jay = g*(x/rhog + (1 - x)/rhof)
+		c0 = self._distribution(beta, rhof, rhog)
+		with np.errstate(divide="ignore", invalid="ignore"):
+			a = beta/(c0 + self.vvj/jay)
+		return np.where(x == 0, 0.0, a)[()]
+
+
+class Dix(ZuberFindlay):
+	"""Dix's drift-flux model, in which the distribution parameter
+	depends on the volumetric flow fraction:
+		C0 = beta*(1 + (1/beta - 1)^b),  b = (rhog/rhof)^0.1
+
+	Parameter:
+	----------
+	vvj:        float or array, m/s; drift velocity (see drift_velocity())
+	"""
+	name = "Dix"
+
+	def __init__(self, vvj):
+		super(Dix, self).__init__(None, vvj)
+
+	def _distribution(self, beta, rhof, rhog):
+		b = np.divide(rhog, rhof)**0.1
+		with np.errstate(divide="ignore", invalid="ignore"):
+			return beta*(1 + (1/beta - 1)**b)
+
+
+# Two-phase friction multipliers
+#
+# Each returns phi_lo^2, the ratio of the two-phase frictional pressure
+# gradient to that of the whole flow as liquid:
+#     (dP/dz)_fric = phi_lo^2 * f_lo*G^2/(2*D*rhof)
+# Pressure enters through the saturated properties, which may be arrays
+# (e.g., from saturation.phases(P)), as may the quality and mass flux.
+
+
+def _darcy(re):
+	"""Single-phase Darcy friction factor: laminar or Blasius"""
+	re = np.asarray(re, dtype=float)
+	with np.errstate(divide="ignore"):
+		return np.where(re < RE_LAMINAR, 64/re, models.blasius(re))
+
+
+def phi_hem(x, rhof, rhog, muf = None, mug = None, n = 0.25):
+	"""Homogeneous equilibrium two-phase friction multiplier
+
+	Parameters:
+	-----------
+	x:          float or array; flow quality on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	muf:        float or array, Pa-s; liquid viscosity
+				[Default: None -- mixture viscosity taken as liquid]
+	mug:        float or array, Pa-s; vapor viscosity
+				[Default: None]
+	n:          float; Reynolds exponent of the friction factor, f ~ Re^-n.
+				Only used with the McAdams mixture viscosity (muf and mug).
+				[Default: 0.25]
+
+	Returns:
+	--------
+	float or array; phi_lo^2
+	"""
+	x = np.asarray(x, dtype=float)
+	_check_bounds(x, "Quality")
+	phi2 = 1 + x*(np.divide(rhof, rhog) - 1)
+	if muf is not None and mug is not None:
+		# McAdams: 1/mu_m = x/mu_g + (1 - x)/mu_f
+		phi2 = phi2*(1 + x*(np.divide(muf, mug) - 1))**-n
+	return phi2[()]
+
+
+def martinelli_xtt(x, rhof, rhog, muf, mug):
+	"""Turbulent-turbulent Lockhart-Martinelli parameter
+
+	Parameters:
+	-----------
+	x:          float or array; flow quality on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	muf:        float or array, Pa-s; liquid viscosity
+	mug:        float or array, Pa-s; vapor viscosity
+
+	Returns:
+	--------
+	float or array; X_tt (infinite at x = 0)
+	"""
+	x = np.asarray(x, dtype=float)
+	with np.errstate(divide="ignore"):
+		return (((1 - x)/x)**0.9*np.sqrt(np.divide(rhog, rhof))*
+		        np.divide(muf, mug)**0.1)[()]
+
+
+def _phi_from_x(x, xmart, c, ratio_lo, ratio_go):
+	"""phi_lo^2 from the Martinelli parameter X, Chisholm's C, and the
+	ratios f_l/f_lo and f_go*rhof/(f_lo*rhog) for the x = 1 limit"""
+	with np.errstate(divide="ignore", invalid="ignore"):
+		phi_l2 = 1 + c/xmart + 1/xmart**2
+		phi2 = phi_l2*ratio_lo*(1 - x)**2
+	return np.where(x == 0, 1.0, np.where(x == 1, ratio_go, phi2))
+
+
+def phi_lockhart_martinelli(x, rhof, rhog, muf, mug, g, d):
+	"""Lockhart-Martinelli two-phase friction multiplier, with Chisholm's
+	constants for the flow regime of each phase
+
+	Parameters:
+	-----------
+	x:          float or array; flow quality on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	muf:        float or array, Pa-s; liquid viscosity
+	mug:        float or array, Pa-s; vapor viscosity
+	g:          float or array, kg/s/m^2; mass flux
+	d:          float or array, m; hydraulic diameter
+
+	Returns:
+	--------
+	float or array; phi_lo^2
+	"""
+	x = np.asarray(x, dtype=float)
+	_check_bounds(x, "Quality")
+	re_l = g*(1 - x)*d/muf
+	re_g = g*x*d/mug
+	f_l = _darcy(re_l)
+	f_g = _darcy(re_g)
+	f_lo = _darcy(g*d/muf)
+	f_go = _darcy(g*d/mug)
+	with np.errstate(divide="ignore", invalid="ignore"):
+		xmart = np.sqrt(f_l/f_g*((1 - x)/x)**2*np.divide(rhog, rhof))
+	c = np.choose(2*(re_l >= RE_LAMINAR) + (re_g >= RE_LAMINAR),
+	              [CHISHOLM_C[False, False], CHISHOLM_C[False, True],
+	               CHISHOLM_C[True, False], CHISHOLM_C[True, True]])
+	ratio_go = f_go/f_lo*np.divide(rhof, rhog)
+	return _phi_from_x(x, xmart, c, f_l/f_lo, ratio_go)[()]
+
+
+def phi_martinelli_nelson(x, rhof, rhog, muf, mug):
+	"""Martinelli-Nelson two-phase friction multiplier for turbulent
+	boiling flow, as the analytic fit to their chart:
+		phi_lo^2 = (1 - x)^1.75 * (1 + 20/X_tt + 1/X_tt^2)
+
+	Parameters:
+	-----------
+	x:          float or array; flow quality on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	muf:        float or array, Pa-s; liquid viscosity
+	mug:        float or array, Pa-s; vapor viscosity
+
+	Returns:
+	--------
+	float or array; phi_lo^2
+	"""
+	x = np.asarray(x, dtype=float)
+	_check_bounds(x, "Quality")
+	xtt = martinelli_xtt(x, rhof, rhog, muf, mug)
+	# f_l/f_lo = (1 - x)^-0.25 for the Blasius friction factor
+	with np.errstate(divide="ignore"):
+		ratio_lo = (1 - x)**-0.25
+	ratio_go = np.divide(rhof, rhog)*np.divide(mug, muf)**0.25
+	return _phi_from_x(x, xtt, CHISHOLM_C[True, True], ratio_lo, ratio_go)[()]
+
+
+def phi_friedel(x, rhof, rhog, muf, mug, g, d, sigma):
+	"""Friedel two-phase friction multiplier
+
+	Parameters:
+	-----------
+	x:          float or array; flow quality on [0, 1]
+	rhof:       float or array, kg/m^3; liquid density
+	rhog:       float or array, kg/m^3; vapor density
+	muf:        float or array, Pa-s; liquid viscosity
+	mug:        float or array, Pa-s; vapor viscosity
+	g:          float or array, kg/s/m^2; mass flux
+	d:          float or array, m; hydraulic diameter
+	sigma:      float or array, N/m; surface tension
+
+	Returns:
+	--------
+	float or array; phi_lo^2
+	"""
+	x = np.asarray(x, dtype=float)
+	_check_bounds(x, "Quality")
+	f_lo = _darcy(g*d/muf)
+	f_go = _darcy(g*d/mug)
+	rho_ratio = np.divide(rhof, rhog)
+	mu_ratio = np.divide(mug, muf)
+	e = (1 - x)**2 + x**2*rho_ratio*f_go/f_lo
+	f = x**0.78*(1 - x)**0.224
+	h = rho_ratio**0.91*mu_ratio**0.19*(1 - mu_ratio)**0.7
+	# Homogeneous density
+	rhoh = 1/(x/rhog + (1 - x)/rhof)
+	fr = g**2/(G_ACCEL*d*rhoh**2)
+	we = g**2*d/(sigma*rhoh)
+	return (e + 3.24*f*h/(fr**0.045*we**0.035))[()]